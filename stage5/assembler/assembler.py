@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Ассемблер для учебной виртуальной машины (УВМ)
+Этап 2: Формирование машинного кода
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+from parser import parse_program, parse_data, needs_linking
+from encoder import encode_instruction, encode_program
+from isa import ISA
+from objfile import Section, SECTION_CODE, SECTION_DATA, build_object
+
+
+def main():
+    from timeline import Timeline
+
+    parser = argparse.ArgumentParser(description='Ассемблер для УВМ')
+    parser.add_argument('input_file', help='Путь к исходному файлу с текстом программы')
+    parser.add_argument('output_file', help='Путь к двоичному файлу-результату')
+    parser.add_argument('--test', action='store_true', help='Режим тестирования')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Перекодировать только измененные команды (индекс хранится рядом с результатом)')
+    parser.add_argument('--index', help='Путь к индексу инкрементальной сборки (по умолчанию: <output_file>.idx)')
+    parser.add_argument('--trace-out', help='Сохранить временную шкалу этапов (Chrome trace-event JSON)')
+
+    args = parser.parse_args()
+
+    timeline = Timeline(process_name='assembler') if args.trace_out else None
+    try:
+        assemble(args, timeline)
+    finally:
+        if timeline is not None:
+            timeline.save(args.trace_out)
+
+
+def build_image(program_json: dict) -> bytes:
+    """
+    Образ программы из JSON без записи в файл: код, объектный файл с
+    блоками данных или скомпонованный модуль (если есть ссылки на символы)
+    """
+    if needs_linking(program_json):
+        from linker import compile_module, link
+        return link([compile_module(program_json)])
+    return _output_image(encode_program(parse_program(program_json)), parse_data(program_json))
+
+
+def _output_image(binary_data: bytes, data_blocks) -> bytes:
+    """Программа с начальными данными записывается в объектный файл с секциями"""
+    if not data_blocks:
+        return binary_data
+    sections = [Section(SECTION_CODE, 0, binary_data)]
+    sections += [Section(SECTION_DATA, block.address, block.to_bytes()) for block in data_blocks]
+    return build_object(sections)
+
+
+def assemble(args, timeline) -> None:
+    """Ассемблирование с учетом аргументов командной строки"""
+    # Компоновщик и инкрементальная сборка импортируются только при
+    # использовании, как и в build_image
+    from timeline import phase
+
+    # Чтение входного файла
+    try:
+        with open(args.input_file, 'r', encoding='utf-8') as f, phase(timeline, 'json.load'):
+            program_json = json.load(f)
+    except FileNotFoundError:
+        print(f"Ошибка: файл {args.input_file} не найден")
+        sys.exit(1)
+    except json.JSONDecodeError as e:
+        print(f"Ошибка разбора JSON: {e}")
+        sys.exit(1)
+
+    # Программа со ссылками на символы собирается компоновщиком как один модуль
+    if needs_linking(program_json):
+        from linker import compile_module, link
+        try:
+            with phase(timeline, 'link'):
+                image = link([compile_module(program_json)])
+        except ValueError as e:
+            print(f"Ошибка компоновки: {e}")
+            sys.exit(1)
+        try:
+            with phase(timeline, 'write'), open(args.output_file, 'wb') as f:
+                f.write(image)
+        except IOError as e:
+            print(f"Ошибка записи в файл {args.output_file}: {e}")
+            sys.exit(1)
+        print(f"Размер двоичного файла: {len(image)} байт")
+        print(f"Программа успешно скомпонована в файл: {args.output_file}")
+        return
+
+    # Парсинг программы
+    with phase(timeline, 'parse_program'):
+        instructions = parse_program(program_json)
+        data_blocks = parse_data(program_json)
+
+    if args.incremental and data_blocks:
+        print("Инкрементальная сборка не поддерживается для программ с блоком data, "
+              "выполняется полная сборка")
+    elif args.incremental and not args.test:
+        # Инкрементальная сборка: кодируются только измененные команды
+        from incremental import assemble_incremental
+        try:
+            with phase(timeline, 'assemble_incremental'):
+                result = assemble_incremental(instructions, args.output_file, args.index)
+        except IOError as e:
+            print(f"Ошибка записи в файл {args.output_file}: {e}")
+            sys.exit(1)
+
+        print(f"Размер двоичного файла: {result.size} байт")
+        print(f"Инкрементальная сборка ({result.mode}): перекодировано команд: {result.reencoded}, "
+              f"записано байт: {result.bytes_written}")
+        return
+
+    # Кодирование всей программы в бинарный формат
+    with phase(timeline, 'encode_program'):
+        binary_data = encode_program(instructions)
+
+    if args.test:
+        # Режим тестирования: вывод байтового представления
+        print("Результат ассемблирования:")
+        print("=" * 60)
+
+        # Вывод в формате из спецификации УВМ
+        byte_strings = []
+        for i, byte in enumerate(binary_data):
+            byte_strings.append(f'0x{byte:02X}')
+
+            # Перенос строки каждые 6 байт для читаемости
+            if (i + 1) % 6 == 0 and i != len(binary_data) - 1:
+                byte_strings.append('\n')
+
+        # Вывод байтов
+        print(f"Байтовая последовательность ({len(binary_data)} байт):")
+        print('[' + ', '.join(byte_strings).replace('\n, ', '\n') + ']')
+        print()
+
+        # Детальная информация о командах
+        print("Детализация команд:")
+        print("-" * 60)
+
+        byte_offset = 0
+        for i, instr in enumerate(instructions):
+            encoded = encode_instruction(instr)
+            hex_bytes = ', '.join(f'0x{b:02X}' for b in encoded)
+
+            print(f"Команда {i} (смещение 0x{byte_offset:04X}):")
+            spec = ISA.get(instr.opcode)
+            if spec is not None:
+                print(f"  Тип: {spec.title}")
+            else:
+                print(f"  Тип: Неизвестный (код {instr.opcode})")
+
+            print(f"  Размер: {instr.size} байт")
+            print(f"  Байты: [{hex_bytes}]")
+            print()
+
+            byte_offset += instr.size
+
+        for block in data_blocks:
+            print(f"Блок данных по адресу 0x{block.address:08X}: {len(block.words)} слов")
+
+    output_data = _output_image(binary_data, data_blocks)
+
+    # Запись в выходной файл
+    try:
+        with phase(timeline, 'write'), open(args.output_file, 'wb') as f:
+            f.write(output_data)
+
+        print(f"Размер двоичного файла: {len(output_data)} байт")
+        if not args.test:
+            print(f"Программа успешно ассемблирована в файл: {args.output_file}")
+    except IOError as e:
+        print(f"Ошибка записи в файл {args.output_file}: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
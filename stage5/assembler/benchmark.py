@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Замер скорости цикла интерпретатора УВМ
+
+Сравнивает цикл без обработчиков инструментирования с эталонной копией
+цикла интерпретатора до появления обработчиков (reference_run), с циклом
+после добавления и удаления обработчика и с циклом, в котором
+зарегистрирован пустой обработчик.
+
+Варианты чередуются в каждом повторе (порядок сдвигается на один от
+повтора к повтору), время каждого варианта делится на время эталона того
+же повтора, и сравниваются медианы этих отношений: прогрев и изменение
+частоты процессора влияют на все варианты одинаково. Шум замера - медиана
+отклонения второго, такого же запуска эталона; если цикл без обработчиков
+медленнее эталона больше чем на наибольшее из --tolerance и удвоенного
+шума, программа завершается с кодом 1.
+"""
+
+import io
+import sys
+import time
+import argparse
+import contextlib
+from statistics import median
+
+from parser import parse_program
+from encoder import encode_program
+from interpreter import UVMInterpreter
+
+
+class NullHook:
+    """Обработчик, который ничего не делает"""
+
+    def on_instruction(self, pc, opcode, field_b, field_c, field_d):
+        pass
+
+    def on_read(self, pc, address, value):
+        pass
+
+    def on_write(self, pc, address, value):
+        pass
+
+
+def data_address(count: int) -> int:
+    """Адрес слова данных программы из count команд - сразу после кода"""
+    return (6 * count + 0xFFF) & ~0xFFF
+
+
+def make_program(count: int) -> bytes:
+    """Программа из count команд загрузки, записи и чтения"""
+    instructions = [{"opcode": 72, "field_b": 10, "field_c": data_address(count)}]
+    while len(instructions) < count:
+        instructions.append({"opcode": 72, "field_b": 1, "field_c": len(instructions)})
+        instructions.append({"opcode": 8, "field_b": 1, "field_c": 10})
+        instructions.append({"opcode": 113, "field_b": 2, "field_c": 10})
+    return bytes(encode_program(parse_program({"instructions": instructions[:count]})))
+
+
+def reference_run(interpreter) -> None:
+    """
+    Эталон: цикл UVMInterpreter.run до появления обработчиков
+    инструментирования (без вывода сообщений)
+    """
+    while not interpreter.halted:
+        decoded = interpreter.decode_instruction()
+        if decoded is None:
+            interpreter.halted = True
+            break
+        opcode, field_b, field_c, field_d = decoded
+        interpreter.execute_instruction(opcode, field_b, field_c, field_d)
+        if interpreter.instructions_executed > interpreter.max_instructions:
+            interpreter.halted = True
+
+
+def measure(binary: bytes, memory_size: int, setup, runner=None) -> float:
+    """Время одного выполнения программы"""
+    interpreter = UVMInterpreter(memory_size=memory_size, verbose=False)
+    interpreter.max_instructions = len(binary)
+    interpreter.memory[:len(binary)] = binary
+    setup(interpreter)
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        if runner is None:
+            interpreter.run()
+        else:
+            runner(interpreter)
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Замер скорости интерпретатора УВМ')
+    parser.add_argument('--instructions', type=int, default=30000, help='Длина программы')
+    parser.add_argument('--repeat', type=int, default=30, help='Количество повторов')
+    parser.add_argument('--tolerance', type=float, default=5.0,
+                        help='Допустимое замедление цикла без обработчиков, %% (по умолчанию: 5)')
+    args = parser.parse_args()
+
+    binary = make_program(args.instructions)
+    memory_size = data_address(args.instructions) + 0x1000
+
+    def added_and_removed(interpreter):
+        hook = NullHook()
+        interpreter.add_hook(hook)
+        interpreter.remove_hook(hook)
+
+    no_setup = lambda interpreter: None
+    cases = [
+        ("эталон (цикл до обработчиков)", no_setup, reference_run),
+        ("эталон, повторный запуск", no_setup, reference_run),
+        ("без обработчиков", no_setup, None),
+        ("обработчик добавлен и удален", added_and_removed, None),
+        ("пустой обработчик", lambda interpreter: interpreter.add_hook(NullHook()), None),
+    ]
+
+    # Первый повтор - прогрев, его результаты не учитываются
+    times = [[] for _ in cases]
+    for repeat in range(args.repeat + 1):
+        for k in range(len(cases)):
+            i = (repeat + k) % len(cases)
+            _, setup, runner = cases[i]
+            elapsed = measure(binary, memory_size, setup, runner)
+            if repeat > 0:
+                times[i].append(elapsed)
+
+    # Отношение к эталону в том же повторе
+    ratios = [[t / reference for t, reference in zip(case_times, times[0])] for case_times in times]
+    noise = 100.0 * median(abs(ratio - 1) for ratio in ratios[1])
+    print(f"Программа: {args.instructions} команд, медиана {args.repeat} повторов")
+    for (title, _, _), case_times, case_ratios in zip(cases, times, ratios):
+        elapsed = median(case_times)
+        rate = args.instructions / elapsed
+        print(f"  {title:<30} {elapsed * 1000:8.2f} мс  {rate:12,.0f} команд/с  "
+              f"{100.0 * (median(case_ratios) - 1):+6.1f}%")
+
+    overhead = 100.0 * (median(ratios[2]) - 1)
+    threshold = max(args.tolerance, 2 * noise)
+    print(f"Шум замера (два одинаковых запуска эталона): {noise:.1f}%")
+    if overhead > threshold:
+        print(f"Цикл без обработчиков медленнее эталона на {overhead:.1f}% "
+              f"(допустимо {threshold:.1f}%)")
+        sys.exit(1)
+    print(f"Цикл без обработчиков: {overhead:+.1f}% к эталону (допустимо {threshold:.1f}%)")
+
+
+if __name__ == '__main__':
+    main()
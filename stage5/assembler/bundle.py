@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Архив программ УВМ (.uvmb)
+
+Много небольших образов программ хранятся в одном файле, и программа
+загружается из архива по имени: путь "bundle.uvmb#name" принимают
+интерпретатор и run_examples.py.
+
+Формат (little-endian):
+- заголовок: b'UVMB', версия (uint16), количество образов, размер
+  таблицы индекса (uint32 каждое);
+- таблица индекса - хеш-таблица с открытой адресацией: ячейка для имени
+  выбирается по хешу имени, при занятости берется следующая. Ячейка:
+  смещение и длина имени, смещение и длина образа, хеш образа; пустая
+  ячейка имеет нулевую длину имени;
+- имена (UTF-8) подряд;
+- образы подряд, каждый выровнен на 8 байт.
+
+Архив отображается в память (mmap) целиком, поиск образа по имени
+просматривает в среднем одну-две ячейки индекса без чтения остальных, а
+образ возвращается как memoryview отображения без копирования.
+"""
+
+import os
+import sys
+import mmap
+import json
+import struct
+import hashlib
+import argparse
+from pathlib import Path
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+BUNDLE_MAGIC = b'UVMB'
+BUNDLE_VERSION = 1
+BUNDLE_SUFFIX = '.uvmb'
+
+# Выравнивание образов в архиве
+ALIGNMENT = 8
+
+_HEADER = struct.Struct('<4sHxxII')
+_SLOT = struct.Struct('<IHxxQQ16s')
+
+
+class BundleEntry(NamedTuple):
+    """Запись индекса архива"""
+    name: str
+    offset: int      # Смещение образа в файле
+    length: int      # Размер образа в байтах
+    digest: bytes    # BLAKE2b-128 образа
+
+
+def _digest(data) -> bytes:
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _slot_of(name: bytes, slot_count: int) -> int:
+    """Начальная ячейка индекса для имени (количество ячеек - степень двойки)"""
+    return int.from_bytes(hashlib.blake2b(name, digest_size=8).digest(), 'little') & (slot_count - 1)
+
+
+def split_bundle_path(spec: str) -> Optional[Tuple[str, str]]:
+    """Разбор пути АРХИВ.uvmb#ИМЯ; None, если это обычный путь к файлу"""
+    path, sep, name = spec.rpartition('#')
+    if sep and name and path.endswith(BUNDLE_SUFFIX):
+        return path, name
+    return None
+
+
+def write_bundle(path: str, images: Iterable[Tuple[str, bytes]]) -> int:
+    """
+    Запись архива; файл заменяется атомарно
+
+    Args:
+        path: путь к архиву
+        images: пары (имя, образ программы)
+
+    Returns:
+        Количество образов в архиве
+
+    Raises:
+        ValueError: пустое или повторяющееся имя, имя с символом '#'
+    """
+    entries = []
+    seen = set()
+    for name, image in images:
+        if not name or '#' in name:
+            raise ValueError(f"Некорректное имя образа: {name!r}")
+        if name in seen:
+            raise ValueError(f"Повторяющееся имя образа: {name}")
+        seen.add(name)
+        entries.append((name.encode('utf-8'), bytes(image)))
+
+    # Заполнение таблицы не более чем наполовину: короткие цепочки поиска
+    slot_count = 1
+    while slot_count < 2 * len(entries):
+        slot_count *= 2
+
+    names_offset = _HEADER.size + slot_count * _SLOT.size
+    names = b''.join(name for name, _ in entries)
+    data_offset = (names_offset + len(names) + ALIGNMENT - 1) & -ALIGNMENT
+
+    slots = [None] * slot_count
+    name_offset = names_offset
+    image_offset = data_offset
+    for name, image in entries:
+        slot = _slot_of(name, slot_count)
+        while slots[slot] is not None:
+            slot = (slot + 1) & (slot_count - 1)
+        slots[slot] = _SLOT.pack(name_offset, len(name), image_offset, len(image), _digest(image))
+        name_offset += len(name)
+        image_offset += (len(image) + ALIGNMENT - 1) & -ALIGNMENT
+
+    empty_slot = bytes(_SLOT.size)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(_HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, len(entries), slot_count))
+        f.writelines(slot or empty_slot for slot in slots)
+        f.write(names)
+        f.write(bytes(data_offset - names_offset - len(names)))
+        for _, image in entries:
+            f.write(image)
+            f.write(bytes(-len(image) % ALIGNMENT))
+    os.replace(temp_path, path)
+    return len(entries)
+
+
+class Bundle:
+    """
+    Архив, открытый для чтения через mmap
+
+    Образы, полученные через get(), ссылаются на отображение файла;
+    их нужно освободить (memoryview.release или with) до close().
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < _HEADER.size:
+                raise ValueError(f"Файл {path} не является архивом УВМ")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, self.count, self.slot_count = _HEADER.unpack_from(self._map, 0)
+            if magic != BUNDLE_MAGIC:
+                raise ValueError(f"Файл {path} не является архивом УВМ")
+            if version != BUNDLE_VERSION:
+                raise ValueError(f"Неподдерживаемая версия архива: {version}")
+            if (self.slot_count & (self.slot_count - 1) or self.count > self.slot_count
+                    or _HEADER.size + self.slot_count * _SLOT.size > len(self._map)):
+                raise ValueError(f"Архив {path} поврежден: некорректная таблица индекса")
+        except ValueError:
+            self._map.close()
+            raise
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, name: str) -> bool:
+        return self.find(name) is not None
+
+    def _entry(self, slot: int) -> Optional[BundleEntry]:
+        name_offset, name_length, offset, length, digest = _SLOT.unpack_from(
+            self._map, _HEADER.size + slot * _SLOT.size)
+        if name_length == 0:
+            return None
+        if name_offset + name_length > len(self._map) or offset + length > len(self._map):
+            raise ValueError(f"Архив {self.path} поврежден: запись индекса {slot} вне файла")
+        name = self._map[name_offset:name_offset + name_length].decode('utf-8')
+        return BundleEntry(name, offset, length, digest)
+
+    def find(self, name: str) -> Optional[BundleEntry]:
+        """Запись индекса по имени (None - такого образа нет)"""
+        if self.slot_count == 0:
+            return None
+        slot = _slot_of(name.encode('utf-8'), self.slot_count)
+        for _ in range(self.slot_count):
+            entry = self._entry(slot)
+            if entry is None:
+                return None
+            if entry.name == name:
+                return entry
+            slot = (slot + 1) & (self.slot_count - 1)
+        return None
+
+    def entries(self) -> List[BundleEntry]:
+        """Все записи индекса в порядке расположения образов"""
+        found = (self._entry(slot) for slot in range(self.slot_count))
+        return sorted((entry for entry in found if entry is not None), key=lambda entry: entry.offset)
+
+    def __iter__(self) -> Iterator[str]:
+        return (entry.name for entry in self.entries())
+
+    def get(self, name: str, verify: bool = True) -> memoryview:
+        """
+        Образ программы без копирования
+
+        Raises:
+            KeyError: образа нет в архиве
+            ValueError: хеш образа не совпадает с индексом
+        """
+        entry = self.find(name)
+        if entry is None:
+            raise KeyError(f"Образ {name} не найден в архиве {self.path}")
+        view = memoryview(self._map)[entry.offset:entry.offset + entry.length]
+        if verify and _digest(view) != entry.digest:
+            view.release()
+            raise ValueError(f"Архив {self.path} поврежден: неверный хеш образа {name}")
+        return view
+
+
+def read_program(spec: str) -> bytes:
+    """Содержимое программы по пути к файлу или АРХИВ.uvmb#ИМЯ"""
+    reference = split_bundle_path(spec)
+    if reference is None:
+        with open(spec, 'rb') as f:
+            return f.read()
+    with Bundle(reference[0]) as bundle, bundle.get(reference[1]) as image:
+        return bytes(image)
+
+
+def build_from_directory(directory: str, pattern: str = '*.json') -> List[Tuple[str, bytes]]:
+    """
+    Ассемблирование JSON-программ каталога; имя образа - имя файла без
+    расширения
+
+    Raises:
+        ValueError: ошибка в одной из программ (с указанием файла)
+    """
+    from assembler import build_image
+
+    images = []
+    for path in sorted(Path(directory).glob(pattern)):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                images.append((path.stem, build_image(json.load(f))))
+        except (json.JSONDecodeError, ValueError) as e:
+            raise ValueError(f"{path.name}: {e}")
+    return images
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Архив программ УВМ')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build = commands.add_parser('build', help='Собрать архив из JSON-программ каталога')
+    build.add_argument('directory', help='Каталог с исходными текстами программ')
+    build.add_argument('-o', '--output', required=True, help=f'Путь к архиву ({BUNDLE_SUFFIX})')
+    build.add_argument('--pattern', default='*.json', help='Шаблон имен исходных файлов (по умолчанию: *.json)')
+
+    listing = commands.add_parser('list', help='Вывести содержимое архива')
+    listing.add_argument('bundle', help='Путь к архиву')
+
+    extract = commands.add_parser('extract', help='Извлечь образ программы из архива')
+    extract.add_argument('bundle', help='Путь к архиву')
+    extract.add_argument('name', help='Имя образа')
+    extract.add_argument('-o', '--output', required=True, help='Путь к двоичному файлу')
+
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'build':
+            count = write_bundle(args.output, build_from_directory(args.directory, args.pattern))
+            print(f"Архив {args.output}: образов {count}, размер {os.path.getsize(args.output)} байт")
+        elif args.command == 'list':
+            with Bundle(args.bundle) as bundle:
+                for entry in bundle.entries():
+                    print(f"  {entry.name:<32} {entry.length:>8} байт  {entry.digest.hex()}")
+                print(f"Образов: {len(bundle)}")
+        else:
+            image = read_program(f"{args.bundle}#{args.name}")
+            with open(args.output, 'wb') as f:
+                f.write(image)
+            print(f"Образ {args.name} ({len(image)} байт) записан в {args.output}")
+    except FileNotFoundError as e:
+        print(f"Ошибка: файл {e.filename} не найден")
+        sys.exit(1)
+    except (KeyError, ValueError) as e:
+        print(f"Ошибка: {e.args[0] if isinstance(e, KeyError) else e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Сохранение и восстановление состояния УВМ на диске
+
+Формат файла (little-endian):
+- заголовок: b'UVMS', версия, хеш конфигурации (размер памяти, размер
+  страницы, набор команд), PC, счетчик выполненных команд, размер
+  программы, размер памяти, флаг halted, количество сохраненных страниц;
+- 128 регистров (uint32);
+- таблица страниц: номер страницы и размер сжатых данных (uint32, uint32);
+- сжатые zlib данные страниц подряд.
+
+Сохраняются только ненулевые страницы памяти. Файл записывается во
+временный и заменяется атомарно: сбой во время сохранения не портит
+предыдущее состояние. При загрузке файл отображается в память (mmap), все
+страницы сначала проверяются пробной распаковкой без сохранения данных, и
+только затем распаковываются по одной прямо в память интерпретатора:
+поврежденный файл не изменяет состояние машины, а второй копии образа
+памяти не создается.
+"""
+
+import os
+import mmap
+import zlib
+import struct
+import hashlib
+from contextlib import nullcontext
+
+from isa import ISA
+
+CHECKPOINT_MAGIC = b'UVMS'
+CHECKPOINT_VERSION = 1
+
+# Размер страницы памяти в файле состояния
+PAGE_SIZE = 4096
+
+# Уровень сжатия zlib: быстрое сжатие важнее размера
+COMPRESS_LEVEL = 1
+
+_HEADER = struct.Struct('<4sH8sQQQQBI')
+_REGISTERS = struct.Struct('<128I')
+_PAGE = struct.Struct('<II')
+
+
+def config_hash(memory_size: int) -> bytes:
+    """Хеш конфигурации машины: состояние восстанавливается только в такую же"""
+    isa = ','.join(f"{spec.opcode}:{spec.size}:{spec.field_names}" for spec in ISA.values())
+    text = f"{CHECKPOINT_VERSION};{memory_size};{PAGE_SIZE};{isa}"
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest()
+
+
+def save_checkpoint(interpreter, path: str) -> int:
+    """
+    Сохранение состояния интерпретатора
+
+    Returns:
+        Количество сохраненных (ненулевых) страниц памяти
+    """
+    memory_size = len(interpreter.memory)
+    zero_page = bytes(PAGE_SIZE)
+    table = []
+    chunks = []
+    with _view(interpreter.memory) as memory:
+        for offset in range(0, memory_size, PAGE_SIZE):
+            page = memory[offset:offset + PAGE_SIZE]
+            if page != zero_page[:len(page)]:
+                data = zlib.compress(page, COMPRESS_LEVEL)
+                table.append(_PAGE.pack(offset // PAGE_SIZE, len(data)))
+                chunks.append(data)
+
+    header = _HEADER.pack(CHECKPOINT_MAGIC, CHECKPOINT_VERSION, config_hash(memory_size),
+                          interpreter.pc, interpreter.instructions_executed, interpreter.program_size,
+                          memory_size, int(interpreter.halted), len(table))
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(header)
+        f.write(_REGISTERS.pack(*interpreter.registers))
+        f.writelines(table)
+        f.writelines(chunks)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+    return len(table)
+
+
+def load_checkpoint(interpreter, path: str) -> None:
+    """
+    Восстановление состояния интерпретатора
+
+    Raises:
+        ValueError: файл поврежден или сохранен для другой конфигурации
+    """
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as image:
+        if len(image) < _HEADER.size + _REGISTERS.size:
+            raise ValueError("Файл состояния поврежден: неполный заголовок")
+        (magic, version, digest, pc, executed, program_size,
+         memory_size, halted, page_count) = _HEADER.unpack_from(image, 0)
+        if magic != CHECKPOINT_MAGIC:
+            raise ValueError("Не файл состояния УВМ")
+        if version != CHECKPOINT_VERSION:
+            raise ValueError(f"Неподдерживаемая версия файла состояния: {version}")
+        if memory_size != len(interpreter.memory) or digest != config_hash(memory_size):
+            raise ValueError(f"Состояние сохранено для другой конфигурации "
+                             f"(память {memory_size} байт, у интерпретатора {len(interpreter.memory)})")
+
+        registers = _REGISTERS.unpack_from(image, _HEADER.size)
+        table_offset = _HEADER.size + _REGISTERS.size
+        data_offset = table_offset + page_count * _PAGE.size
+        if data_offset > len(image):
+            raise ValueError("Файл состояния поврежден: неполная таблица страниц")
+
+        view = memoryview(image)
+        try:
+            # Первый проход: проверка всех страниц, распакованные данные
+            # не сохраняются (не больше страницы за раз)
+            pages = {}
+            for i in range(page_count):
+                index, length = _PAGE.unpack_from(image, table_offset + i * _PAGE.size)
+                if data_offset + length > len(image) or index in pages:
+                    raise ValueError(f"Файл состояния поврежден: страница {index}")
+                with view[data_offset:data_offset + length] as data:
+                    size = _page_size(data, index)
+                if index * PAGE_SIZE + size > memory_size:
+                    raise ValueError(f"Файл состояния поврежден: страница {index}")
+                pages[index] = (data_offset, length)
+                data_offset += length
+
+            # Файл проверен целиком - состояние машины заменяется; страницы
+            # распаковываются сразу в память по одной
+            memory = interpreter.memory
+            for index, (offset, length) in pages.items():
+                with view[offset:offset + length] as data:
+                    page = zlib.decompress(data)
+                start = index * PAGE_SIZE
+                memory[start:start + len(page)] = page
+        finally:
+            view.release()
+
+    # Страницы, которых нет в файле, - нулевые
+    _clear_pages(memory, pages)
+    interpreter.registers[:] = registers
+    interpreter.pc = pc
+    interpreter.instructions_executed = executed
+    interpreter.program_size = program_size
+    interpreter.halted = bool(halted)
+    interpreter.stop_reason = None
+    interpreter.error = None
+
+
+def _page_size(data, index: int) -> int:
+    """Размер распакованной страницы; данные проверяются и не сохраняются"""
+    decompressor = zlib.decompressobj()
+    try:
+        page = decompressor.decompress(data, PAGE_SIZE + 1)
+    except zlib.error as e:
+        raise ValueError(f"Файл состояния поврежден: страница {index} ({e})")
+    if len(page) > PAGE_SIZE or not decompressor.eof:
+        raise ValueError(f"Файл состояния поврежден: страница {index}")
+    return len(page)
+
+
+def _view(memory):
+    """memoryview памяти без копирования; память без буфера (PagedMemory) - как есть"""
+    try:
+        return memoryview(memory)
+    except TypeError:
+        return nullcontext(memory)
+
+
+def _clear_pages(memory, keep) -> None:
+    """Обнуление ненулевых страниц памяти, кроме перечисленных"""
+    zero_page = bytes(PAGE_SIZE)
+    with _view(memory) as view:
+        for offset in range(0, len(memory), PAGE_SIZE):
+            if offset // PAGE_SIZE not in keep:
+                end = min(offset + PAGE_SIZE, len(memory))
+                if view[offset:end] != zero_page[:end - offset]:
+                    view[offset:end] = zero_page[:end - offset]
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Покрытие выполнения программ УВМ
+
+Две битовые карты bytearray: по одному байту на каждое смещение кода
+(команда с этим PC выполнялась) и на каждое 32-битное слово памяти
+(к слову обращались чтением или записью). Если покрытие - единственный
+обработчик, интерпретатор выполняет его в отдельном цикле, где на команду
+приходится одна запись байта. Карты нескольких запусков одной программы
+объединяются (побитовое ИЛИ). Отчет сопоставляет карту кода с номерами
+команд исходной JSON-программы, если хеш собранной из нее программы
+совпадает с хешем в карте.
+
+Формат файла: b'UVMC', версия (uint16), хеш программы (8 байт), размер
+карты кода (uint32), размер карты данных (uint32), затем обе карты.
+"""
+
+import sys
+import json
+import struct
+import hashlib
+import argparse
+from contextlib import redirect_stdout
+from typing import Dict, List, Tuple
+
+from parser import parse_program
+from objfile import SECTION_CODE, is_object, read_object
+
+COVERAGE_MAGIC = b'UVMC'
+COVERAGE_VERSION = 1
+
+# Размер слова данных в байтах
+WORD_SIZE = 4
+
+_HEADER = struct.Struct('<4sH8sII')
+
+
+def program_hash(program: bytes) -> bytes:
+    """Хеш образа программы: карты разных программ не объединяются"""
+    return hashlib.blake2b(program, digest_size=8).digest()
+
+
+class Coverage:
+    """Карты покрытия кода и данных - обработчик инструментирования"""
+
+    def __init__(self, code_size: int, memory_size: int, digest: bytes = bytes(8)):
+        self.digest = digest
+        self.code = bytearray(code_size)
+        self.data = bytearray((memory_size + WORD_SIZE - 1) // WORD_SIZE)
+
+    @classmethod
+    def for_interpreter(cls, interpreter) -> 'Coverage':
+        """Пустые карты для программы, загруженной в интерпретатор"""
+        image = bytes(interpreter.memory[:interpreter.program_size])
+        return cls(interpreter.program_size, len(interpreter.memory), program_hash(image))
+
+    # Обработчики инструментирования (используются вместе с другими
+    # обработчиками; без них работает UVMInterpreter._run_coverage)
+
+    def on_instruction(self, pc, opcode, field_b, field_c, field_d) -> None:
+        if pc < len(self.code):
+            self.code[pc] = 1
+
+    def on_read(self, pc, address, value) -> None:
+        if 0 <= address < len(self.data) * WORD_SIZE:
+            self.data[address >> 2] = 1
+
+    on_write = on_read
+
+    # Объединение и хранение
+
+    def merge(self, other: 'Coverage') -> None:
+        """Объединение с картами другого запуска той же программы"""
+        if other.digest != self.digest or len(other.code) != len(self.code):
+            raise ValueError("Покрытие относится к другой программе")
+        if len(other.data) != len(self.data):
+            raise ValueError(f"Разный размер памяти: {len(other.data) * WORD_SIZE} и "
+                             f"{len(self.data) * WORD_SIZE} байт")
+        self.code = _bitwise_or(self.code, other.code)
+        self.data = _bitwise_or(self.data, other.data)
+
+    def save(self, path: str) -> None:
+        with open(path, 'wb') as f:
+            f.write(_HEADER.pack(COVERAGE_MAGIC, COVERAGE_VERSION, self.digest,
+                                 len(self.code), len(self.data)))
+            f.write(self.code)
+            f.write(self.data)
+
+    @classmethod
+    def load(cls, path: str) -> 'Coverage':
+        with open(path, 'rb') as f:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                raise ValueError("Файл покрытия поврежден: неполный заголовок")
+            magic, version, digest, code_size, data_size = _HEADER.unpack(header)
+            if magic != COVERAGE_MAGIC:
+                raise ValueError("Не файл покрытия УВМ")
+            if version != COVERAGE_VERSION:
+                raise ValueError(f"Неподдерживаемая версия файла покрытия: {version}")
+            coverage = cls(0, 0, digest)
+            coverage.code = bytearray(f.read(code_size))
+            coverage.data = bytearray(f.read(data_size))
+        if len(coverage.code) != code_size or len(coverage.data) != data_size:
+            raise ValueError("Файл покрытия поврежден: неполные данные")
+        return coverage
+
+    def save_merged(self, path: str) -> None:
+        """Сохранение с объединением карт, уже записанных в файл"""
+        try:
+            previous = Coverage.load(path)
+        except FileNotFoundError:
+            pass
+        else:
+            self.merge(previous)
+        self.save(path)
+
+
+def _bitwise_or(a: bytearray, b: bytearray) -> bytearray:
+    # Через длинные целые - без цикла по байтам в Python
+    value = int.from_bytes(a, 'little') | int.from_bytes(b, 'little')
+    return bytearray(value.to_bytes(len(a), 'little'))
+
+
+def _ranges(flags) -> List[Tuple[int, int]]:
+    """Отрезки [начало, конец] подряд идущих ненулевых элементов"""
+    ranges = []
+    start = None
+    for i, flag in enumerate(flags):
+        if flag and start is None:
+            start = i
+        elif not flag and start is not None:
+            ranges.append((start, i - 1))
+            start = None
+    if start is not None:
+        ranges.append((start, len(flags) - 1))
+    return ranges
+
+
+def _code_of(image: bytes) -> bytes:
+    """Код программы в том виде, в каком его хеширует for_interpreter"""
+    if not is_object(image):
+        return image
+    return b''.join(section.data for section in read_object(image) if section.kind == SECTION_CODE)
+
+
+def report(coverage: Coverage, program_json: dict) -> Dict:
+    """
+    Сопоставление карты кода с номерами команд JSON-программы
+
+    Raises:
+        ValueError: карта снята с другой программы (хеши не совпадают)
+    """
+    from assembler import build_image
+
+    if program_hash(_code_of(build_image(program_json))) != coverage.digest:
+        raise ValueError("Покрытие относится к другой программе")
+    instructions = parse_program(program_json)
+    executed = []
+    offset = 0
+    for instr in instructions:
+        executed.append(offset < len(coverage.code) and coverage.code[offset] != 0)
+        offset += instr.size
+
+    words = [(start * WORD_SIZE, end * WORD_SIZE + WORD_SIZE - 1)
+             for start, end in _ranges(coverage.data)]
+    return {
+        'instructions': len(instructions),
+        'executed': sum(executed),
+        'not_executed': [[start, end] for start, end in _ranges([not e for e in executed])],
+        'words_touched': sum(1 for flag in coverage.data if flag),
+        'data_ranges': [[f"0x{start:08X}", f"0x{end:08X}"] for start, end in words],
+    }
+
+
+def format_report(result: Dict) -> str:
+    total = result['instructions']
+    share = 100.0 * result['executed'] / total if total else 0.0
+    lines = [f"Выполнено команд: {result['executed']} из {total} ({share:.1f}%)"]
+    if result['not_executed']:
+        lines.append("Не выполнялись команды (номера в JSON):")
+        for start, end in result['not_executed']:
+            lines.append(f"  #{start}" if start == end else f"  #{start}-#{end}")
+    lines.append(f"Затронуто слов памяти: {result['words_touched']}")
+    for start, end in result['data_ranges']:
+        lines.append(f"  {start}-{end}")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Отчет о покрытии выполнения программы УВМ')
+    parser.add_argument('coverage_file', help='Файл покрытия (interpreter.py --coverage)')
+    parser.add_argument('program_json', help='Исходная JSON-программа')
+    parser.add_argument('--json', action='store_true', help='Вывод в формате JSON')
+
+    args = parser.parse_args()
+
+    try:
+        coverage = Coverage.load(args.coverage_file)
+        with open(args.program_json, 'r', encoding='utf-8') as f:
+            program_json = json.load(f)
+        # Предупреждения ассемблера при сборке программы для сверки хеша -
+        # не в вывод отчета
+        with redirect_stdout(sys.stderr):
+            result = report(coverage, program_json)
+    except FileNotFoundError as e:
+        print(f"Ошибка: файл {e.filename} не найден")
+        sys.exit(1)
+    except ValueError as e:
+        print(f"Ошибка: {e}")
+        sys.exit(1)
+
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    else:
+        print(format_report(result))
+
+
+if __name__ == "__main__":
+    main()
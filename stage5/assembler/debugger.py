@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Отладчик для учебной виртуальной машины (УВМ)
+
+Поддерживает точки останова по PC и по номеру команды, пошаговое
+выполнение, выполнение до PC или до изменения слова памяти, просмотр
+регистров и памяти, а при включенном журнале отмены - обратный ход
+(reverse-step, reverse-continue, goto). Команды УВМ не меняют порядок выполнения, поэтому
+количество команд до следующей точки останова вычисляется заранее по
+таблице смещений, и участок выполняется обычным циклом интерпретатора
+без проверки каждой команды.
+"""
+
+import io
+import cmd
+import argparse
+from bisect import bisect_left
+from typing import List, Optional
+
+from interpreter import UVMInterpreter, MAX_INSTRUCTIONS
+from disassembler import iter_decode
+from watchpoints import Watchpoints, WATCH_CHANGE
+from journal import UndoJournal, DEFAULT_CHECKPOINT_EVERY
+
+
+class Debugger:
+    """Управление выполнением программы в интерпретаторе"""
+
+    def __init__(self, interpreter: UVMInterpreter):
+        self.interpreter = interpreter
+        self.breakpoints: List[int] = []   # PC точек останова, по возрастанию
+        self.offsets: List[int] = []       # Смещения команд программы
+        self.listing: List[str] = []
+        self.journal: Optional[UndoJournal] = None
+        self.refresh_program()
+
+    def refresh_program(self) -> None:
+        """Построение таблицы смещений команд загруженной программы"""
+        interpreter = self.interpreter
+        image = io.BytesIO(bytes(interpreter.memory[:interpreter.program_size]))
+        self.offsets = []
+        self.listing = []
+        try:
+            for offset, spec, raw, field_b, field_c, field_d in iter_decode(image):
+                self.offsets.append(offset)
+                operands = f"B={field_b}, C={field_c}" + ("" if field_d is None else f", D={field_d}")
+                self.listing.append(f"{spec.mnemonic:<5} {operands}")
+        except ValueError:
+            pass  # Таблица строится до первой нераспознанной команды
+
+    # Точки останова
+
+    def index_to_pc(self, index: int) -> int:
+        """PC команды по ее номеру в программе (номер в JSON)"""
+        if not 0 <= index < len(self.offsets):
+            raise ValueError(f"Нет команды с номером {index} (всего команд: {len(self.offsets)})")
+        return self.offsets[index]
+
+    def pc_to_index(self, pc: int) -> Optional[int]:
+        """Номер команды по PC или None, если PC не на начале команды"""
+        i = bisect_left(self.offsets, pc)
+        if i < len(self.offsets) and self.offsets[i] == pc:
+            return i
+        return None
+
+    def add_breakpoint(self, pc: int) -> None:
+        if self.pc_to_index(pc) is None:
+            raise ValueError(f"По адресу 0x{pc:08X} нет начала команды")
+        if pc not in self.breakpoints:
+            self.breakpoints.append(pc)
+            self.breakpoints.sort()
+
+    def remove_breakpoint(self, pc: int) -> None:
+        if pc not in self.breakpoints:
+            raise ValueError(f"Нет точки останова по адресу 0x{pc:08X}")
+        self.breakpoints.remove(pc)
+
+    # Журнал отмены
+
+    def enable_journal(self, checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY) -> UndoJournal:
+        """
+        Включение журнала отмены
+
+        Пока журнал включен, выполнение идет через инструментированный цикл.
+        """
+        if self.journal is None:
+            self.journal = UndoJournal(self.interpreter, checkpoint_every)
+            self.interpreter.add_hook(self.journal)
+        return self.journal
+
+    def disable_journal(self) -> None:
+        if self.journal is not None:
+            self.interpreter.remove_hook(self.journal)
+            self.journal = None
+
+    def _require_journal(self) -> UndoJournal:
+        if self.journal is None:
+            raise ValueError("Журнал отмены не включен (команда journal)")
+        return self.journal
+
+    def reverse_step(self, count: int = 1) -> str:
+        """Отмена count последних команд"""
+        undone = self._require_journal().reverse_step(count)
+        if undone < count:
+            return f"Достигнуто начало журнала, PC=0x{self.interpreter.pc:08X}"
+        return self._status()
+
+    def reverse_continue(self, address: int) -> str:
+        """Возврат к последней команде, записавшей слово по адресу"""
+        pc = self._require_journal().reverse_continue(address)
+        if pc is None:
+            return f"Запись по адресу 0x{address:08X} не найдена, достигнуто начало журнала"
+        return f"Остановка: последняя запись по адресу 0x{address:08X}, PC=0x{pc:08X}"
+
+    def goto(self, time: int) -> str:
+        """Переход к состоянию перед командой с номером time в журнале"""
+        self._require_journal().goto(time)
+        return self._status()
+
+    # Выполнение
+
+    def _steps_to(self, pc: int) -> Optional[int]:
+        """Количество команд от текущего PC до команды по адресу pc"""
+        current = self.interpreter.pc
+        if pc <= current:
+            return None
+        start = bisect_left(self.offsets, current)
+        end = bisect_left(self.offsets, pc)
+        return end - start
+
+    def _run(self, steps: Optional[int]) -> str:
+        interpreter = self.interpreter
+        if interpreter.halted:
+            return "Программа завершена"
+        interpreter.run(steps)
+        if interpreter.halted:
+            return f"Программа завершена, PC=0x{interpreter.pc:08X}"
+        return interpreter.stop_reason or f"Остановка, PC=0x{interpreter.pc:08X}"
+
+    def step(self, count: int = 1) -> str:
+        """Выполнение count команд"""
+        return self._run(count)
+
+    def cont(self) -> str:
+        """Выполнение до следующей точки останова или до конца программы"""
+        pc = self.interpreter.pc
+        i = bisect_left(self.breakpoints, pc + 1)
+        if i == len(self.breakpoints):
+            return self._run(None)
+        return self.run_until_pc(self.breakpoints[i], reason='точка останова')
+
+    def run_until_pc(self, pc: int, reason: str = 'достигнут PC') -> str:
+        """Выполнение до команды по адресу pc (без проверки каждой команды)"""
+        steps = self._steps_to(pc)
+        if steps is None:
+            raise ValueError(f"Адрес 0x{pc:08X} уже пройден")
+        self._run(steps)
+        if self.interpreter.pc == pc and not self.interpreter.halted:
+            return f"Остановка: {reason}, PC=0x{pc:08X}"
+        return self._status()
+
+    def run_until_change(self, address: int) -> str:
+        """Выполнение до изменения 32-битного слова по адресу"""
+        watchpoints = Watchpoints(self.interpreter, log=None)
+        watchpoints.add(address, kind=WATCH_CHANGE)
+        self.interpreter.add_hook(watchpoints)
+        try:
+            result = self._run(None)
+        finally:
+            self.interpreter.remove_hook(watchpoints)
+        if watchpoints.hits:
+            return f"Остановка: {watchpoints.hits[-1].describe()}"
+        return result
+
+    def _status(self) -> str:
+        interpreter = self.interpreter
+        if interpreter.halted:
+            return f"Программа завершена, PC=0x{interpreter.pc:08X}"
+        return f"PC=0x{interpreter.pc:08X}"
+
+    # Просмотр состояния
+
+    def where(self) -> str:
+        """Текущая команда"""
+        interpreter = self.interpreter
+        index = self.pc_to_index(interpreter.pc)
+        text = self.listing[index] if index is not None else "?"
+        return (f"PC=0x{interpreter.pc:08X} команда #{index if index is not None else '?'}: {text}; "
+                f"выполнено команд: {interpreter.instructions_executed}")
+
+    def read_word(self, address: int) -> int:
+        memory = self.interpreter.memory
+        if address < 0 or address + 4 > len(memory):
+            raise ValueError(f"Адрес вне памяти: 0x{address:08X}")
+        return int.from_bytes(memory[address:address + 4], 'little')
+
+
+class DebuggerShell(cmd.Cmd):
+    """Интерактивная оболочка отладчика (команды можно читать из файла)"""
+
+    intro = "Отладчик УВМ. Введите help для списка команд."
+    prompt = "(uvm) "
+
+    def __init__(self, debugger: Debugger, stdin=None):
+        super().__init__(stdin=stdin)
+        if stdin is not None:
+            self.use_rawinput = False
+            self.prompt = ""
+            self.intro = None
+        self.debugger = debugger
+
+    def onecmd(self, line):
+        try:
+            return super().onecmd(line)
+        except ValueError as e:
+            print(f"Ошибка: {e}")
+            return False
+
+    def emptyline(self):
+        return False
+
+    @staticmethod
+    def _number(text: str) -> int:
+        return int(text, 0)
+
+    def do_break(self, arg):
+        """break ADDR | break #N - точка останова по PC или по номеру команды"""
+        arg = arg.strip()
+        pc = self.debugger.index_to_pc(int(arg[1:], 0)) if arg.startswith('#') else self._number(arg)
+        self.debugger.add_breakpoint(pc)
+        print(f"Точка останова: PC=0x{pc:08X} (команда #{self.debugger.pc_to_index(pc)})")
+
+    def do_delete(self, arg):
+        """delete ADDR | delete #N - удалить точку останова"""
+        arg = arg.strip()
+        pc = self.debugger.index_to_pc(int(arg[1:], 0)) if arg.startswith('#') else self._number(arg)
+        self.debugger.remove_breakpoint(pc)
+
+    def do_info(self, arg):
+        """info - список точек останова"""
+        if not self.debugger.breakpoints:
+            print("Точек останова нет")
+        for pc in self.debugger.breakpoints:
+            print(f"  0x{pc:08X} (команда #{self.debugger.pc_to_index(pc)})")
+
+    def do_step(self, arg):
+        """step [N] - выполнить N команд (по умолчанию 1)"""
+        print(self.debugger.step(self._number(arg) if arg.strip() else 1))
+        print(self.debugger.where())
+
+    def do_continue(self, arg):
+        """continue - выполнять до точки останова или конца программы"""
+        print(self.debugger.cont())
+
+    def do_until(self, arg):
+        """until pc==ADDR | until mem[ADDR] - выполнять до PC или до изменения слова памяти"""
+        arg = arg.replace(' ', '')
+        if arg.startswith('pc=='):
+            print(self.debugger.run_until_pc(self._number(arg[4:])))
+        elif arg.startswith('mem[') and arg.endswith(']'):
+            print(self.debugger.run_until_change(self._number(arg[4:-1])))
+        else:
+            print("Использование: until pc==ADDR | until mem[ADDR]")
+
+    def do_journal(self, arg):
+        """journal [on [N] | off] - журнал отмены (N - период полных снимков)"""
+        parts = arg.split()
+        if parts and parts[0] == 'off':
+            self.debugger.disable_journal()
+        elif parts and parts[0] == 'on':
+            every = self._number(parts[1]) if len(parts) > 1 else DEFAULT_CHECKPOINT_EVERY
+            self.debugger.enable_journal(every)
+        journal = self.debugger.journal
+        if journal is None:
+            print("Журнал отмены выключен")
+        else:
+            print(f"Журнал отмены: команд {journal.time}, записей {len(journal.kinds)}, "
+                  f"снимков {len(journal.checkpoints)}")
+
+    def do_reverse_step(self, arg):
+        """reverse_step [N] - отменить N последних команд (нужен journal on)"""
+        print(self.debugger.reverse_step(self._number(arg) if arg.strip() else 1))
+        print(self.debugger.where())
+
+    def do_reverse_continue(self, arg):
+        """reverse_continue ADDR - вернуться к последней записи слова по адресу"""
+        print(self.debugger.reverse_continue(self._number(arg)))
+        print(self.debugger.where())
+
+    def do_goto(self, arg):
+        """goto N - перейти к состоянию перед N-й командой журнала"""
+        print(self.debugger.goto(self._number(arg)))
+        print(self.debugger.where())
+
+    def do_where(self, arg):
+        """where - текущая команда"""
+        print(self.debugger.where())
+
+    def do_regs(self, arg):
+        """regs - ненулевые регистры"""
+        self.debugger.interpreter.dump_registers()
+
+    def do_reg(self, arg):
+        """reg N - значение регистра"""
+        index = self._number(arg)
+        registers = self.debugger.interpreter.registers
+        if not 0 <= index < len(registers):
+            raise ValueError(f"Нет регистра R{index} (всего регистров: {len(registers)})")
+        value = registers[index]
+        print(f"R{index} = 0x{value:08X} ({value})")
+
+    def do_x(self, arg):
+        """x ADDR [N] - показать N 32-битных слов памяти"""
+        parts = arg.split()
+        if not parts:
+            raise ValueError("Использование: x ADDR [N]")
+        address = self._number(parts[0])
+        count = self._number(parts[1]) if len(parts) > 1 else 1
+        for i in range(count):
+            value = self.debugger.read_word(address + 4 * i)
+            print(f"0x{address + 4 * i:08X}: 0x{value:08X} ({value})")
+
+    def do_dump(self, arg):
+        """dump START END FILE - дамп памяти в CSV"""
+        start, end, path = arg.split()
+        self.debugger.interpreter.dump_memory(self._number(start), self._number(end), path)
+
+    def do_quit(self, arg):
+        """quit - выход"""
+        return True
+
+    do_b = do_break
+    do_s = do_step
+    do_c = do_continue
+    do_q = do_quit
+    do_rs = do_reverse_step
+    do_rc = do_reverse_continue
+
+    def precmd(self, line):
+        # Допускаются и имена через дефис: reverse-step, reverse-continue
+        if line.startswith('reverse-'):
+            line = 'reverse_' + line[len('reverse-'):]
+        return line
+
+    def do_EOF(self, arg):
+        return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Отладчик УВМ')
+    parser.add_argument('program_file', help='Путь к бинарному файлу с программой')
+    parser.add_argument('--memory-size', type=int, default=1024 * 1024,
+                        help='Размер памяти в байтах (по умолчанию: 1MB)')
+    parser.add_argument('--max-instructions', type=int, default=MAX_INSTRUCTIONS,
+                        help=f'Ограничение количества выполненных команд (по умолчанию: {MAX_INSTRUCTIONS})')
+    parser.add_argument('--script', help='Выполнить команды отладчика из файла')
+    parser.add_argument('--journal', type=int, nargs='?', const=DEFAULT_CHECKPOINT_EVERY,
+                        metavar='N',
+                        help='Включить журнал отмены с полным снимком каждые N команд')
+
+    args = parser.parse_args()
+
+    interpreter = UVMInterpreter(memory_size=args.memory_size, verbose=False)
+    interpreter.load_program(args.program_file)
+    interpreter.max_instructions = args.max_instructions
+    debugger = Debugger(interpreter)
+    if args.journal is not None:
+        debugger.enable_journal(args.journal)
+
+    if args.script:
+        with open(args.script, 'r', encoding='utf-8') as f:
+            DebuggerShell(debugger, stdin=f).cmdloop()
+    else:
+        DebuggerShell(debugger).cmdloop()
+
+
+if __name__ == "__main__":
+    main()
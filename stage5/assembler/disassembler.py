@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Дизассемблер для учебной виртуальной машины (УВМ)
+
+Двоичный файл читается блоками фиксированного размера, тип каждой команды
+определяется по таблице первого байта из isa.py. Результат выводится
+потоково (листинг или JSON), поэтому объем используемой памяти не зависит
+от размера образа. JSON-вывод снова принимается parse_program.
+"""
+
+import io
+import sys
+import json
+import argparse
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Optional, TextIO, Tuple
+
+from isa import DISPATCH, OPCODE_MASK, OpcodeSpec
+from objfile import OBJECT_MAGIC, SECTION_CODE, SECTION_DATA, Section, read_object
+
+# Размер блока чтения по умолчанию
+CHUNK_SIZE = 1 << 20
+
+
+def iter_decode(stream: BinaryIO, chunk_size: int = CHUNK_SIZE
+                ) -> Iterator[Tuple[int, OpcodeSpec, bytes, int, int, int]]:
+    """
+    Потоковое декодирование команд
+
+    Yields:
+        Кортежи (смещение, описание команды, байты команды, B, C, D)
+
+    Raises:
+        ValueError: неизвестный код операции или обрезанная последняя команда
+    """
+    dispatch = DISPATCH
+    base = 0            # Смещение начала буфера в файле
+    buf = b''
+
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+
+        buf = buf + chunk if buf else chunk
+        pos = 0
+        end = len(buf)
+
+        while pos < end:
+            entry = dispatch[buf[pos]]
+            if entry is None:
+                raise ValueError(f"Неизвестный код операции 0x{buf[pos] & OPCODE_MASK:02X} "
+                                 f"по смещению 0x{base + pos:08X}")
+            spec, decode = entry
+            nxt = pos + spec.size
+            if nxt > end:
+                break  # Команда продолжается в следующем блоке
+            field_b, field_c, field_d = decode(buf, pos)
+            yield base + pos, spec, buf[pos:nxt], field_b, field_c, field_d
+            pos = nxt
+
+        base += pos
+        buf = buf[pos:]
+
+    if buf:
+        raise ValueError(f"Неполная команда в конце файла по смещению 0x{base:08X} "
+                         f"({len(buf)} байт)")
+
+
+def write_listing(stream: BinaryIO, out: TextIO, chunk_size: int = CHUNK_SIZE) -> int:
+    """
+    Вывод листинга: смещение, байты, мнемоника, операнды
+
+    Returns:
+        Количество команд
+    """
+    count = 0
+    lines = []
+    for offset, spec, raw, field_b, field_c, field_d in iter_decode(stream, chunk_size):
+        operands = f"B={field_b}, C={field_c}"
+        if field_d is not None:
+            operands += f", D={field_d}"
+        lines.append(f"0x{offset:08X}: {raw.hex(' ').upper():<17}  {spec.mnemonic:<5} "
+                     f"{operands:<24} ; {spec.title}\n")
+        count += 1
+        if len(lines) >= 4096:
+            out.write(''.join(lines))
+            lines.clear()
+    out.write(''.join(lines))
+    return count
+
+
+def write_json(stream: BinaryIO, out: TextIO, name: str, chunk_size: int = CHUNK_SIZE,
+               data: Optional[List[Section]] = None) -> int:
+    """
+    Вывод программы в JSON-формате ассемблера (по одной команде в строке)
+
+    Секции данных объектного файла (data) выводятся в блок "data".
+
+    Returns:
+        Количество команд
+    """
+    out.write('{\n')
+    out.write(f'    "name": {json.dumps(name, ensure_ascii=False)},\n')
+    if data:
+        out.write('    "data": [')
+        for i, section in enumerate(data):
+            words = [int.from_bytes(section.data[j:j + 4], 'little')
+                     for j in range(0, len(section.data), 4)]
+            out.write(('\n' if i == 0 else ',\n')
+                      + f'        {{"address": {section.address}, "words": {json.dumps(words)}}}')
+        out.write('\n    ],\n')
+    out.write('    "instructions": [')
+
+    count = 0
+    lines = []
+    for offset, spec, raw, field_b, field_c, field_d in iter_decode(stream, chunk_size):
+        if field_d is None:
+            item = f'{{"opcode": {spec.opcode}, "field_b": {field_b}, "field_c": {field_c}}}'
+        else:
+            item = (f'{{"opcode": {spec.opcode}, "field_b": {field_b}, '
+                    f'"field_c": {field_c}, "field_d": {field_d}}}')
+        lines.append(('\n        ' if count == 0 else ',\n        ') + item)
+        count += 1
+        if len(lines) >= 4096:
+            out.write(''.join(lines))
+            lines.clear()
+    out.write(''.join(lines))
+    out.write('\n    ]\n}\n')
+    return count
+
+
+def disassemble(stream: BinaryIO, out: TextIO, name: str, fmt: str = 'listing',
+                chunk_size: int = CHUNK_SIZE) -> int:
+    """
+    Дизассемблирование образа программы (кода или объектного файла)
+
+    Args:
+        stream: двоичный поток с возможностью позиционирования
+        out: поток для результата
+        name: имя программы для заголовка JSON
+        fmt: формат вывода: 'listing' или 'json'
+
+    Returns:
+        Количество команд
+    """
+    data = None
+    if stream.read(len(OBJECT_MAGIC)) == OBJECT_MAGIC:
+        # Объектный файл: дизассемблируется секция кода
+        stream.seek(0)
+        sections = read_object(stream.read())
+        code = b''.join(bytes(s.data) for s in sections if s.kind == SECTION_CODE)
+        data = [s for s in sections if s.kind == SECTION_DATA]
+        stream = io.BytesIO(code)
+    else:
+        stream.seek(0)
+    if fmt == 'json':
+        return write_json(stream, out, f"Дизассемблировано из {name}", chunk_size, data)
+    return write_listing(stream, out, chunk_size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Дизассемблер УВМ')
+    parser.add_argument('binary_file', help='Путь к двоичному файлу с программой')
+    parser.add_argument('-o', '--output', help='Путь к выходному файлу (по умолчанию: stdout)')
+    parser.add_argument('--format', choices=['listing', 'json'], default='listing',
+                        help='Формат вывода (по умолчанию: listing)')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                        help='Размер блока чтения в байтах')
+
+    args = parser.parse_args()
+
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        with open(args.binary_file, 'rb') as f:
+            count = disassemble(f, out, Path(args.binary_file).name, args.format, args.chunk_size)
+    except FileNotFoundError:
+        print(f"Ошибка: файл {args.binary_file} не найден", file=sys.stderr)
+        sys.exit(1)
+    except ValueError as e:
+        print(f"Ошибка дизассемблирования: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    if args.output:
+        print(f"Дизассемблировано команд: {count}, результат сохранен в {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Бортовой самописец: последние N выполненных команд
+
+Кольцевой буфер в заранее выделенных массивах array хранит PC, код
+операции, поля и исполнительный адрес каждой команды - несколько записей
+в массивы на команду вместо полной трассы. Содержимое выводится
+автоматически при ошибке выполнения (on_fault) или по запросу (dump).
+"""
+
+import sys
+from array import array
+from typing import List, Optional, TextIO, Tuple
+
+from isa import ISA, READ_MEM, WRITE_MEM, UNARY_MINUS
+
+# Количество хранимых команд по умолчанию
+DEFAULT_SIZE = 64
+
+# Значение для отсутствующего поля D или адреса
+NONE = -1
+
+
+class FlightRecorder:
+    """Кольцевой буфер последних команд - обработчик инструментирования"""
+
+    def __init__(self, interpreter, size: int = DEFAULT_SIZE,
+                 stream: Optional[TextIO] = sys.stderr):
+        """
+        Args:
+            interpreter: интерпретатор (для чтения регистров)
+            size: количество хранимых команд
+            stream: поток для автоматического вывода при ошибке (None - не выводить)
+        """
+        if size < 1:
+            raise ValueError(f"Размер буфера должен быть положительным: {size}")
+        self.interpreter = interpreter
+        self.size = size
+        self.stream = stream
+        self.count = 0
+
+        self.pcs = array('I', bytes(4 * size))
+        self.opcodes = array('B', bytes(size))
+        self.fields_b = array('B', bytes(size))
+        self.fields_c = array('I', bytes(4 * size))
+        self.fields_d = array('h', [NONE]) * size
+        self.addresses = array('q', [NONE]) * size
+
+    def on_instruction(self, pc, opcode, field_b, field_c, field_d) -> None:
+        i = self.count % self.size
+        self.count += 1
+        self.pcs[i] = pc
+        self.opcodes[i] = opcode
+        self.fields_b[i] = field_b
+        self.fields_c[i] = field_c
+        if opcode == UNARY_MINUS:
+            self.fields_d[i] = field_d
+            self.addresses[i] = self.interpreter.registers[field_c] + field_b
+        else:
+            self.fields_d[i] = NONE
+            self.addresses[i] = (self.interpreter.registers[field_c]
+                                 if opcode == READ_MEM or opcode == WRITE_MEM else NONE)
+
+    def on_fault(self, pc, error) -> None:
+        if self.stream is not None:
+            self.dump(self.stream)
+
+    def records(self) -> List[Tuple[int, int, int, int, Optional[int], Optional[int]]]:
+        """Записи (pc, opcode, B, C, D, адрес) от старой к новой"""
+        first = max(0, self.count - self.size)
+        result = []
+        for n in range(first, self.count):
+            i = n % self.size
+            field_d = self.fields_d[i]
+            address = self.addresses[i]
+            result.append((self.pcs[i], self.opcodes[i], self.fields_b[i], self.fields_c[i],
+                           None if field_d == NONE else field_d,
+                           None if address == NONE else address))
+        return result
+
+    def dump(self, stream: TextIO = sys.stdout) -> None:
+        """Вывод последних команд (последняя - команда, на которой произошла ошибка)"""
+        records = self.records()
+        stream.write(f"Последние выполненные команды ({len(records)} из {self.count}):\n")
+        first = self.count - len(records)
+        for n, (pc, opcode, field_b, field_c, field_d, address) in enumerate(records, first):
+            spec = ISA.get(opcode)
+            operands = f"B={field_b}, C={field_c}" + ("" if field_d is None else f", D={field_d}")
+            line = f"  #{n:<8} PC=0x{pc:08X} {spec.mnemonic if spec else opcode:<5} {operands}"
+            if address is not None:
+                line += f" адрес=0x{address:08X}"
+            stream.write(line + "\n")
+        stream.flush()
@@ -0,0 +1,174 @@
+"""
+Инкрементальное ассемблирование программ УВМ
+
+Рядом с бинарным файлом хранится индекс (по умолчанию <output>.idx):
+хэш, смещение и размер каждой команды предыдущей сборки. При повторной
+сборке новый список команд сравнивается с индексом, и заново кодируются
+только изменившиеся команды:
+- если число команд и их размеры не изменились, измененные команды
+  записываются в output.bin на свои места;
+- иначе файл переписывается начиная с первой измененной команды, а
+  неизменный хвост программы копируется из старого файла.
+"""
+
+import os
+import json
+import hashlib
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from encoder import encode_instruction, encode_program
+
+INDEX_VERSION = 1
+
+
+@dataclass
+class IncrementalResult:
+    """Итог инкрементальной сборки"""
+    mode: str            # 'full', 'unchanged', 'patch' или 'tail'
+    reencoded: int       # Количество заново закодированных команд
+    bytes_written: int   # Количество записанных в файл байт
+    size: int            # Итоговый размер двоичного файла
+
+
+def instruction_hash(instr: 'Instruction') -> str:
+    """Хэш полей команды (не зависит от запуска интерпретатора Python)"""
+    key = f"{instr.opcode}:{instr.field_b}:{instr.field_c}:{instr.field_d}"
+    return hashlib.blake2b(key.encode('ascii'), digest_size=8).hexdigest()
+
+
+def default_index_path(output_file: str) -> str:
+    """Путь к индексу по умолчанию"""
+    return output_file + '.idx'
+
+
+def load_index(index_file: str, output_file: str) -> Optional[Tuple[List[str], List[int]]]:
+    """
+    Загрузка индекса предыдущей сборки
+
+    Returns:
+        Кортеж (хэши, размеры) или None, если индекс отсутствует или
+        не соответствует текущему двоичному файлу
+    """
+    try:
+        with open(index_file, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        stat = os.stat(output_file)
+    except (OSError, ValueError):
+        return None
+
+    if index.get('version') != INDEX_VERSION:
+        return None
+
+    # Двоичный файл изменен не нами - индексу доверять нельзя
+    if stat.st_size != index.get('size') or stat.st_mtime_ns != index.get('mtime_ns'):
+        return None
+
+    return index['hashes'], index['sizes']
+
+
+def save_index(index_file: str, output_file: str, hashes: List[str], sizes: List[int]) -> None:
+    """Сохранение индекса для текущего состояния двоичного файла"""
+    stat = os.stat(output_file)
+    index = {
+        'version': INDEX_VERSION,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'hashes': hashes,
+        'sizes': sizes,
+    }
+    with open(index_file, 'w', encoding='utf-8') as f:
+        json.dump(index, f)
+
+
+def _offsets(sizes: List[int]) -> List[int]:
+    """Смещения команд по их размерам"""
+    offsets = []
+    offset = 0
+    for size in sizes:
+        offsets.append(offset)
+        offset += size
+    return offsets
+
+
+def assemble_incremental(instructions: list, output_file: str,
+                         index_file: Optional[str] = None) -> IncrementalResult:
+    """
+    Инкрементальная сборка программы в output_file
+
+    Args:
+        instructions: список команд (результат parse_program)
+        output_file: путь к двоичному файлу-результату
+        index_file: путь к индексу (по умолчанию <output_file>.idx)
+    """
+    if index_file is None:
+        index_file = default_index_path(output_file)
+
+    new_hashes = [instruction_hash(instr) for instr in instructions]
+    new_sizes = [instr.size for instr in instructions]
+
+    previous = load_index(index_file, output_file)
+
+    if previous is None:
+        # Индекса нет - полная сборка
+        binary_data = encode_program(instructions)
+        with open(output_file, 'wb') as f:
+            f.write(binary_data)
+        save_index(index_file, output_file, new_hashes, new_sizes)
+        return IncrementalResult('full', len(instructions), len(binary_data), len(binary_data))
+
+    old_hashes, old_sizes = previous
+    old_offsets = _offsets(old_sizes)
+    old_total = sum(old_sizes)
+    new_total = sum(new_sizes)
+
+    if old_hashes == new_hashes:
+        return IncrementalResult('unchanged', 0, 0, old_total)
+
+    if old_sizes == new_sizes:
+        # Раскладка не изменилась - переписываем команды на месте
+        changed = [i for i in range(len(new_hashes)) if new_hashes[i] != old_hashes[i]]
+        written = 0
+        with open(output_file, 'r+b') as f:
+            for i in changed:
+                try:
+                    encoded = encode_instruction(instructions[i])
+                except ValueError as e:
+                    raise ValueError(f"Ошибка кодирования команды {i}: {e}")
+                f.seek(old_offsets[i])
+                f.write(encoded)
+                written += len(encoded)
+        save_index(index_file, output_file, new_hashes, new_sizes)
+        return IncrementalResult('patch', len(changed), written, new_total)
+
+    # Общий префикс остается на месте, общий суффикс копируется из старого файла
+    limit = min(len(old_hashes), len(new_hashes))
+    prefix = 0
+    while prefix < limit and old_hashes[prefix] == new_hashes[prefix]:
+        prefix += 1
+
+    suffix = 0
+    while (suffix < limit - prefix
+           and old_hashes[-1 - suffix] == new_hashes[-1 - suffix]):
+        suffix += 1
+
+    tail_offset = old_offsets[prefix] if prefix < len(old_offsets) else old_total
+    suffix_offset = old_total - sum(old_sizes[len(old_sizes) - suffix:])
+
+    middle = instructions[prefix:len(instructions) - suffix]
+    tail = bytearray()
+    for i, instr in enumerate(middle, prefix):
+        try:
+            tail.extend(encode_instruction(instr))
+        except ValueError as e:
+            raise ValueError(f"Ошибка кодирования команды {i}: {e}")
+
+    with open(output_file, 'r+b') as f:
+        f.seek(suffix_offset)
+        tail.extend(f.read())
+        f.seek(tail_offset)
+        f.write(tail)
+        f.truncate()
+
+    save_index(index_file, output_file, new_hashes, new_sizes)
+    return IncrementalResult('tail', len(middle), len(tail), new_total)
@@ -4,25 +4,59 @@
 Этап 4: Реализация арифметико-логического устройства (АЛУ)
 """
 
+import os
 import sys
+import mmap
 import argparse
 import csv
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, TYPE_CHECKING
+
+from isa import DISPATCH, OPCODE_MASK, LOAD_CONST, READ_MEM, WRITE_MEM, UNARY_MINUS
+from objfile import is_object, is_linked, read_object, SECTION_CODE, SECTION_DATA
+
+# Модули памяти, архивов, состояния и покрытия импортируются там, где они
+# используются: встраивающий код и uvm.py exec их не загружают
+if TYPE_CHECKING:
+    from coverage_map import Coverage
+    from paged_memory import PageStore
+
+# Ограничение количества выполненных команд по умолчанию
+MAX_INSTRUCTIONS = 10000
+
+# Причина остановки run(steps) после заданного количества команд
+STEPS_DONE = "выполнено заданное количество шагов"
 
 
 class UVMInterpreter:
     """Интерпретатор Учебной Виртуальной Машины"""
 
-    def __init__(self, memory_size: int = 1024 * 1024):  # 1MB памяти по умолчанию
+    def __init__(self, memory_size: int = 1024 * 1024,  # 1MB памяти по умолчанию
+                 verbose: bool = True, memory_file: Optional[str] = None,
+                 page_store: Optional['PageStore'] = None):
         """
         Инициализация интерпретатора
 
         Args:
             memory_size: размер памяти в байтах
+            verbose: выводить сообщения о ходе выполнения
+            memory_file: файл, отображаемый в память машины (см.
+                memimage.map_memory_file); None - память в процессе
+            page_store: хранилище общих страниц: память - PagedMemory,
+                одинаковые страницы разных машин хранятся один раз
+                (см. paged_memory.py)
         """
+        self.verbose = verbose
+
         # Объединенная память команд и данных
-        self.memory = bytearray(memory_size)
+        if memory_file is not None:
+            from memimage import map_memory_file
+            self.memory = map_memory_file(memory_file, memory_size)
+        elif page_store is not None:
+            from paged_memory import PagedMemory
+            self.memory = PagedMemory(memory_size, page_store)
+        else:
+            self.memory = bytearray(memory_size)
 
         # Регистры (128 регистров, каждый 32-битный)
         self.registers = [0] * 128
@@ -36,89 +70,182 @@ class UVMInterpreter:
         # Статистика выполнения
         self.instructions_executed = 0
 
+        # Ограничение количества выполненных команд
+        self.max_instructions = MAX_INSTRUCTIONS
+
+        # Размер загруженной программы в байтах
+        self.program_size = 0
+
+        # Обработчики инструментирования (см. add_hook)
+        self.hooks = []
+
+        # Причина остановки, запрошенной обработчиком (см. request_stop)
+        self.stop_reason = None
+
+        # Описание ошибки, завершившей выполнение (None - ошибок не было)
+        self.error = None
+
+        # Наблюдатель за ходом выполнения (см. progress.py)
+        self.monitor = None
+
     def load_program(self, binary_file: str) -> None:
         """
         Загрузка программы в память
 
         Args:
-            binary_file: путь к бинарному файлу с программой
+            binary_file: путь к бинарному файлу с программой или
+                АРХИВ.uvmb#ИМЯ (см. bundle.py)
         """
         try:
-            with open(binary_file, 'rb') as f:
-                program_data = f.read()
-
-            # Загружаем программу в начало памяти
-            if len(program_data) > len(self.memory):
-                raise ValueError(f"Программа слишком большая: {len(program_data)} байт > {len(self.memory)} байт")
+            reference = None
+            if '#' in binary_file:
+                from bundle import split_bundle_path
+                reference = split_bundle_path(binary_file)
+            if reference is not None:
+                # Образ из архива загружается прямо из отображения файла
+                from bundle import Bundle
+                with Bundle(reference[0]) as bundle, bundle.get(reference[1]) as image:
+                    self.load_image(image)
+                return
 
-            self.memory[:len(program_data)] = program_data
-            print(f"Загружено {len(program_data)} байт программы по адресу 0x{0:08X}")
+            # Файл программы отображается в память и копируется в память
+            # машины без промежуточного чтения в буфер
+            with open(binary_file, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    self.load_image(b'')
+                    return
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapping, \
+                        memoryview(mapping) as image:
+                    self.load_image(image)
 
         except FileNotFoundError:
             print(f"Ошибка: файл {binary_file} не найден")
             sys.exit(1)
+        except KeyError as e:
+            print(f"Ошибка: {e.args[0]}")
+            sys.exit(1)
         except Exception as e:
             print(f"Ошибка загрузки программы: {e}")
             sys.exit(1)
 
-    def decode_instruction(self) -> Optional[Tuple[int, int, int, Optional[int]]]:
+    def load_image(self, image) -> None:
         """
-        Декодирование команды по текущему PC
+        Загрузка образа программы: объектного файла с секциями (objfile.py)
+        или кода без заголовка, который размещается с адреса 0
 
-        Returns:
-            Кортеж (opcode, field_b, field_c, field_d) или None если команда неполная
+        Args:
+            image: содержимое файла программы
         """
-        # Проверяем, есть ли достаточно данных для команды
-        if self.pc + 3 > len(self.memory):
-            return None
-
-        # Читаем первый байт для определения типа команды
-        first_byte = self.memory[self.pc]
-        opcode = first_byte & 0x7F
+        if not is_object(image):
+            self._place(0, image, "Программа слишком большая")
+            self.program_size = len(image)
+            if self.verbose:
+                print(f"Загружено {len(image)} байт программы по адресу 0x{0:08X}")
+            return
+
+        sections = read_object(image)
+        if not is_linked(sections):
+            raise ValueError("Объектный файл не скомпонован (используйте linker.py)")
+
+        # Каждая секция копируется в память одним присваиванием среза
+        for section in sections:
+            if section.kind == SECTION_CODE:
+                self._place(section.address, section.data, "Программа слишком большая")
+                self.program_size = section.address + len(section.data)
+            elif section.kind == SECTION_DATA:
+                self._place(section.address, section.data, "Блок данных вне памяти")
+            else:
+                continue
+            if self.verbose:
+                print(f"Загружена секция {section.name}: {len(section.data)} байт "
+                      f"по адресу 0x{section.address:08X}")
+
+    def _place(self, address: int, data, message: str) -> None:
+        end = address + len(data)
+        if end > len(self.memory):
+            raise ValueError(f"{message}: 0x{address:08X}-0x{end:08X} > {len(self.memory)} байт")
+        self.memory[address:end] = data
+
+    def close(self) -> None:
+        """Сброс на диск и закрытие отображения, если память - файл"""
+        if isinstance(self.memory, mmap.mmap) and not self.memory.closed:
+            self.memory.flush()
+            self.memory.close()
+
+    def load_memory_image(self, address: int, path: str) -> int:
+        """
+        Загрузка начального содержимого памяти из файла (см. memimage.py)
 
-        # Определяем размер команды и декодируем поля
-        if opcode == 72:  # Загрузка константы (6 байт)
-            if self.pc + 6 > len(self.memory):
-                return None
+        Args:
+            address: начальный адрес
+            path: двоичный файл, массив .npy или CSV-дамп памяти
 
-            field_b = self.memory[self.pc + 1] & 0x7F
+        Returns:
+            Количество загруженных байт
+        """
+        from memimage import load_memory_image
+        size = load_memory_image(self.memory, address, path)
+        if self.verbose:
+            print(f"Загружено {size} байт из {path} по адресу 0x{address:08X}")
+        return size
 
-            # Собираем 28-битное поле C из байтов 2-5
-            field_c = (
-                    (self.memory[self.pc + 2] << 20) |
-                    (self.memory[self.pc + 3] << 12) |
-                    (self.memory[self.pc + 4] << 4) |
-                    ((self.memory[self.pc + 5] >> 4) & 0x0F)
-            )
+    def save_checkpoint(self, path: str) -> None:
+        """
+        Сохранение состояния машины в файл (см. checkpoint.py)
 
-            return (opcode, field_b, field_c, None)
+        Args:
+            path: путь к файлу состояния
+        """
+        from checkpoint import save_checkpoint
+        pages = save_checkpoint(self, path)
+        if self.verbose:
+            print(f"Состояние сохранено в {path} (ненулевых страниц: {pages})")
 
-        elif opcode in [113, 8]:  # Чтение/запись памяти (3 байта)
-            if self.pc + 3 > len(self.memory):
-                return None
+    def load_checkpoint(self, path: str) -> None:
+        """
+        Восстановление состояния машины из файла
 
-            field_b = self.memory[self.pc + 1] & 0x7F
-            field_c = self.memory[self.pc + 2] & 0x7F
+        Размер памяти интерпретатора должен совпадать с сохраненным.
 
-            return (opcode, field_b, field_c, None)
+        Args:
+            path: путь к файлу состояния
+        """
+        from checkpoint import load_checkpoint
+        load_checkpoint(self, path)
+        if self.verbose:
+            print(f"Состояние восстановлено из {path}: PC=0x{self.pc:08X}, "
+                  f"выполнено команд: {self.instructions_executed}")
 
-        elif opcode == 91:  # Унарный минус (4 байта)
-            if self.pc + 4 > len(self.memory):
-                return None
+    def decode_instruction(self) -> Optional[Tuple[int, int, int, Optional[int]]]:
+        """
+        Декодирование команды по текущему PC
 
-            field_b = self.memory[self.pc + 1] & 0x3F  # 6 бит
-            field_c = self.memory[self.pc + 2] & 0x7F  # 7 бит
-            field_d = self.memory[self.pc + 3] & 0x7F  # 7 бит
+        Returns:
+            Кортеж (opcode, field_b, field_c, field_d) или None если команда неполная
+        """
+        # Проверяем, есть ли достаточно данных для команды
+        if self.pc + 3 > len(self.memory):
+            return None
 
-            return (opcode, field_b, field_c, field_d)
+        # Тип команды определяется по первому байту (таблица из isa.py)
+        entry = DISPATCH[self.memory[self.pc]]
 
-        else:
+        if entry is None:
             # Неизвестная команда - пропускаем байт и возвращаем None
             # чтобы цикл выполнения завершился
-            print(f"Предупреждение: неизвестный код операции 0x{opcode:02X} по адресу 0x{self.pc:08X}")
+            opcode = self.memory[self.pc] & OPCODE_MASK
+            if self.verbose:
+                print(f"Предупреждение: неизвестный код операции 0x{opcode:02X} по адресу 0x{self.pc:08X}")
             self.pc += 1  # Пропускаем неизвестный байт
             return None  # Возвращаем None вместо рекурсивного вызова
 
+        spec, decode = entry
+        if self.pc + spec.size > len(self.memory):
+            return None
+
+        field_b, field_c, field_d = decode(self.memory, self.pc)
+        return (spec.opcode, field_b, field_c, field_d)
+
     def execute_instruction(self, opcode: int, field_b: int, field_c: int, field_d: Optional[int]) -> None:
         """
         Выполнение декодированной команды
@@ -130,12 +257,12 @@ class UVMInterpreter:
             field_d: поле D (если есть)
         """
         try:
-            if opcode == 72:  # Загрузка константы
+            if opcode == LOAD_CONST:  # Загрузка константы
                 # Загружаем константу в регистр
                 self.registers[field_b] = field_c
                 self.pc += 6
 
-            elif opcode == 113:  # Чтение из памяти
+            elif opcode == READ_MEM:  # Чтение из памяти
                 # Читаем адрес из регистра field_c
                 mem_addr = self.registers[field_c]
 
@@ -152,7 +279,7 @@ class UVMInterpreter:
                 self.registers[field_b] = value
                 self.pc += 3
 
-            elif opcode == 8:  # Запись в память
+            elif opcode == WRITE_MEM:  # Запись в память
                 # Читаем значение из регистра field_b
                 value = self.registers[field_b]
 
@@ -169,7 +296,7 @@ class UVMInterpreter:
 
                 self.pc += 3
 
-            elif opcode == 91:  # Унарный минус
+            elif opcode == UNARY_MINUS:  # Унарный минус
                 # Выполняем унарный минус
                 # Поле D: адрес регистра с исходным значением
                 # Поле C: адрес регистра с базовым адресом памяти
@@ -197,7 +324,8 @@ class UVMInterpreter:
                 for i in range(4):
                     self.memory[mem_addr + i] = (result_value >> (i * 8)) & 0xFF
 
-                print(f"  Унарный минус: -{source_value} = {result_value} -> mem[0x{mem_addr:X}]")
+                if self.verbose:
+                    print(f"  Унарный минус: -{source_value} = {result_value} -> mem[0x{mem_addr:X}]")
                 self.pc += 4
 
             else:
@@ -210,25 +338,128 @@ class UVMInterpreter:
             self.instructions_executed += 1
 
         except MemoryError as e:
-            print(f"Ошибка памяти при выполнении команды: {e}")
-            self.halted = True
+            if self.verbose:
+                print(f"Ошибка памяти при выполнении команды: {e}")
+            self._fail(str(e))
         except Exception as e:
-            print(f"Ошибка выполнения команды: {e}")
-            self.halted = True
+            if self.verbose:
+                print(f"Ошибка выполнения команды: {e}")
+            self._fail(str(e))
+
+    def _fail(self, error: str) -> None:
+        """Завершение выполнения с ошибкой; обработчики получают on_fault"""
+        self.error = error
+        self.halted = True
+        for hook in self.hooks:
+            on_fault = getattr(hook, 'on_fault', None)
+            if on_fault is not None:
+                on_fault(self.pc, error)
+
+    def add_hook(self, hook) -> None:
+        """
+        Регистрация обработчика инструментирования
+
+        Обработчик - объект с любыми из методов:
+            on_instruction(pc, opcode, field_b, field_c, field_d)
+            on_read(pc, address, value)
+            on_write(pc, address, value)
+            on_fault(pc, error)
+        Методы on_instruction/on_read/on_write вызываются до выполнения
+        команды, on_fault - при завершении выполнения с ошибкой. Пока
+        обработчиков нет, run() использует цикл без инструментирования.
+        """
+        self.hooks.append(hook)
 
-    def run(self) -> None:
-        """Основной цикл интерпретатора"""
-        print("Запуск интерпретатора...")
-        print(f"Начальный PC: 0x{self.pc:08X}")
+    def remove_hook(self, hook) -> None:
+        """Удаление обработчика инструментирования"""
+        self.hooks.remove(hook)
 
+    def request_stop(self, reason: str) -> None:
+        """
+        Остановка выполнения после текущей команды (для обработчиков)
+
+        В отличие от halted, остановка не завершает программу: повторный
+        вызов run() продолжит выполнение со следующей команды.
+        """
+        self.stop_reason = reason
+
+    def run(self, steps: Optional[int] = None) -> None:
+        """
+        Основной цикл интерпретатора
+
+        Args:
+            steps: выполнить не более указанного количества команд и
+                остановиться (None - до конца программы)
+        """
+        if self.verbose:
+            print("Запуск интерпретатора...")
+            print(f"Начальный PC: 0x{self.pc:08X}")
+
+        self.stop_reason = None
+
+        # Одна проверка счетчика в цикле покрывает и ограничение количества
+        # команд, и количество шагов
+        bound = self.max_instructions + 1
+        if steps is not None:
+            bound = min(bound, self.instructions_executed + steps)
+
+        # Без обработчиков работает цикл без дополнительных проверок
+        if not self.hooks:
+            loop = self._run_fast
+        # Одно покрытие собирается в собственном цикле без вызовов методов
+        elif len(self.hooks) == 1 and _is_coverage(self.hooks[0]):
+            coverage = self.hooks[0]
+            loop = lambda limit: self._run_coverage(limit, coverage)
+        else:
+            loop = self._run_instrumented
+
+        # С наблюдателем выполнение идет участками по monitor.chunk команд,
+        # и наблюдатель вызывается между участками, а не на каждой команде
+        monitor = self.monitor
+        while True:
+            limit = bound if monitor is None else min(bound, self.instructions_executed + monitor.chunk)
+            loop(limit)
+            if self.halted or self.stop_reason is not None:
+                break
+            if self.instructions_executed >= bound:
+                self._bound_reached()
+                break
+            if monitor is None:
+                break
+            monitor.tick(self)
+
+        if self.verbose:
+            if self.stop_reason is not None:
+                print(f"\nВыполнение остановлено: {self.stop_reason}")
+            else:
+                print(f"\nВыполнение завершено.")
+            print(f"Всего выполнено команд: {self.instructions_executed}")
+            print(f"Конечный PC: 0x{self.pc:08X}")
+
+    def _end_of_program(self) -> None:
+        """Недостаточно данных для команды - программа завершена"""
+        if self.verbose:
+            print("Достигнут конец программы или недостаточно данных для команды")
+        self.halted = True
+
+    def _bound_reached(self) -> None:
+        """Счетчик команд достиг границы, вычисленной в run()"""
+        if self.instructions_executed > self.max_instructions:
+            if self.verbose:
+                print(f"Превышено максимальное количество команд ({self.max_instructions:,})")
+            self._fail(f"превышено максимальное количество команд ({self.max_instructions})")
+        elif not self.halted and self.stop_reason is None:
+            self.stop_reason = STEPS_DONE
+
+    def _run_fast(self, bound: int) -> None:
+        """Цикл выполнения без инструментирования"""
         while not self.halted:
             # Декодируем следующую команду
             decoded = self.decode_instruction()
 
             if decoded is None:
                 # Недостаточно данных или конец программы
-                print("Достигнут конец программы или недостаточно данных для команды")
-                self.halted = True
+                self._end_of_program()
                 break
 
             opcode, field_b, field_c, field_d = decoded
@@ -236,16 +467,98 @@ class UVMInterpreter:
             # Выполняем команду
             self.execute_instruction(opcode, field_b, field_c, field_d)
 
-            # Ограничим количество команд для безопасности
-            if self.instructions_executed > 10000:
-                print("Превышено максимальное количество команд (10,000)")
-                self.halted = True
+            # Ограничение количества команд и шагов
+            if self.instructions_executed >= bound:
+                break
+
+    def _run_coverage(self, bound: int, coverage: 'Coverage') -> None:
+        """Цикл выполнения со сбором покрытия: одна запись байта на команду"""
+        code = coverage.code
+        data = coverage.data
+        code_size = len(code)
+        registers = self.registers
+        memory_size = len(self.memory)
+
+        while not self.halted:
+            decoded = self.decode_instruction()
+
+            if decoded is None:
+                self._end_of_program()
+                break
+
+            opcode, field_b, field_c, field_d = decoded
+
+            pc = self.pc
+            if pc < code_size:
+                code[pc] = 1
+
+            if opcode == READ_MEM or opcode == WRITE_MEM:
+                address = registers[field_c]
+                if address + 4 <= memory_size:
+                    data[address >> 2] = 1
+            elif opcode == UNARY_MINUS:
+                address = registers[field_c] + field_b
+                if address + 4 <= memory_size:
+                    data[address >> 2] = 1
+
+            self.execute_instruction(opcode, field_b, field_c, field_d)
 
-        print(f"\nВыполнение завершено.")
-        print(f"Всего выполнено команд: {self.instructions_executed}")
-        print(f"Конечный PC: 0x{self.pc:08X}")
+            if self.instructions_executed >= bound:
+                break
+
+    def _run_instrumented(self, bound: int) -> None:
+        """Цикл выполнения с вызовом обработчиков инструментирования"""
+        on_instruction = [h.on_instruction for h in self.hooks if hasattr(h, 'on_instruction')]
+        on_read = [h.on_read for h in self.hooks if hasattr(h, 'on_read')]
+        on_write = [h.on_write for h in self.hooks if hasattr(h, 'on_write')]
+        registers = self.registers
+        memory = self.memory
+        memory_size = len(memory)
+
+        while not self.halted:
+            decoded = self.decode_instruction()
+
+            if decoded is None:
+                self._end_of_program()
+                break
+
+            opcode, field_b, field_c, field_d = decoded
+
+            pc = self.pc
+            for hook in on_instruction:
+                hook(pc, opcode, field_b, field_c, field_d)
+
+            # Обработчики обращений к памяти вызываются до выполнения команды:
+            # при записи в памяти еще находится старое значение
+            if opcode == READ_MEM:
+                if on_read:
+                    address = registers[field_c]
+                    value = (int.from_bytes(memory[address:address + 4], 'little')
+                             if address + 4 <= memory_size else 0)
+                    for hook in on_read:
+                        hook(pc, address, value)
+            elif opcode == WRITE_MEM:
+                if on_write:
+                    address = registers[field_c]
+                    value = registers[field_b]
+                    for hook in on_write:
+                        hook(pc, address, value)
+            elif opcode == UNARY_MINUS:
+                if on_write:
+                    address = registers[field_c] + field_b
+                    value = -registers[field_d] & 0xFFFFFFFF
+                    for hook in on_write:
+                        hook(pc, address, value)
 
-    def dump_memory(self, start_addr: int, end_addr: int, output_file: str) -> None:
+            self.execute_instruction(opcode, field_b, field_c, field_d)
+
+            if self.stop_reason is not None:
+                break
+
+            if self.instructions_executed >= bound:
+                break
+
+    def dump_memory(self, start_addr: int, end_addr: int, output_file: str) -> bool:
         """
         Дамп памяти в CSV файл
 
@@ -253,12 +566,15 @@ class UVMInterpreter:
             start_addr: начальный адрес
             end_addr: конечный адрес
             output_file: путь к выходному CSV файлу
+
+        Returns:
+            True, если дамп записан
         """
         try:
             # Проверяем границы
             if start_addr < 0 or end_addr >= len(self.memory) or start_addr > end_addr:
                 print(f"Ошибка: недопустимый диапазон адресов: 0x{start_addr:08X}-0x{end_addr:08X}")
-                return
+                return False
 
             with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
                 writer = csv.writer(csvfile)
@@ -306,9 +622,11 @@ class UVMInterpreter:
             print(f"Дамп памяти сохранен в {output_file}")
             print(f"Диапазон: 0x{start_addr:08X} - 0x{end_addr:08X}")
             print(f"Количество строк: {(end_addr - start_addr + 4) // 4}")
+            return True
 
         except Exception as e:
             print(f"Ошибка при сохранении дампа памяти: {e}")
+            return False
 
     def dump_registers(self) -> None:
         """Вывод состояния регистров"""
@@ -323,34 +641,204 @@ class UVMInterpreter:
                 print(f"R{i:<8} 0x{value:08X}      {value:<20} {value:032b}")
 
 
+def _is_coverage(hook) -> bool:
+    """Обработчик - покрытие (coverage_map.Coverage); модуль не импортируется"""
+    module = sys.modules.get('coverage_map')
+    return module is not None and type(hook) is module.Coverage
+
+
 def main():
+    # Инструменты нужны только командной строке: при использовании
+    # UVMInterpreter из других модулей они не импортируются
+    from coverage_map import Coverage
+    from memimage import parse_init_spec
+    from profiler import Profiler, CACHE_LINE_SIZE, PAGE_SIZE
+    from memtrace import MemoryTracer
+    from timeline import Timeline, BlockSpans, phase
+    from watchpoints import Watchpoints, parse_watch_spec
+    from metrics import Metrics, metrics_phase, metrics_run
+    from progress import Progress
+    from flight_recorder import FlightRecorder
+
     parser = argparse.ArgumentParser(description='Интерпретатор УВМ')
-    parser.add_argument('program_file', help='Путь к бинарному файлу с программой')
-    parser.add_argument('dump_file', help='Путь к файлу для дампа памяти (CSV)')
+    parser.add_argument('program_file', help='Путь к бинарному файлу с программой или АРХИВ.uvmb#ИМЯ')
+    parser.add_argument('dump_file', nargs='?',
+                        help='Путь к файлу для дампа памяти (CSV); с --memory-file можно не указывать')
     parser.add_argument('--start', type=lambda x: int(x, 0), default=0x0000,
                         help='Начальный адрес дампа (hex или dec)')
     parser.add_argument('--end', type=lambda x: int(x, 0), default=0x0100,
                         help='Конечный адрес дампа (hex или dec)')
     parser.add_argument('--memory-size', type=int, default=1024 * 1024,
                         help='Размер памяти в байтах (по умолчанию: 1MB)')
+    parser.add_argument('--memory-file', metavar='PATH',
+                        help='Память машины - отображение файла PATH: содержимое файла - '
+                             'начальное состояние памяти, итоговое остается в файле')
+    parser.add_argument('--max-instructions', type=int, default=MAX_INSTRUCTIONS,
+                        help=f'Ограничение количества выполненных команд (по умолчанию: {MAX_INSTRUCTIONS})')
+    parser.add_argument('--progress', type=float, metavar='N',
+                        help='Выводить ход выполнения каждые N миллионов команд '
+                             '(по сигналу SIGUSR1 - в любой момент)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Собрать профиль выполнения и вывести отчет')
+    parser.add_argument('--profile-out', help='Сохранить профиль в JSON-файл')
+    parser.add_argument('--profile-sample', type=int, default=1,
+                        help='Учитывать в профиле каждую N-ю команду (по умолчанию: все)')
+    parser.add_argument('--profile-bucket', type=int, default=CACHE_LINE_SIZE,
+                        help=f'Размер блока адресов памяти в профиле (по умолчанию: {CACHE_LINE_SIZE}, '
+                             f'страница: {PAGE_SIZE})')
+    parser.add_argument('--profile-top', type=int, default=10,
+                        help='Количество строк в каждой категории отчета')
+    parser.add_argument('--trace-mem', help='Записать трассу обращений к памяти в двоичный файл')
+    parser.add_argument('--trace-out', help='Сохранить временную шкалу этапов (Chrome trace-event JSON)')
+    parser.add_argument('--trace-blocks', type=int, default=0,
+                        help='Добавить на шкалу интервал на каждые N команд гостевой программы')
+    parser.add_argument('--watch', action='append', default=[], metavar='KIND:START[-END][:ACTION]',
+                        help='Точка наблюдения за памятью: вид read/write/change/access, '
+                             'действие stop (по умолчанию) или log; например change:0x1000-0x100F:log')
+    parser.add_argument('--init-mem', action='append', default=[], metavar='ADDR:FILE',
+                        help='Загрузить в память перед запуском двоичный файл, массив .npy '
+                             '(uint32) или CSV-дамп; можно указать несколько раз')
+    parser.add_argument('--steps', type=int,
+                        help='Выполнить не более N команд (например, перед сохранением состояния)')
+    parser.add_argument('--checkpoint-out', metavar='FILE',
+                        help='Сохранить состояние машины после выполнения')
+    parser.add_argument('--resume', metavar='FILE',
+                        help='Продолжить выполнение с сохраненного состояния '
+                             '(программа и размер памяти те же)')
+    parser.add_argument('--flight-recorder', type=int, metavar='N',
+                        help='Хранить последние N команд и вывести их при ошибке выполнения')
+    parser.add_argument('--coverage', metavar='FILE',
+                        help='Собрать покрытие кода и данных; карты объединяются с уже '
+                             'записанными в FILE (отчет: coverage_map.py)')
+    parser.add_argument('--metrics-out', metavar='FILE',
+                        help='Записать метрики запуска в формате OpenMetrics; счетчики '
+                             'суммируются с уже записанными в FILE')
 
     args = parser.parse_args()
+    if args.dump_file is None and args.memory_file is None:
+        parser.error("не указан файл для дампа памяти")
+
+    timeline = Timeline(process_name='interpreter') if args.trace_out else None
+    metrics = Metrics() if args.metrics_out else None
 
     # Создаем и настраиваем интерпретатор
-    interpreter = UVMInterpreter(memory_size=args.memory_size)
+    try:
+        interpreter = UVMInterpreter(memory_size=args.memory_size, memory_file=args.memory_file)
+    except (OSError, ValueError) as e:
+        print(f"Ошибка отображения файла памяти: {e}")
+        sys.exit(1)
+    interpreter.max_instructions = args.max_instructions
+
+    profiler = None
+    if args.profile or args.profile_out:
+        profiler = Profiler(sample_every=args.profile_sample, bucket_size=args.profile_bucket)
+        interpreter.add_hook(profiler)
+
+    tracer = None
+    if args.trace_mem:
+        tracer = MemoryTracer(args.trace_mem)
+        interpreter.add_hook(tracer)
+
+    blocks = None
+    if timeline is not None and args.trace_blocks > 0:
+        blocks = BlockSpans(timeline, args.trace_blocks)
+        interpreter.add_hook(blocks)
+
+    if args.flight_recorder:
+        interpreter.add_hook(FlightRecorder(interpreter, args.flight_recorder))
+
+    if args.watch:
+        watchpoints = Watchpoints(interpreter)
+        for spec in args.watch:
+            try:
+                kind, start, end, action = parse_watch_spec(spec)
+                watchpoints.add(start, end, kind, action)
+            except ValueError as e:
+                print(f"Ошибка: {e}")
+                sys.exit(1)
+        interpreter.add_hook(watchpoints)
 
     # Загружаем программу
-    interpreter.load_program(args.program_file)
+    with phase(timeline, 'load_program'), metrics_phase(metrics, 'load_program'):
+        interpreter.load_program(args.program_file)
+        if args.resume:
+            try:
+                interpreter.load_checkpoint(args.resume)
+            except (OSError, ValueError) as e:
+                print(f"Ошибка восстановления состояния: {e}")
+                sys.exit(1)
+        for spec in args.init_mem:
+            try:
+                address, path = parse_init_spec(spec)
+                interpreter.load_memory_image(address, path)
+            except (OSError, ValueError) as e:
+                print(f"Ошибка загрузки образа памяти: {e}")
+                sys.exit(1)
+
+    # Ход выполнения: периодически и по SIGUSR1
+    progress = Progress(every=max(1, int(args.progress * 1_000_000)) if args.progress else None)
+    progress.attach(interpreter)
+    progress.install_signal()
+
+    coverage = None
+    if args.coverage:
+        coverage = Coverage.for_interpreter(interpreter)
+        interpreter.add_hook(coverage)
 
     # Запускаем выполнение
-    interpreter.run()
+    try:
+        with phase(timeline, 'run'), metrics_phase(metrics, 'run'):
+            with metrics_run(metrics, interpreter, Path(args.program_file).name):
+                interpreter.run(args.steps)
+            if blocks is not None:
+                blocks.flush()
+    finally:
+        progress.uninstall_signal()
+        if tracer is not None:
+            tracer.close()
+            print(f"Трасса памяти сохранена в {args.trace_mem} "
+                  f"(записей: {tracer.records})")
+
+    if args.checkpoint_out:
+        interpreter.save_checkpoint(args.checkpoint_out)
 
     # Сохраняем дамп памяти
-    interpreter.dump_memory(args.start, args.end, args.dump_file)
+    if args.dump_file:
+        with phase(timeline, 'dump_memory'), metrics_phase(metrics, 'dump_memory'):
+            dumped = interpreter.dump_memory(args.start, args.end, args.dump_file)
+        if metrics is not None and dumped:
+            metrics.inc('uvm_dump_bytes', args.end - args.start + 1)
 
     # Выводим состояние регистров
     interpreter.dump_registers()
 
+    if profiler is not None:
+        if args.profile:
+            print()
+            print(profiler.report(args.profile_top))
+        if args.profile_out:
+            profiler.save_json(args.profile_out)
+            print(f"Профиль сохранен в {args.profile_out}")
+
+    if coverage is not None:
+        try:
+            coverage.save_merged(args.coverage)
+            print(f"Покрытие сохранено в {args.coverage}")
+        except ValueError as e:
+            print(f"Ошибка сохранения покрытия: {e}")
+
+    if metrics is not None:
+        metrics.save(args.metrics_out)
+        print(f"Метрики сохранены в {args.metrics_out}")
+
+    if timeline is not None:
+        timeline.save(args.trace_out)
+        print(f"Временная шкала сохранена в {args.trace_out}")
+
+    if args.memory_file:
+        interpreter.close()
+        print(f"Память сохранена в {args.memory_file}")
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
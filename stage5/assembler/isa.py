@@ -0,0 +1,133 @@
+"""
+Описание системы команд УВМ
+
+Единственное место, где заданы коды операций, размеры команд и
+расположение полей. Команда хранится как целое little-endian число:
+поле A (код операции) занимает биты 0-6, остальные поля идут следом.
+Из таблицы при импорте генерируются функции кодирования и
+декодирования без циклов, которыми пользуются парсер, кодировщик,
+интерпретатор и ассемблер.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class Field:
+    """Поле команды"""
+    name: str    # Имя атрибута Instruction: field_b, field_c, field_d
+    lo: int      # Номер младшего бита поля в слове команды
+    width: int   # Ширина поля в битах
+
+    @property
+    def mask(self) -> int:
+        return (1 << self.width) - 1
+
+    @property
+    def letter(self) -> str:
+        """Буква поля из спецификации (B, C, D)"""
+        return self.name[-1].upper()
+
+
+@dataclass(frozen=True)
+class OpcodeSpec:
+    """Описание одной команды"""
+    opcode: int
+    mnemonic: str
+    title: str     # Название для вывода пользователю
+    size: int      # Размер команды в байтах
+    fields: Tuple[Field, ...]
+
+    @property
+    def field_names(self) -> Tuple[str, ...]:
+        return tuple(field.name for field in self.fields)
+
+
+# Поле A (код операции) у всех команд занимает биты 0-6
+OPCODE_BITS = 7
+OPCODE_MASK = (1 << OPCODE_BITS) - 1
+
+LOAD_CONST = 72
+READ_MEM = 113
+WRITE_MEM = 8
+UNARY_MINUS = 91
+
+ISA: Dict[int, OpcodeSpec] = {
+    LOAD_CONST: OpcodeSpec(LOAD_CONST, 'load', 'Загрузка константы', 6, (
+        Field('field_b', 7, 7),    # Адрес регистра
+        Field('field_c', 14, 28),  # Константа
+    )),
+    READ_MEM: OpcodeSpec(READ_MEM, 'read', 'Чтение из памяти', 3, (
+        Field('field_b', 7, 7),    # Регистр-приемник
+        Field('field_c', 14, 7),   # Регистр с адресом источника
+    )),
+    WRITE_MEM: OpcodeSpec(WRITE_MEM, 'write', 'Запись в память', 3, (
+        Field('field_b', 7, 7),    # Регистр-источник
+        Field('field_c', 14, 7),   # Регистр с адресом назначения
+    )),
+    UNARY_MINUS: OpcodeSpec(UNARY_MINUS, 'neg', 'Унарный минус', 4, (
+        Field('field_b', 7, 6),    # Смещение
+        Field('field_c', 13, 7),   # Регистр с базовым адресом
+        Field('field_d', 20, 7),   # Регистр со значением
+    )),
+}
+
+VALID_OPCODES: List[int] = list(ISA)
+MNEMONICS: Dict[str, int] = {spec.mnemonic: opcode for opcode, spec in ISA.items()}
+MAX_SIZE = max(spec.size for spec in ISA.values())
+
+
+def _encoder_source(spec: OpcodeSpec) -> str:
+    """Исходный текст функции кодирования для команды"""
+    params = ', '.join(f.name for f in spec.fields)
+    lines = [f"def encode_{spec.opcode}({params}, *_):"]
+    for f in spec.fields:
+        lines.append(f"    if not 0 <= {f.name} <= {f.mask:#x}:")
+        lines.append(f"        raise ValueError(f'Поле {f.letter} вне диапазона: {{{f.name}}}')")
+    word = ' | '.join([str(spec.opcode)] + [f"({f.name} << {f.lo})" for f in spec.fields])
+    lines.append(f"    return ({word}).to_bytes({spec.size}, 'little')")
+    return '\n'.join(lines)
+
+
+def _decoder_source(spec: OpcodeSpec) -> str:
+    """Исходный текст функции декодирования для команды"""
+    values = [f"(word >> {f.lo}) & {f.mask:#x}" for f in spec.fields]
+    values += ['None'] * (3 - len(values))
+    lines = [
+        f"def decode_{spec.opcode}(memory, pc):",
+        f"    word = int.from_bytes(memory[pc:pc + {spec.size}], 'little')",
+        f"    return {', '.join(values)}",
+    ]
+    return '\n'.join(lines)
+
+
+def _generate() -> Tuple[Dict[int, Callable], Dict[int, Callable]]:
+    """Генерация функций кодирования и декодирования по таблице ISA"""
+    namespace: dict = {}
+    for spec in ISA.values():
+        exec(compile(_encoder_source(spec), f'<isa encode_{spec.opcode}>', 'exec'), namespace)
+        exec(compile(_decoder_source(spec), f'<isa decode_{spec.opcode}>', 'exec'), namespace)
+    encoders = {op: namespace[f'encode_{op}'] for op in ISA}
+    decoders = {op: namespace[f'decode_{op}'] for op in ISA}
+    return encoders, decoders
+
+
+# encode(field_b, field_c[, field_d]) -> bytes
+ENCODERS, DECODERS = _generate()
+
+# Таблица диспетчеризации по первому байту команды: старший бит первого
+# байта принадлежит полю B, поэтому каждой команде соответствуют два индекса.
+# Элемент - кортеж (spec, decode) или None для неизвестного кода операции.
+DISPATCH: List[Optional[Tuple[OpcodeSpec, Callable]]] = [
+    (ISA[byte & OPCODE_MASK], DECODERS[byte & OPCODE_MASK]) if byte & OPCODE_MASK in ISA else None
+    for byte in range(256)
+]
+
+
+def instruction_size(opcode: int) -> int:
+    """Размер команды в байтах"""
+    spec = ISA.get(opcode)
+    if spec is None:
+        raise ValueError(f"Неизвестный код операции: {opcode}")
+    return spec.size
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Клиент сервера заданий УВМ (см. job_server.py)
+
+    with JobClient('unix:/tmp/uvm.sock') as client:
+        result = client.submit({"source": program, "dump": [[0x1000, 0x1010]]})
+
+map() отправляет задания конвейером: до window заданий ожидают ответа
+одновременно, ответы возвращаются по мере готовности.
+"""
+
+import sys
+import json
+import socket
+import argparse
+from itertools import count
+from typing import Dict, Iterable, Iterator, Tuple, Union
+
+# Адрес сервера по умолчанию
+DEFAULT_ADDRESS = '127.0.0.1:7420'
+
+
+def parse_address(address: str) -> Tuple[int, Union[str, Tuple[str, int]]]:
+    """Адрес сервера: unix:ПУТЬ или ХОСТ:ПОРТ -> (семейство сокета, адрес)"""
+    if address.startswith('unix:'):
+        return socket.AF_UNIX, address[len('unix:'):]
+    host, sep, port = address.rpartition(':')
+    if not sep or not port.isdigit():
+        raise ValueError(f"Некорректный адрес сервера (ожидается unix:ПУТЬ или ХОСТ:ПОРТ): {address}")
+    return socket.AF_INET, (host or '127.0.0.1', int(port))
+
+
+class JobClient:
+    """Синхронный клиент: одно соединение, задания с автоматическими id"""
+
+    def __init__(self, address: str = DEFAULT_ADDRESS, timeout: float = None):
+        family, target = parse_address(address)
+        self._socket = socket.socket(family, socket.SOCK_STREAM)
+        self._socket.settimeout(timeout)
+        try:
+            self._socket.connect(target)
+        except OSError:
+            self._socket.close()
+            raise
+        self._file = self._socket.makefile('rwb')
+        self._ids = count(1)
+
+    def close(self) -> None:
+        self._file.close()
+        self._socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _send(self, job: dict) -> object:
+        if job.get('id') is None:
+            job = dict(job, id=next(self._ids))
+        self._file.write(json.dumps(job, ensure_ascii=False).encode('utf-8') + b'\n')
+        return job['id']
+
+    def _receive(self) -> dict:
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("Сервер закрыл соединение")
+        return json.loads(line)
+
+    def submit(self, job: dict) -> dict:
+        """Выполнение одного задания с ожиданием ответа"""
+        job_id = self._send(job)
+        self._file.flush()
+        while True:
+            response = self._receive()
+            if response.get('id') == job_id or response.get('id') is None:
+                return response
+
+    def map(self, jobs: Iterable[dict], window: int = 16) -> Iterator[dict]:
+        """Конвейерное выполнение заданий; ответы - в порядке готовности"""
+        pending = 0
+        for job in jobs:
+            self._send(job)
+            pending += 1
+            if pending >= window:
+                self._file.flush()
+                yield self._receive()
+                pending -= 1
+        self._file.flush()
+        for _ in range(pending):
+            yield self._receive()
+
+
+def run_program(client: JobClient, program_json: dict, start: int, end: int,
+                **options) -> Dict:
+    """
+    Замена запуска interpreter.py в подпроцессе: программа выполняется на
+    сервере, возвращаются итог и слова памяти start..end
+
+    Raises:
+        ValueError: сервер отклонил задание
+    """
+    response = client.submit(dict(options, source=program_json, dump=[[start, end]]))
+    if not response['ok']:
+        raise ValueError(response['error'])
+    return response
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Клиент сервера заданий УВМ')
+    parser.add_argument('programs', nargs='+', help='JSON-программы')
+    parser.add_argument('--server', default=DEFAULT_ADDRESS,
+                        help=f'Адрес сервера: unix:ПУТЬ или ХОСТ:ПОРТ (по умолчанию: {DEFAULT_ADDRESS})')
+    parser.add_argument('--start', type=lambda x: int(x, 0), default=0x0000,
+                        help='Начальный адрес дампа (по умолчанию: 0x0000)')
+    parser.add_argument('--end', type=lambda x: int(x, 0), default=0x0100,
+                        help='Конечный адрес дампа (по умолчанию: 0x0100)')
+    parser.add_argument('--memory-size', type=int, default=1024 * 1024,
+                        help='Размер памяти в байтах (по умолчанию: 1MB)')
+    args = parser.parse_args()
+
+    jobs = []
+    for number, path in enumerate(args.programs):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                jobs.append({'id': number, 'source': json.load(f), 'memory_size': args.memory_size,
+                             'dump': [[args.start, args.end]]})
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Ошибка чтения {path}: {e}")
+            sys.exit(1)
+
+    failed = 0
+    try:
+        with JobClient(args.server) as client:
+            for response in client.map(jobs):
+                print(f"{args.programs[response['id']] if response['id'] is not None else '?'}: "
+                      + json.dumps(response, ensure_ascii=False))
+                failed += not response['ok'] or bool(response.get('fault'))
+    except (OSError, ValueError) as e:
+        print(f"Ошибка соединения с сервером: {e}")
+        sys.exit(1)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Сервер заданий УВМ
+
+Долгоживущий процесс принимает задания по Unix-сокету или TCP (localhost)
+в формате JSON, по одному заданию в строке, выполняет их в ограниченном
+пуле процессов (или потоков) и возвращает результат строкой JSON по мере
+готовности; ответы одного соединения могут приходить не в порядке
+заданий и сопоставляются по полю id.
+
+Задание:
+    {"id": 1,
+     "source": {...},                JSON-программа (или "binary": base64 образа)
+     "memory_size": 65536,           размер памяти (не больше ограничения сервера)
+     "max_instructions": 100000,     ограничение количества команд
+     "init_memory": [{"address": 4096, "words": [1, 2]},
+                     {"address": 8192, "data": "base64"}],
+     "dump": [[4096, 4104]],          диапазоны слов [начало, конец] включительно,
+                                     границы кратны 4
+     "registers": true}              вернуть регистры
+
+Ответ:
+    {"id": 1, "ok": true, "executed": 15, "pc": 66, "halted": true,
+     "fault": null, "dump": [{"address": 4096, "words": [...]}],
+     "registers": [...]}
+    {"id": 1, "ok": false, "error": "..."}    - задание отклонено
+
+Противодавление: одновременно выполняется не больше --queue заданий всех
+соединений; место в очереди занимает прочитанное задание и освобождается,
+как только задание выполнено. Кроме того, у каждого соединения не больше
+--per-connection заданий без отправленного ответа: пока они есть, новые
+задания из соединения не читаются. Клиент, который не читает ответы,
+останавливает чтение только своих заданий, а простаивающее соединение не
+занимает места в очереди.
+"""
+
+import os
+import sys
+import json
+import time
+import base64
+import signal
+import asyncio
+import argparse
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+# Ограничения сервера по умолчанию
+DEFAULT_MAX_MEMORY = 16 * 1024 * 1024
+DEFAULT_MAX_INSTRUCTIONS = 10_000_000
+DEFAULT_MAX_LINE = 16 * 1024 * 1024
+DEFAULT_DUMP_WORDS = 1 << 20
+
+
+def _is_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _dump_range(item, memory_size: int):
+    """Диапазон дампа [начало, конец] -> (начало, количество слов)"""
+    if not isinstance(item, (list, tuple)) or len(item) != 2 or not all(_is_int(x) for x in item):
+        raise ValueError(f"Диапазон дампа должен быть парой целых [начало, конец]: {item!r}")
+    start, end = item
+    if start % 4 or end % 4:
+        raise ValueError(f"Границы диапазона дампа должны быть кратны 4: [{start}, {end}]")
+    if not 0 <= start <= end or end + 4 > memory_size:
+        raise ValueError(f"Диапазон дампа [{start}, {end}] вне памяти ({memory_size} байт)")
+    return start, (end - start) // 4 + 1
+
+
+def execute_job(job: dict, max_memory: int = DEFAULT_MAX_MEMORY,
+                max_instructions: int = DEFAULT_MAX_INSTRUCTIONS,
+                max_dump_words: int = DEFAULT_DUMP_WORDS) -> dict:
+    """
+    Выполнение одного задания (в процессе или потоке пула)
+
+    Returns:
+        Ответ для клиента; ошибка в задании возвращается как ok=false
+    """
+    from uvm_api import UVM
+
+    response = {'id': job.get('id')}
+    try:
+        memory_size = job.get('memory_size', 1024 * 1024)
+        limit = job.get('max_instructions', max_instructions)
+        if not _is_int(memory_size) or not 0 < memory_size <= max_memory:
+            raise ValueError(f"Размер памяти должен быть от 1 до {max_memory} байт")
+        if not _is_int(limit) or not 0 < limit <= max_instructions:
+            raise ValueError(f"Ограничение команд должно быть от 1 до {max_instructions}")
+
+        # Диапазоны дампа проверяются до выполнения: ошибка в них не должна
+        # стоить целого запуска
+        ranges = [_dump_range(item, memory_size) for item in job.get('dump', [])]
+        if sum(count for _, count in ranges) > max_dump_words:
+            raise ValueError(f"Запрошено больше {max_dump_words} слов дампа")
+
+        if 'source' in job:
+            image = UVM.assemble(job['source'])
+        elif 'binary' in job:
+            image = base64.b64decode(job['binary'], validate=True)
+        else:
+            raise ValueError("Задание должно содержать 'source' или 'binary'")
+
+        vm = UVM(memory_size=memory_size, max_instructions=limit)
+        vm.load_bytes(image)
+        for block in job.get('init_memory', []):
+            address = block['address']
+            if 'words' in block:
+                vm.write_words(address, block['words'])
+            else:
+                data = base64.b64decode(block['data'], validate=True)
+                if address < 0 or address + len(data) > memory_size:
+                    raise ValueError(f"Блок памяти 0x{address:08X} вне памяти")
+                vm.memory[address:address + len(data)] = data
+
+        result = vm.run()
+        dump = [{'address': start, 'words': vm.read_words(start, count).tolist()}
+                for start, count in ranges]
+        response.update(ok=True, executed=result.executed, pc=vm.pc, halted=result.halted,
+                        fault=result.error, dump=dump)
+        if job.get('registers'):
+            response['registers'] = vm.registers_view().tolist()
+    except (KeyError, TypeError, ValueError) as e:
+        response.update(ok=False, error=f"Отсутствует поле {e.args[0]!r}" if isinstance(e, KeyError) else str(e))
+    return response
+
+
+class JobServer:
+    """Сервер заданий: соединения asyncio, выполнение в пуле"""
+
+    def __init__(self, executor: Executor, queue_size: int,
+                 max_memory: int = DEFAULT_MAX_MEMORY,
+                 max_instructions: int = DEFAULT_MAX_INSTRUCTIONS,
+                 stream=sys.stderr, per_connection: Optional[int] = None):
+        """
+        Args:
+            executor: пул для выполнения заданий
+            queue_size: заданий в работе и в очереди одновременно (по всем
+                соединениям)
+            per_connection: заданий одного соединения без отправленного
+                ответа (по умолчанию queue_size)
+        """
+        if queue_size < 1:
+            raise ValueError(f"Размер очереди должен быть положительным: {queue_size}")
+        if per_connection is not None and per_connection < 1:
+            raise ValueError(f"Количество заданий соединения должно быть положительным: {per_connection}")
+        self.executor = executor
+        self.queue_size = queue_size
+        self.per_connection = per_connection or queue_size
+        self.max_memory = max_memory
+        self.max_instructions = max_instructions
+        self.stream = stream
+        self.completed = 0
+        self.rejected = 0
+        self._slots = None
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Обслуживание одного соединения"""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.queue_size)
+        write_lock = asyncio.Lock()
+        pending = asyncio.Semaphore(self.per_connection)
+        tasks = set()
+        try:
+            while True:
+                # Новое задание читается, только пока у соединения мало
+                # заданий без ответа; место в общей очереди берет _process
+                await pending.acquire()
+                try:
+                    line = await reader.readline()
+                except (ValueError, ConnectionError) as e:
+                    pending.release()
+                    await self._send(writer, write_lock, {'id': None, 'ok': False,
+                                                          'error': f"Ошибка чтения задания: {e}"})
+                    break
+                if not line.strip():
+                    pending.release()
+                    if not line:
+                        break
+                    continue
+                task = asyncio.create_task(self._process(line, writer, write_lock, pending))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _process(self, line: bytes, writer, write_lock, pending: asyncio.Semaphore) -> None:
+        try:
+            try:
+                job = json.loads(line)
+                if not isinstance(job, dict):
+                    raise ValueError("задание должно быть объектом JSON")
+            except ValueError as e:
+                response = {'id': None, 'ok': False, 'error': f"Ошибка разбора задания: {e}"}
+            else:
+                # Место в общей очереди - только на время выполнения, не на
+                # время отправки ответа
+                async with self._slots:
+                    loop = asyncio.get_running_loop()
+                    try:
+                        response = await loop.run_in_executor(self.executor, execute_job, job,
+                                                              self.max_memory, self.max_instructions)
+                    except Exception as e:
+                        # Ответ получает и задание, на котором упал исполнитель
+                        response = {'id': job.get('id'), 'ok': False, 'error': f"Внутренняя ошибка: {e!r}"}
+            if response['ok']:
+                self.completed += 1
+            else:
+                self.rejected += 1
+            await self._send(writer, write_lock, response)
+        finally:
+            pending.release()
+
+    @staticmethod
+    async def _send(writer, write_lock, response: dict) -> None:
+        async with write_lock:
+            try:
+                writer.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+                await writer.drain()
+            except ConnectionError:
+                pass
+
+    async def serve(self, unix: Optional[str] = None, host: str = '127.0.0.1', port: int = 0,
+                    ready=None) -> None:
+        """
+        Прием соединений до отмены или сигнала SIGINT/SIGTERM
+
+        Args:
+            unix: путь к Unix-сокету (иначе TCP host:port)
+            ready: вызывается с адресом сервера после начала приема
+        """
+        if unix is not None:
+            if os.path.exists(unix):
+                os.unlink(unix)
+            server = await asyncio.start_unix_server(self.handle, unix, limit=DEFAULT_MAX_LINE)
+            address = f"unix:{unix}"
+        else:
+            server = await asyncio.start_server(self.handle, host, port, limit=DEFAULT_MAX_LINE)
+            bound = server.sockets[0].getsockname()
+            address = f"{bound[0]}:{bound[1]}"
+
+        loop = asyncio.get_running_loop()
+        stop = asyncio.Event()
+        for signum in (getattr(signal, 'SIGINT', None), getattr(signal, 'SIGTERM', None)):
+            try:
+                loop.add_signal_handler(signum, stop.set)
+            except (NotImplementedError, RuntimeError, TypeError, ValueError):
+                pass
+
+        start = time.perf_counter()
+        print(f"Сервер заданий УВМ: {address}", file=self.stream, flush=True)
+        if ready is not None:
+            ready(address)
+        try:
+            async with server:
+                await stop.wait()
+        finally:
+            if unix is not None and os.path.exists(unix):
+                os.unlink(unix)
+            print(f"Сервер остановлен: выполнено заданий {self.completed}, отклонено {self.rejected} "
+                  f"за {time.perf_counter() - start:.1f} с", file=self.stream, flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Сервер заданий УВМ')
+    parser.add_argument('--unix', metavar='PATH', help='Путь к Unix-сокету')
+    parser.add_argument('--host', default='127.0.0.1', help='Адрес TCP (по умолчанию: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=7420, help='Порт TCP (по умолчанию: 7420)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Количество процессов пула (по умолчанию: число процессоров)')
+    parser.add_argument('--threads', action='store_true',
+                        help='Пул потоков вместо процессов (без параллельного выполнения)')
+    parser.add_argument('--queue', type=int,
+                        help='Заданий в работе и в очереди (по умолчанию: 4 на исполнителя)')
+    parser.add_argument('--per-connection', type=int,
+                        help='Заданий одного соединения без ответа (по умолчанию: размер очереди)')
+    parser.add_argument('--max-memory', type=int, default=DEFAULT_MAX_MEMORY,
+                        help=f'Наибольший размер памяти задания (по умолчанию: {DEFAULT_MAX_MEMORY})')
+    parser.add_argument('--max-instructions', type=int, default=DEFAULT_MAX_INSTRUCTIONS,
+                        help=f'Наибольшее ограничение команд задания (по умолчанию: {DEFAULT_MAX_INSTRUCTIONS})')
+    args = parser.parse_args()
+
+    executor_class = ThreadPoolExecutor if args.threads else ProcessPoolExecutor
+    with executor_class(max_workers=args.workers) as executor:
+        server = JobServer(executor, args.queue or 4 * args.workers,
+                           args.max_memory, args.max_instructions,
+                           per_connection=args.per_connection)
+        asyncio.run(server.serve(args.unix, args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
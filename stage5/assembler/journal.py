@@ -0,0 +1,246 @@
+"""
+Журнал отмены для отладки с обратным ходом
+
+Перед каждой командой 72/113 журнал запоминает старое значение
+регистра-приемника, перед каждой записью 8/91 - старое значение слова
+памяти. Записи хранятся в массивах array; через каждые N команд
+сохраняется снимок состояния: регистры, PC и прежнее содержимое страниц
+памяти, в которые была запись после снимка (копия страницы делается при
+первой записи в нее). Память снимков пропорциональна количеству
+измененных страниц, а не размеру памяти. Это позволяет:
+- отменять команды по одной (reverse_step);
+- возвращаться к последней команде, записавшей слово (reverse_continue);
+- переходить к команде с заданным номером (goto): ближайший снимок
+  находится двоичным поиском, остаток проходится вперед или отменяется.
+
+Для каждой страницы журнал хранит номера снимков с ее копией (по
+возрастанию), поэтому возврат к снимку стоит O(P log C) плюс копирование
+восстанавливаемых страниц (P - различные страницы, в которые была запись,
+C - количество снимков) и не зависит от длины журнала.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from isa import LOAD_CONST, READ_MEM
+
+# Вид записи журнала
+REGISTER = 0
+MEMORY = 1
+
+# Период снимков по умолчанию (команд)
+DEFAULT_CHECKPOINT_EVERY = 1000
+
+# Размер страницы памяти в снимках
+PAGE_SIZE = 4096
+PAGE_SHIFT = 12
+
+
+@dataclass
+class Checkpoint:
+    """
+    Снимок состояния перед командой с номером time
+
+    pages - содержимое на момент снимка страниц, в которые была запись
+    после него (номер страницы -> байты); остальные страницы с момента
+    снимка не изменялись или сохранены в более поздних снимках.
+    """
+    time: int
+    pc: int
+    instructions_executed: int
+    registers: list
+    pages: Dict[int, bytes]
+
+
+class UndoJournal:
+    """Журнал отмены - обработчик инструментирования интерпретатора"""
+
+    def __init__(self, interpreter, checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY):
+        if checkpoint_every < 1:
+            raise ValueError(f"Период снимков должен быть положительным: {checkpoint_every}")
+        self.interpreter = interpreter
+        self.checkpoint_every = checkpoint_every
+
+        # Записи об измененных ячейках
+        self.kinds = array('B')
+        self.targets = array('I')
+        self.old_values = array('I')
+
+        # По одной записи на команду: начало ее записей, PC и счетчик до выполнения
+        self.marks = array('Q')
+        self.pcs = array('I')
+        self.executed = array('Q')
+
+        self.checkpoints: List[Checkpoint] = []
+        # Номер страницы -> номера снимков с ее копией, по возрастанию
+        self.page_copies: Dict[int, List[int]] = {}
+
+    @property
+    def time(self) -> int:
+        """Количество команд, записанных в журнал"""
+        return len(self.marks)
+
+    # Обработчики инструментирования
+
+    def on_instruction(self, pc, opcode, field_b, field_c, field_d) -> None:
+        interpreter = self.interpreter
+        time = len(self.marks)
+        if time % self.checkpoint_every == 0 and (not self.checkpoints
+                                                   or self.checkpoints[-1].time < time):
+            self._checkpoint(time)
+
+        self.marks.append(len(self.kinds))
+        self.pcs.append(pc)
+        self.executed.append(interpreter.instructions_executed)
+
+        if opcode == LOAD_CONST or opcode == READ_MEM:
+            self.kinds.append(REGISTER)
+            self.targets.append(field_b)
+            self.old_values.append(interpreter.registers[field_b])
+
+    def on_write(self, pc, address, value) -> None:
+        memory = self.interpreter.memory
+        if 0 <= address and address + 4 <= len(memory):
+            # Первая запись в страницу после снимка - копия страницы
+            pages = self.checkpoints[-1].pages
+            for page in {address >> PAGE_SHIFT, (address + 3) >> PAGE_SHIFT}:
+                if page not in pages:
+                    start = page << PAGE_SHIFT
+                    pages[page] = bytes(memory[start:start + PAGE_SIZE])
+                    self.page_copies.setdefault(page, []).append(len(self.checkpoints) - 1)
+            self.kinds.append(MEMORY)
+            self.targets.append(address)
+            self.old_values.append(int.from_bytes(memory[address:address + 4], 'little'))
+
+    # Снимки
+
+    def _checkpoint(self, time: int) -> None:
+        interpreter = self.interpreter
+        self.checkpoints.append(Checkpoint(time, interpreter.pc, interpreter.instructions_executed,
+                                           list(interpreter.registers), {}))
+
+    def _restore(self, index: int) -> None:
+        """Возврат к снимку: страницы берутся из него и более поздних снимков"""
+        interpreter = self.interpreter
+        checkpoint = self.checkpoints[index]
+        memory = interpreter.memory
+        # Содержимое страницы на момент снимка - в первом снимке не раньше
+        # него, после которого была запись в страницу
+        for page, copies in self.page_copies.items():
+            i = bisect_left(copies, index)
+            if i < len(copies):
+                data = self.checkpoints[copies[i]].pages[page]
+                start = page << PAGE_SHIFT
+                memory[start:start + len(data)] = data
+
+        interpreter.registers[:] = checkpoint.registers
+        interpreter.pc = checkpoint.pc
+        interpreter.instructions_executed = checkpoint.instructions_executed
+        interpreter.halted = False
+        self._truncate(checkpoint.time)
+        self._drop_pages(index)
+
+    def _drop_pages(self, index: int) -> None:
+        """Удаление копий страниц последнего снимка с номером index"""
+        pages = self.checkpoints[index].pages
+        for page in pages:
+            copies = self.page_copies[page]
+            copies.pop()
+            if not copies:
+                del self.page_copies[page]
+        pages.clear()
+
+    def _truncate(self, time: int) -> None:
+        """Удаление записей команд начиная с номера time"""
+        if time < len(self.marks):
+            start = self.marks[time]
+            del self.kinds[start:]
+            del self.targets[start:]
+            del self.old_values[start:]
+            del self.marks[time:]
+            del self.pcs[time:]
+            del self.executed[time:]
+        while self.checkpoints and self.checkpoints[-1].time > time:
+            self._drop_pages(len(self.checkpoints) - 1)
+            self.checkpoints.pop()
+
+    # Обратный ход
+
+    def _undo_last(self) -> int:
+        """Отмена последней команды; возвращает ее номер"""
+        interpreter = self.interpreter
+        time = len(self.marks) - 1
+        start = self.marks[time]
+        registers = interpreter.registers
+        memory = interpreter.memory
+        for i in range(len(self.kinds) - 1, start - 1, -1):
+            old = self.old_values[i]
+            if self.kinds[i] == REGISTER:
+                registers[self.targets[i]] = old
+            else:
+                address = self.targets[i]
+                memory[address:address + 4] = old.to_bytes(4, 'little')
+        interpreter.pc = self.pcs[time]
+        interpreter.instructions_executed = self.executed[time]
+        interpreter.halted = False
+        self._truncate(time)
+        return time
+
+    def reverse_step(self, count: int = 1) -> int:
+        """
+        Отмена count последних команд
+
+        Returns:
+            Количество фактически отмененных команд
+        """
+        undone = 0
+        while undone < count and self.marks:
+            self._undo_last()
+            undone += 1
+        return undone
+
+    def reverse_continue(self, address: int) -> Optional[int]:
+        """
+        Возврат к последней команде, записавшей слово по адресу
+
+        После возврата PC указывает на эту команду (она еще не выполнена).
+
+        Returns:
+            PC найденной команды или None, если запись не найдена
+            (тогда состояние возвращается к началу журнала)
+        """
+        while self.marks:
+            time = len(self.marks) - 1
+            start = self.marks[time]
+            wrote = any(self.kinds[i] == MEMORY and abs(self.targets[i] - address) < 4
+                        for i in range(start, len(self.kinds)))
+            self._undo_last()
+            if wrote:
+                return self.interpreter.pc
+        return None
+
+    def goto(self, target: int) -> None:
+        """
+        Переход к состоянию перед командой с номером target (номер в журнале)
+        """
+        if target < 0:
+            raise ValueError(f"Некорректный номер команды: {target}")
+
+        time = self.time
+        if target > time:
+            # Вперед - обычное выполнение (с записью в журнал)
+            self.interpreter.run(target - time)
+            return
+
+        # Ближайший снимок не позже target - двоичный поиск
+        i = bisect_right(self.checkpoints, target, key=lambda cp: cp.time) - 1
+        checkpoint = self.checkpoints[i] if i >= 0 else None
+
+        if checkpoint is None or time - target <= target - checkpoint.time:
+            self.reverse_step(time - target)
+        else:
+            self._restore(i)
+            if target > checkpoint.time:
+                self.interpreter.run(target - checkpoint.time)
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Компоновщик объектов УВМ
+
+Модуль (JSON-программа) ассемблируется отдельно в несобранный объект
+(objfile.py) с таблицей символов и перемещениями:
+- поле C команды 72 может быть ссылкой на символ: "table", "table+8";
+- символы - именованные блоки данных ("data": [{"name": ..., "words": ...}])
+  и константы ("symbols": {"SIZE": 5});
+- блоки данных без адреса размещает компоновщик.
+
+Компоновщик объединяет код модулей в порядке перечисления (код УВМ не
+зависит от своего адреса), размещает данные, вычисляет символы и
+исправляет поле C в местах перемещений. Результат - объектный файл,
+который загружает UVMInterpreter.load_image.
+
+Собранные модули кэшируются по хешу исходного текста, поэтому при
+повторной сборке ассемблируются только измененные модули.
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+import argparse
+from typing import Dict, List, Optional, Tuple
+
+from parser import parse_program, parse_data
+from encoder import encode_program
+from isa import ISA, ENCODERS, DECODERS, LOAD_CONST
+from objfile import (Section, SECTION_CODE, SECTION_DATA, SECTION_SYMBOLS, SECTION_RELOCS,
+                     SYMBOL_ABSOLUTE, SYMBOL_SECTION, UNPLACED, build_object, read_object,
+                     is_object, pack_symbols, unpack_symbols, pack_relocs, unpack_relocs)
+
+# Адрес, с которого размещаются блоки данных без адреса (по умолчанию)
+DEFAULT_DATA_BASE = 0x4000
+
+# Версия формата кэша: при изменении ассемблера старые объекты не используются
+CACHE_VERSION = 1
+
+_REFERENCE = re.compile(r'^\s*([A-Za-z_]\w*)\s*(?:([+-])\s*(0[xX][0-9a-fA-F]+|\d+))?\s*$')
+
+
+def parse_reference(text: str) -> Tuple[str, int]:
+    """Разбор ссылки на символ: ИМЯ[+СМЕЩЕНИЕ|-СМЕЩЕНИЕ]"""
+    match = _REFERENCE.match(text)
+    if match is None:
+        raise ValueError(f"Некорректная ссылка на символ: {text}")
+    name, sign, number = match.groups()
+    addend = int(number, 0) if number else 0
+    return name, -addend if sign == '-' else addend
+
+
+def compile_module(program_json: dict) -> bytes:
+    """Ассемблирование модуля в несобранный объект"""
+    instructions_list = program_json.get('instructions')
+    if not isinstance(instructions_list, list):
+        raise ValueError("Отсутствует список команд 'instructions' в JSON")
+
+    # Ссылки на символы заменяются нулем и записываются как перемещения
+    references = {}
+    cleaned = []
+    for i, instr in enumerate(instructions_list):
+        if isinstance(instr, dict) and isinstance(instr.get('field_c'), str):
+            if instr.get('opcode') != LOAD_CONST:
+                raise ValueError(f"Ошибка в команде {i}: ссылка на символ допускается "
+                                 f"только в поле C команды \"{ISA[LOAD_CONST].title}\"")
+            try:
+                references[i] = parse_reference(instr['field_c'])
+            except ValueError as e:
+                raise ValueError(f"Ошибка в команде {i}: {e}")
+            instr = dict(instr, field_c=0)
+        cleaned.append(instr)
+
+    instructions = parse_program(dict(program_json, instructions=cleaned))
+    relocs = []
+    offset = 0
+    for i, instr in enumerate(instructions):
+        if i in references:
+            name, addend = references[i]
+            relocs.append((offset, name, addend))
+        offset += instr.size
+
+    sections = [Section(SECTION_CODE, 0, encode_program(instructions))]
+    symbols = []
+    for block in parse_data(program_json):
+        address = UNPLACED if block.address is None else block.address
+        sections.append(Section(SECTION_DATA, address, block.to_bytes()))
+        if block.name is not None:
+            symbols.append((block.name, SYMBOL_SECTION, len(sections) - 1))
+
+    constants = program_json.get('symbols', {})
+    if not isinstance(constants, dict):
+        raise ValueError("Поле 'symbols' должно быть объектом")
+    for name, value in constants.items():
+        if not name.isidentifier() or not isinstance(value, int) or not 0 <= value <= 0xFFFFFFFF:
+            raise ValueError(f"Некорректный символ {name}: {value}")
+        symbols.append((name, SYMBOL_ABSOLUTE, value))
+
+    if symbols:
+        sections.append(Section(SECTION_SYMBOLS, 0, pack_symbols(symbols)))
+    if relocs:
+        sections.append(Section(SECTION_RELOCS, 0, pack_relocs(relocs)))
+    return build_object(sections)
+
+
+def link(objects: List[bytes], data_base: int = DEFAULT_DATA_BASE,
+         symbol_map: Optional[Dict[str, int]] = None) -> bytes:
+    """
+    Компоновка объектов в загружаемый объектный файл
+
+    Args:
+        objects: объекты (compile_module или уже собранные)
+        data_base: адрес для размещения блоков данных без адреса
+        symbol_map: словарь, в который записываются значения символов
+
+    Raises:
+        ValueError: повторное определение или неизвестный символ,
+            перекрытие данных с кодом или с другими данными
+    """
+    modules = [read_object(image) for image in objects]
+
+    # Код модулей подряд
+    code = bytearray()
+    code_bases = []
+    for sections in modules:
+        code_bases.append(len(code))
+        for section in sections:
+            if section.kind == SECTION_CODE:
+                code += section.data
+
+    # Данные: сначала с адресами, затем без адреса - подряд с data_base
+    # (после кода), в обход блоков с адресами
+    placed = {}
+    fixed = []
+    for m, sections in enumerate(modules):
+        for s, section in enumerate(sections):
+            if section.kind == SECTION_DATA and section.address != UNPLACED:
+                placed[m, s] = section.address
+                fixed.append((section.address, section.address + len(section.data)))
+    next_address = (max(data_base, len(code)) + 3) & ~3
+    for m, sections in enumerate(modules):
+        for s, section in enumerate(sections):
+            if section.kind == SECTION_DATA and section.address == UNPLACED:
+                size = len(section.data)
+                for start, end in sorted(fixed):
+                    if start < next_address + size and next_address < end:
+                        next_address = (end + 3) & ~3
+                placed[m, s] = next_address
+                next_address += (size + 3) & ~3
+
+    ranges = sorted((address, address + len(modules[m][s].data)) for (m, s), address in placed.items())
+    for (start, end), (next_start, _) in zip(ranges, ranges[1:]):
+        if end > next_start:
+            raise ValueError(f"Блоки данных перекрываются: 0x{start:08X} и 0x{next_start:08X}")
+    if ranges and ranges[0][0] < len(code):
+        raise ValueError(f"Блок данных 0x{ranges[0][0]:08X} перекрывает код (0x{len(code):08X} байт)")
+
+    # Глобальная таблица символов
+    symbols = {}
+    for m, sections in enumerate(modules):
+        for section in sections:
+            if section.kind != SECTION_SYMBOLS:
+                continue
+            for name, kind, value in unpack_symbols(section.data):
+                if name in symbols:
+                    raise ValueError(f"Повторное определение символа {name}")
+                symbols[name] = placed[m, value] if kind == SYMBOL_SECTION else value
+
+    # Перемещения: поле C команды 72 = значение символа + слагаемое
+    missing = set()
+    for m, sections in enumerate(modules):
+        for section in sections:
+            if section.kind != SECTION_RELOCS:
+                continue
+            for offset, name, addend in unpack_relocs(section.data):
+                if name not in symbols:
+                    missing.add(name)
+                    continue
+                pc = code_bases[m] + offset
+                field_b, _, _ = DECODERS[LOAD_CONST](code, pc)
+                try:
+                    encoded = ENCODERS[LOAD_CONST](field_b, symbols[name] + addend)
+                except ValueError as e:
+                    raise ValueError(f"Символ {name}{addend:+d}: {e}")
+                code[pc:pc + len(encoded)] = encoded
+    if missing:
+        raise ValueError(f"Неизвестные символы: {', '.join(sorted(missing))}")
+
+    if symbol_map is not None:
+        symbol_map.update(symbols)
+
+    sections = [Section(SECTION_CODE, 0, bytes(code))]
+    for (m, s), address in sorted(placed.items(), key=lambda item: item[1]):
+        sections.append(Section(SECTION_DATA, address, bytes(modules[m][s].data)))
+    if symbols:
+        sections.append(Section(SECTION_SYMBOLS, 0, pack_symbols(
+            [(name, SYMBOL_ABSOLUTE, value & 0xFFFFFFFF) for name, value in symbols.items()])))
+    return build_object(sections)
+
+
+class ObjectCache:
+    """Кэш собранных модулей в каталоге: имя файла - хеш исходного текста"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, source: bytes) -> str:
+        digest = hashlib.blake2b(source, digest_size=16,
+                                 person=f"uvm-obj-{CACHE_VERSION}".encode('ascii')).hexdigest()
+        return os.path.join(self.directory, digest + '.uvmo')
+
+    def assemble(self, source: bytes) -> bytes:
+        """Объект для исходного текста модуля (из кэша или заново)"""
+        path = self._path(source)
+        try:
+            with open(path, 'rb') as f:
+                image = f.read()
+            read_object(image)  # Поврежденный объект собирается заново
+            self.hits += 1
+            return image
+        except (OSError, ValueError):
+            pass
+
+        image = compile_module(json.loads(source))
+        self.misses += 1
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(image)
+        os.replace(temp_path, path)
+        return image
+
+
+def load_module(path: str, cache: Optional[ObjectCache] = None) -> bytes:
+    """Объект из файла: JSON ассемблируется (через кэш), объект читается как есть"""
+    with open(path, 'rb') as f:
+        content = f.read()
+    if is_object(content):
+        return content
+    if cache is not None:
+        return cache.assemble(content)
+    return compile_module(json.loads(content))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Компоновщик объектов УВМ')
+    parser.add_argument('inputs', nargs='+', help='Модули: JSON-программы или объектные файлы')
+    parser.add_argument('-o', '--output', required=True, help='Путь к результату')
+    parser.add_argument('-c', '--compile-only', action='store_true',
+                        help='Только ассемблировать один модуль в несобранный объект')
+    parser.add_argument('--cache', help='Каталог кэша собранных модулей')
+    parser.add_argument('--data-base', type=lambda x: int(x, 0), default=DEFAULT_DATA_BASE,
+                        help=f'Адрес размещения данных без адреса (по умолчанию: 0x{DEFAULT_DATA_BASE:X})')
+    parser.add_argument('--map', action='store_true', help='Вывести значения символов')
+
+    args = parser.parse_args()
+
+    cache = ObjectCache(args.cache) if args.cache else None
+    try:
+        if args.compile_only:
+            if len(args.inputs) != 1:
+                parser.error("с --compile-only указывается один модуль")
+            image = load_module(args.inputs[0], cache)
+        else:
+            symbols = {}
+            image = link([load_module(path, cache) for path in args.inputs], args.data_base, symbols)
+    except FileNotFoundError as e:
+        print(f"Ошибка: файл {e.filename} не найден")
+        sys.exit(1)
+    except json.JSONDecodeError as e:
+        print(f"Ошибка разбора JSON: {e}")
+        sys.exit(1)
+    except ValueError as e:
+        print(f"Ошибка компоновки: {e}")
+        sys.exit(1)
+
+    # Результат заменяется атомарно: прерванная запись не оставляет
+    # обрезанный файл вместо прежнего
+    temp_path = f"{args.output}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(image)
+    os.replace(temp_path, args.output)
+    print(f"Размер двоичного файла: {len(image)} байт")
+    if cache is not None:
+        print(f"Кэш модулей: использовано {cache.hits}, собрано заново {cache.misses}")
+    if args.map and not args.compile_only:
+        for name, value in sorted(symbols.items(), key=lambda item: item[1]):
+            print(f"  0x{value:08X} {name}")
+
+
+if __name__ == "__main__":
+    main()
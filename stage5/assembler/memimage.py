@@ -0,0 +1,178 @@
+"""
+Загрузка начального содержимого памяти УВМ из файлов
+
+Поддерживаемые форматы (по расширению файла):
+- .npy - одномерный массив NumPy uint32/int32 (или uint8); заголовок
+  разбирается без NumPy;
+- .csv - дамп памяти в формате UVMInterpreter.dump_memory (байты
+  берутся из столбцов «Байт 0» - «Байт 3»);
+- остальные - двоичный образ как есть.
+
+Двоичные данные читаются прямо в память интерпретатора (readinto), без
+промежуточной копии.
+
+Память машины может быть отображением файла (map_memory_file): тогда
+содержимое файла - начальное содержимое памяти, а итоговое состояние
+памяти остается в файле без отдельного шага сохранения.
+"""
+
+import os
+import mmap
+import ast
+import csv
+import struct
+from array import array
+from pathlib import Path
+from typing import Tuple
+
+NPY_MAGIC = b'\x93NUMPY'
+
+# Типы элементов .npy: descr -> (размер, обратный порядок байт)
+_NPY_TYPES = {
+    '<u4': (4, False), '<i4': (4, False),
+    '>u4': (4, True), '>i4': (4, True),
+    '|u1': (1, False), '<u1': (1, False), '|i1': (1, False),
+}
+
+
+def parse_init_spec(spec: str) -> Tuple[int, str]:
+    """Разбор аргумента командной строки АДРЕС:ФАЙЛ"""
+    address_text, sep, path = spec.partition(':')
+    if not sep or not path:
+        raise ValueError(f"Некорректный образ памяти (ожидается АДРЕС:ФАЙЛ): {spec}")
+    try:
+        address = int(address_text, 0)
+    except ValueError:
+        raise ValueError(f"Некорректный адрес образа памяти: {address_text}")
+    return address, path
+
+
+def load_memory_image(memory: bytearray, address: int, path: str) -> int:
+    """
+    Загрузка файла в память с адреса address
+
+    Returns:
+        Количество загруженных байт
+
+    Raises:
+        ValueError: некорректный файл или данные не помещаются в память
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix == '.npy':
+        return _load_npy(memory, address, path)
+    if suffix == '.csv':
+        return _load_csv(memory, address, path)
+    return _load_raw(memory, address, path)
+
+
+def map_memory_file(path: str, size: int) -> mmap.mmap:
+    """
+    Отображение файла в память для записи (size байт от начала файла)
+
+    Файл создается, если его нет, и дополняется нулями до size байт;
+    страницы читаются с диска операционной системой по мере обращения.
+    """
+    if size <= 0:
+        raise ValueError(f"Размер памяти должен быть положительным: {size}")
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if os.fstat(fd).st_size < size:
+            os.ftruncate(fd, size)
+        return mmap.mmap(fd, size, access=mmap.ACCESS_WRITE)
+    finally:
+        os.close(fd)
+
+
+def _check_range(memory, address: int, size: int, path: str) -> None:
+    if address < 0 or address + size > len(memory):
+        raise ValueError(f"Образ {path} ({size} байт) не помещается в память "
+                         f"по адресу 0x{address:08X}")
+
+
+def _read_into(f, memory, address: int, size: int, path: str) -> None:
+    try:
+        view = memoryview(memory)
+    except TypeError:
+        # Память без буфера (PagedMemory): чтение с присваиванием срезу
+        data = f.read(size)
+        if len(data) != size:
+            raise ValueError(f"Файл {path} поврежден: неполные данные")
+        memory[address:address + size] = data
+        return
+    with view:
+        if f.readinto(view[address:address + size]) != size:
+            raise ValueError(f"Файл {path} поврежден: неполные данные")
+
+
+def _load_raw(memory, address: int, path: str) -> int:
+    size = os.path.getsize(path)
+    _check_range(memory, address, size, path)
+    with open(path, 'rb') as f:
+        _read_into(f, memory, address, size, path)
+    return size
+
+
+def _load_npy(memory, address: int, path: str) -> int:
+    with open(path, 'rb') as f:
+        prefix = f.read(8)
+        if len(prefix) < 8 or prefix[:6] != NPY_MAGIC:
+            raise ValueError(f"Файл {path} не в формате .npy")
+        major = prefix[6]
+        if major == 1:
+            length_format = '<H'
+        elif major in (2, 3):
+            length_format = '<I'
+        else:
+            raise ValueError(f"Неподдерживаемая версия .npy: {major}")
+        length = f.read(struct.calcsize(length_format))
+        if len(length) != struct.calcsize(length_format):
+            raise ValueError(f"Файл {path} поврежден: неполный заголовок .npy")
+        (header_size,) = struct.unpack(length_format, length)
+        text = f.read(header_size)
+        if len(text) != header_size:
+            raise ValueError(f"Файл {path} поврежден: неполный заголовок .npy")
+        try:
+            header = ast.literal_eval(text.decode('latin-1'))
+            descr, shape = header['descr'], header['shape']
+        except (ValueError, SyntaxError, KeyError, TypeError):
+            raise ValueError(f"Файл {path}: некорректный заголовок .npy")
+
+        if descr not in _NPY_TYPES:
+            raise ValueError(f"Файл {path}: неподдерживаемый тип элементов {descr} "
+                             f"(нужен uint32, int32 или uint8)")
+        if len(shape) > 1 and header.get('fortran_order'):
+            raise ValueError(f"Файл {path}: порядок Fortran не поддерживается")
+        item_size, swap = _NPY_TYPES[descr]
+        count = 1
+        for dim in shape:
+            count *= dim
+        size = count * item_size
+
+        _check_range(memory, address, size, path)
+        _read_into(f, memory, address, size, path)
+
+    if swap:
+        words = array('I', memory[address:address + size])
+        words.byteswap()
+        memory[address:address + size] = words.tobytes()
+    return size
+
+
+def _load_csv(memory, address: int, path: str) -> int:
+    data = bytearray()
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        next(reader, None)  # Заголовок
+        for line, row in enumerate(reader, start=2):
+            if not row:
+                continue
+            try:
+                for cell in row[1:5]:
+                    if cell == 'N/A':
+                        break
+                    data.append(int(cell, 16))
+            except ValueError:
+                raise ValueError(f"Файл {path}, строка {line}: некорректный байт")
+    _check_range(memory, address, len(data), path)
+    memory[address:address + len(data)] = data
+    return len(data)
@@ -0,0 +1,129 @@
+"""
+Трасса обращений к памяти УВМ
+
+Каждое обращение записывается как (pc, вид, адрес, значение) в буферы
+array и сбрасывается в двоичный файл блоками. Формат файла:
+- заголовок: b'UVMT', версия (uint16);
+- блоки: количество записей N (uint32), затем столбцы pc (N x uint32),
+  вид (N x uint8: 0 - чтение, 1 - запись), адрес (N x uint32),
+  значение (N x uint32). Все числа little-endian.
+"""
+
+import sys
+import struct
+from array import array
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+TRACE_MAGIC = b'UVMT'
+TRACE_VERSION = 1
+
+READ = 0
+WRITE = 1
+
+# Записей в буфере до сброса в файл
+DEFAULT_BUFFER_SIZE = 1 << 16
+
+_HEADER = struct.Struct('<4sH')
+_BLOCK = struct.Struct('<I')
+_SWAP = sys.byteorder != 'little'
+
+
+class MemoryTracer:
+    """Запись трассы обращений к памяти в файл"""
+
+    def __init__(self, path: str, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        self.path = path
+        self.buffer_size = buffer_size
+        self.records = 0
+
+        self._file: Optional[BinaryIO] = open(path, 'wb')
+        self._file.write(_HEADER.pack(TRACE_MAGIC, TRACE_VERSION))
+        self._new_buffers()
+
+    def _new_buffers(self) -> None:
+        self.pcs = array('I')
+        self.kinds = array('B')
+        self.addrs = array('I')
+        self.values = array('I')
+
+    def log(self, pc: int, kind: int, address: int, value: int) -> None:
+        """Добавление одной записи"""
+        self.pcs.append(pc)
+        self.kinds.append(kind)
+        self.addrs.append(address)
+        self.values.append(value)
+        if len(self.pcs) >= self.buffer_size:
+            self.flush()
+
+    def on_read(self, pc: int, address: int, value: int) -> None:
+        """Обработчик чтения памяти (см. UVMInterpreter.add_hook)"""
+        self.log(pc, READ, address, value)
+
+    def on_write(self, pc: int, address: int, value: int) -> None:
+        """Обработчик записи в память (см. UVMInterpreter.add_hook)"""
+        self.log(pc, WRITE, address & 0xFFFFFFFF, value)
+
+    def flush(self) -> None:
+        """Сброс буферов в файл"""
+        count = len(self.pcs)
+        if not count:
+            return
+        f = self._file
+        f.write(_BLOCK.pack(count))
+        for column in (self.pcs, self.kinds, self.addrs, self.values):
+            if _SWAP and column.itemsize > 1:
+                column.byteswap()
+            column.tofile(f)
+        self.records += count
+        self._new_buffers()
+
+    def close(self) -> None:
+        """Сброс остатка и закрытие файла"""
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_trace(path: str) -> Iterator[Tuple[array, array, array, array]]:
+    """
+    Чтение трассы по блокам
+
+    Yields:
+        Кортежи массивов (pcs, kinds, addrs, values) одного блока
+    """
+    with open(path, 'rb') as f:
+        header = f.read(_HEADER.size)
+        if len(header) != _HEADER.size:
+            raise ValueError(f"Файл {path} не является трассой УВМ")
+        magic, version = _HEADER.unpack(header)
+        if magic != TRACE_MAGIC:
+            raise ValueError(f"Файл {path} не является трассой УВМ")
+        if version != TRACE_VERSION:
+            raise ValueError(f"Неподдерживаемая версия трассы: {version}")
+
+        while True:
+            raw = f.read(_BLOCK.size)
+            if not raw:
+                break
+            if len(raw) != _BLOCK.size:
+                raise ValueError("Трасса обрезана")
+            count, = _BLOCK.unpack(raw)
+
+            columns = []
+            for typecode in ('I', 'B', 'I', 'I'):
+                column = array(typecode)
+                try:
+                    column.fromfile(f, count)
+                except EOFError:
+                    raise ValueError("Трасса обрезана")
+                if _SWAP and column.itemsize > 1:
+                    column.byteswap()
+                columns.append(column)
+            yield tuple(columns)
@@ -0,0 +1,222 @@
+"""
+Метрики запусков УВМ в текстовом формате OpenMetrics
+
+Файл предназначен для textfile collector Prometheus (node_exporter).
+Во время выполнения метрики не собираются: после run() количество команд
+берется из instructions_executed, а счетчики по кодам операций и объем
+обращений к памяти вычисляются разбором выполненного участка кода (код
+УВМ линейный, поэтому выполненные команды - подряд идущие команды от
+начального PC). Для самомодифицирующегося кода разбирается образ
+программы на момент запуска.
+
+Счетчики (counter) суммируются с уже записанными в файл, поэтому
+последовательные запуски накапливают значения; показатели (gauge)
+относятся к последнему запуску. Чтение и замена файла выполняются под
+блокировкой (fcntl.flock на файле ФАЙЛ.lock), поэтому одновременные
+запуски не теряют прибавленных значений.
+"""
+
+import os
+import re
+import time
+try:
+    import fcntl
+except ImportError:  # Windows: файл метрик не блокируется
+    fcntl = None
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Optional, Tuple
+
+from isa import ISA, DISPATCH, READ_MEM, WRITE_MEM, UNARY_MINUS
+
+# Описание метрик: имя -> (тип, описание)
+METRICS = {
+    'uvm_instructions': ('counter', 'Выполнено команд УВМ'),
+    'uvm_opcode_instructions': ('counter', 'Выполнено команд по кодам операций'),
+    'uvm_memory_read_bytes': ('counter', 'Прочитано байт памяти командами'),
+    'uvm_memory_written_bytes': ('counter', 'Записано байт памяти командами'),
+    'uvm_dump_bytes': ('counter', 'Байт памяти в дампах'),
+    'uvm_jobs': ('counter', 'Запуски программ по результату'),
+    'uvm_run_seconds': ('gauge', 'Время выполнения последнего запуска'),
+    'uvm_instructions_per_second': ('gauge', 'Скорость выполнения последнего запуска'),
+    'uvm_phase_seconds': ('gauge', 'Длительность этапов последнего запуска'),
+}
+
+_SAMPLE = re.compile(r'^([a-z_]+?)(_total)?(\{.*\})?\s+(\S+)$')
+_LABEL = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+_ESCAPES = {'n': '\n', '"': '"', '\\': '\\'}
+
+Key = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def _key(name: str, labels: Dict[str, str]) -> Key:
+    return name, tuple(sorted(labels.items()))
+
+
+class Metrics:
+    """Набор метрик: простые целые и вещественные значения в словарях"""
+
+    def __init__(self):
+        self.values: Dict[Key, float] = {}
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        key = _key(name, labels)
+        self.values[key] = self.values.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels) -> None:
+        self.values[_key(name, labels)] = value
+
+    def get(self, name: str, **labels) -> float:
+        return self.values.get(_key(name, labels), 0)
+
+    @contextmanager
+    def phase(self, name: str):
+        """Измерение длительности этапа"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.set('uvm_phase_seconds', time.perf_counter() - start, phase=name)
+
+    @contextmanager
+    def run(self, interpreter, program: Optional[str] = None):
+        """
+        Учет одного запуска интерпретатора (блок with вокруг run())
+
+        Выполнение не инструментируется: счетчики вычисляются после него.
+        """
+        code = bytes(interpreter.memory[:interpreter.program_size])
+        start_pc = interpreter.pc
+        start_count = interpreter.instructions_executed
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            executed = interpreter.instructions_executed - start_count
+            self.record_code(code, start_pc, executed)
+            self.inc('uvm_instructions', executed)
+            self.set('uvm_run_seconds', seconds)
+            self.set('uvm_instructions_per_second', executed / seconds if seconds > 0 else 0.0)
+            result = 'failure' if interpreter.error is not None else 'success'
+            labels = {'program': program} if program else {}
+            self.inc('uvm_jobs', result=result, **labels)
+
+    def record_code(self, code: bytes, pc: int, count: int) -> None:
+        """Счетчики по кодам операций для count команд кода, начиная с pc"""
+        opcodes = [0] * 128
+        while count > 0 and pc < len(code):
+            entry = DISPATCH[code[pc]]
+            if entry is None:
+                break
+            spec = entry[0]
+            opcodes[spec.opcode] += 1
+            pc += spec.size
+            count -= 1
+
+        for opcode, spec in ISA.items():
+            if opcodes[opcode]:
+                self.inc('uvm_opcode_instructions', opcodes[opcode], opcode=spec.mnemonic)
+        self.inc('uvm_memory_read_bytes', 4 * opcodes[READ_MEM])
+        self.inc('uvm_memory_written_bytes', 4 * (opcodes[WRITE_MEM] + opcodes[UNARY_MINUS]))
+
+    def render(self) -> str:
+        """Текст в формате OpenMetrics"""
+        lines = []
+        for name, (kind, help_text) in METRICS.items():
+            samples = sorted((labels, value) for (key_name, labels), value in self.values.items()
+                             if key_name == name)
+            if not samples:
+                continue
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"# HELP {name} {help_text}")
+            suffix = '_total' if kind == 'counter' else ''
+            for labels, value in samples:
+                text = ','.join(f'{k}="{_escape(v)}"' for k, v in labels)
+                label_part = '{' + text + '}' if text else ''
+                lines.append(f"{name}{suffix}{label_part} {_number(value)}")
+        lines.append("# EOF")
+        return '\n'.join(lines) + '\n'
+
+    def merge_counters(self, path: str) -> None:
+        """Прибавление счетчиков, уже записанных в файл"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+        except FileNotFoundError:
+            return
+        for (name, labels), value in parse(text).items():
+            if METRICS.get(name, ('gauge',))[0] == 'counter':
+                self.inc(name, value, **dict(labels))
+
+    def save(self, path: str, accumulate: bool = True) -> None:
+        """
+        Запись файла метрик
+
+        Файл заменяется атомарно, чтобы сборщик не прочитал его наполовину;
+        слияние со счетчиками файла и замена выполняются под блокировкой.
+        """
+        with _locked(path):
+            if accumulate:
+                self.merge_counters(path)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(self.render())
+            os.replace(temp_path, path)
+
+
+@contextmanager
+def _locked(path: str):
+    """Исключительная блокировка файла метрик (на отдельном файле ФАЙЛ.lock)"""
+    if fcntl is None:
+        yield
+        return
+    with open(f"{path}.lock", 'a') as lock:
+        fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+
+def parse(text: str) -> Dict[Key, float]:
+    """Разбор текста OpenMetrics, записанного Metrics.render"""
+    values = {}
+    for line in text.splitlines():
+        if not line or line.startswith('#'):
+            continue
+        match = _SAMPLE.match(line)
+        if match is None:
+            raise ValueError(f"Некорректная строка метрик: {line}")
+        name, _, labels, value = match.groups()
+        pairs = {k: _unescape(v) for k, v in _LABEL.findall(labels or '')}
+        values[_key(name, pairs)] = float(value)
+    return values
+
+
+def metrics_phase(metrics: Optional[Metrics], name: str):
+    """Измерение этапа или пустой контекст, если метрики не собираются"""
+    if metrics is None:
+        return nullcontext()
+    return metrics.phase(name)
+
+
+def metrics_run(metrics: Optional[Metrics], interpreter, program: Optional[str] = None):
+    """Учет запуска или пустой контекст, если метрики не собираются"""
+    if metrics is None:
+        return nullcontext()
+    return metrics.run(interpreter, program)
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _unescape(value: str) -> str:
+    # За один проход: последовательная замена превращала "\\n" в перевод строки
+    return re.sub(r'\\(.)', lambda m: _ESCAPES.get(m.group(1), m.group(0)), value)
+
+
+def _number(value: float) -> str:
+    if isinstance(value, int) or float(value).is_integer() and abs(value) < 2 ** 53:
+        return str(int(value))
+    return repr(float(value))
@@ -0,0 +1,156 @@
+"""
+Объектный файл УВМ с секциями
+
+Формат (little-endian):
+- заголовок: b'UVMO', версия (uint16), количество секций (uint16);
+- таблица секций: тип (uint8, 3 байта выравнивания), адрес загрузки,
+  смещение данных в файле, размер, CRC32 данных (uint32 каждое);
+- данные секций.
+
+Секция кода загружается по своему адресу и задает размер программы,
+секции данных копируются в память одним присваиванием среза каждая.
+Секции неизвестных типов при загрузке пропускаются, поэтому в формат
+можно добавлять новые виды секций без изменения версии.
+
+Несобранный объект (результат linker.compile_module) дополнительно
+содержит таблицу символов и перемещения, а его секции данных могут не
+иметь адреса (UNPLACED); такой объект загружается только после
+компоновки.
+
+Файл без заголовка b'UVMO' считается образом кода (прежний формат).
+"""
+
+import zlib
+import struct
+from dataclasses import dataclass
+from typing import List, Tuple
+
+OBJECT_MAGIC = b'UVMO'
+OBJECT_VERSION = 1
+
+# Типы секций
+SECTION_CODE = 1
+SECTION_DATA = 2
+SECTION_SYMBOLS = 3   # Таблица символов (см. pack_symbols)
+SECTION_RELOCS = 4    # Перемещения в поле C команд 72 (см. pack_relocs)
+
+SECTION_NAMES = {SECTION_CODE: 'code', SECTION_DATA: 'data',
+                 SECTION_SYMBOLS: 'symbols', SECTION_RELOCS: 'relocs'}
+
+# Адрес секции данных, которую размещает компоновщик
+UNPLACED = 0xFFFFFFFF
+
+# Виды символов: константа или адрес секции данных (значение - номер секции)
+SYMBOL_ABSOLUTE = 0
+SYMBOL_SECTION = 1
+
+_HEADER = struct.Struct('<4sHH')
+_SECTION = struct.Struct('<BxxxIIII')
+_SYMBOL = struct.Struct('<BxHI')
+_RELOC = struct.Struct('<IiH')
+
+
+@dataclass
+class Section:
+    """Секция объектного файла"""
+    kind: int        # Тип секции (SECTION_*)
+    address: int     # Адрес загрузки в памяти УВМ
+    data: bytes      # При чтении файла - memoryview без копирования
+
+    @property
+    def name(self) -> str:
+        return SECTION_NAMES.get(self.kind, f"type{self.kind}")
+
+
+def is_object(image: bytes) -> bool:
+    """Является ли образ объектным файлом"""
+    return image[:len(OBJECT_MAGIC)] == OBJECT_MAGIC
+
+
+def build_object(sections: List[Section]) -> bytes:
+    """Сборка объектного файла из секций"""
+    offset = _HEADER.size + _SECTION.size * len(sections)
+    table = []
+    for section in sections:
+        table.append(_SECTION.pack(section.kind, section.address, offset, len(section.data),
+                                   zlib.crc32(section.data)))
+        offset += len(section.data)
+    return b''.join([_HEADER.pack(OBJECT_MAGIC, OBJECT_VERSION, len(sections))] + table
+                    + [bytes(section.data) for section in sections])
+
+
+def read_object(image) -> List[Section]:
+    """
+    Разбор объектного файла с проверкой контрольных сумм
+
+    Raises:
+        ValueError: файл поврежден или имеет неподдерживаемую версию
+    """
+    view = memoryview(image)
+    if len(view) < _HEADER.size:
+        raise ValueError("Объектный файл поврежден: неполный заголовок")
+    magic, version, count = _HEADER.unpack_from(view, 0)
+    if magic != OBJECT_MAGIC:
+        raise ValueError("Не объектный файл УВМ")
+    if version != OBJECT_VERSION:
+        raise ValueError(f"Неподдерживаемая версия объектного файла: {version}")
+    if _HEADER.size + _SECTION.size * count > len(view):
+        raise ValueError("Объектный файл поврежден: неполная таблица секций")
+
+    sections = []
+    for i in range(count):
+        kind, address, offset, size, crc = _SECTION.unpack_from(view, _HEADER.size + i * _SECTION.size)
+        if offset + size > len(view):
+            raise ValueError(f"Объектный файл поврежден: секция {i} выходит за конец файла")
+        data = view[offset:offset + size]
+        if zlib.crc32(data) != crc:
+            raise ValueError(f"Объектный файл поврежден: неверная контрольная сумма секции {i}")
+        sections.append(Section(kind, address, data))
+    return sections
+
+
+def is_linked(sections: List[Section]) -> bool:
+    """Можно ли загрузить объект: нет перемещений и неразмещенных данных"""
+    return not any(section.kind == SECTION_RELOCS
+                   or (section.kind == SECTION_DATA and section.address == UNPLACED)
+                   for section in sections)
+
+
+def pack_symbols(symbols: List[Tuple[str, int, int]]) -> bytes:
+    """Таблица символов: (имя, вид, значение) -> вид, длина имени, значение, имя"""
+    parts = []
+    for name, kind, value in symbols:
+        encoded = name.encode('utf-8')
+        parts.append(_SYMBOL.pack(kind, len(encoded), value) + encoded)
+    return b''.join(parts)
+
+
+def unpack_symbols(data) -> List[Tuple[str, int, int]]:
+    symbols = []
+    pos = 0
+    while pos < len(data):
+        kind, length, value = _SYMBOL.unpack_from(data, pos)
+        pos += _SYMBOL.size
+        symbols.append((bytes(data[pos:pos + length]).decode('utf-8'), kind, value))
+        pos += length
+    return symbols
+
+
+def pack_relocs(relocs: List[Tuple[int, str, int]]) -> bytes:
+    """Перемещения: (смещение команды в коде, символ, слагаемое)"""
+    parts = []
+    for offset, name, addend in relocs:
+        encoded = name.encode('utf-8')
+        parts.append(_RELOC.pack(offset, addend, len(encoded)) + encoded)
+    return b''.join(parts)
+
+
+def unpack_relocs(data) -> List[Tuple[int, str, int]]:
+    relocs = []
+    pos = 0
+    while pos < len(data):
+        offset, addend, length = _RELOC.unpack_from(data, pos)
+        pos += _RELOC.size
+        relocs.append((offset, bytes(data[pos:pos + length]).decode('utf-8'), addend))
+        pos += length
+    return relocs
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Страничная память УВМ с общими страницами
+
+Много экземпляров UVMInterpreter, запущенных с одной программой и почти
+одинаковыми входными данными, хранят в основном одинаковые страницы
+памяти. PagedMemory делит память на страницы; неизменяемые страницы
+хранятся в общем хранилище (PageStore) по хешу содержимого и
+используются всеми экземплярами, а страница копируется только при
+записи в нее (копирование при записи).
+
+Страница становится общей:
+- при создании памяти (все страницы - одна нулевая);
+- при записи целой выровненной страницы (загрузка программы и образов
+  памяти, восстановление состояния);
+- при вызове share() и fork().
+
+Память поддерживает операции bytearray, которые использует
+интерпретатор: индексирование, срезы, присваивание срезу той же длины,
+len() и bytes(). Обращение к памяти медленнее, чем к bytearray, зато
+расход памяти на пакет машин пропорционален числу различных страниц.
+"""
+
+import hashlib
+import weakref
+import argparse
+from typing import Dict, List, Optional, Tuple, Union
+
+# Размер страницы по умолчанию
+PAGE_SIZE = 4096
+
+
+class PageStore:
+    """
+    Хранилище общих страниц: хеш содержимого -> страница и число ссылок
+
+    Хеш вычисляется один раз при intern(); владелец страницы хранит его и
+    передает в retain() и release(), чтобы не хешировать страницу заново.
+    """
+
+    def __init__(self):
+        self._pages: Dict[bytes, bytes] = {}
+        self._refs: Dict[bytes, int] = {}
+
+    @staticmethod
+    def _digest(data) -> bytes:
+        return hashlib.blake2b(data, digest_size=16).digest()
+
+    def intern(self, data) -> Tuple[bytes, bytes]:
+        """
+        Общая страница с содержимым data (счетчик ссылок увеличивается)
+
+        Returns:
+            Хеш страницы и сама страница
+        """
+        digest = self._digest(data)
+        page = self._pages.get(digest)
+        if page is None:
+            page = self._pages[digest] = bytes(data)
+            self._refs[digest] = 0
+        self._refs[digest] += 1
+        return digest, page
+
+    def retain(self, digest: bytes) -> None:
+        self._refs[digest] += 1
+
+    def release(self, digest: bytes) -> None:
+        """Освобождение ссылки; страница без ссылок удаляется"""
+        self._refs[digest] -= 1
+        if self._refs[digest] == 0:
+            del self._refs[digest]
+            del self._pages[digest]
+
+    def _release_all(self, digests: List[Optional[bytes]]) -> None:
+        for digest in digests:
+            if digest is not None:
+                self.release(digest)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Статистика: distinct - различных страниц, references - ссылок на
+        них, stored_bytes - занято страницами, saved_bytes - сэкономлено
+        по сравнению с отдельной копией каждой страницы
+        """
+        stored = sum(len(page) for page in self._pages.values())
+        referenced = sum(len(self._pages[digest]) * refs for digest, refs in self._refs.items())
+        return {
+            'distinct': len(self._pages),
+            'references': sum(self._refs.values()),
+            'stored_bytes': stored,
+            'saved_bytes': referenced - stored,
+        }
+
+
+class PagedMemory:
+    """
+    Память из страниц: bytes - общая страница, bytearray - собственная копия
+
+    Хеши общих страниц хранятся в отдельном списке _digests (None - для
+    собственных страниц), чтобы чтение памяти обращалось к странице
+    напрямую.
+    """
+
+    def __init__(self, size: int, store: Optional[PageStore] = None, page_size: int = PAGE_SIZE):
+        """
+        Args:
+            size: размер памяти в байтах
+            store: общее хранилище страниц (None - собственное)
+            page_size: размер страницы (степень двойки)
+        """
+        if size <= 0:
+            raise ValueError(f"Размер памяти должен быть положительным: {size}")
+        if page_size <= 0 or page_size & (page_size - 1):
+            raise ValueError(f"Размер страницы должен быть степенью двойки: {page_size}")
+        self.size = size
+        self.page_size = page_size
+        self.store = store if store is not None else PageStore()
+        self._shift = page_size.bit_length() - 1
+        self._mask = page_size - 1
+
+        count = (size + page_size - 1) >> self._shift
+        self._pages: List[Union[bytes, bytearray]] = []
+        self._digests: List[Optional[bytes]] = []
+        for index in range(count):
+            digest, page = self.store.intern(bytes(self._page_length(index)))
+            self._digests.append(digest)
+            self._pages.append(page)
+        weakref.finalize(self, self.store._release_all, self._digests)
+
+    def _page_length(self, index: int) -> int:
+        return min(self.page_size, self.size - (index << self._shift))
+
+    def _private(self, index: int) -> bytearray:
+        """Собственная копия страницы для записи"""
+        page = self._pages[index]
+        if type(page) is bytes:
+            self.store.release(self._digests[index])
+            self._digests[index] = None
+            page = self._pages[index] = bytearray(page)
+        return page
+
+    def _intern(self, index: int, data) -> None:
+        """Замена страницы общей страницей с содержимым data"""
+        if self._digests[index] is not None:
+            self.store.release(self._digests[index])
+        self._digests[index], self._pages[index] = self.store.intern(data)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __bytes__(self) -> bytes:
+        return b''.join(self._pages)
+
+    def _range(self, key: slice):
+        start, stop, step = key.indices(self.size)
+        if step != 1:
+            raise ValueError("Срезы с шагом не поддерживаются")
+        return start, max(start, stop)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop = self._range(key)
+            first = start >> self._shift
+            offset = start & self._mask
+            if offset + (stop - start) <= self.page_size:
+                return bytes(self._pages[first][offset:offset + stop - start])
+            parts = []
+            while start < stop:
+                index = start >> self._shift
+                offset = start & self._mask
+                length = min(stop - start, self.page_size - offset)
+                parts.append(self._pages[index][offset:offset + length])
+                start += length
+            return b''.join(parts)
+        if key < 0:
+            key += self.size
+        if not 0 <= key < self.size:
+            raise IndexError("Адрес вне памяти")
+        return self._pages[key >> self._shift][key & self._mask]
+
+    def __setitem__(self, key, value) -> None:
+        if not isinstance(key, slice):
+            if key < 0:
+                key += self.size
+            if not 0 <= key < self.size:
+                raise IndexError("Адрес вне памяти")
+            index = key >> self._shift
+            page = self._pages[index]
+            if type(page) is bytes:
+                if page[key & self._mask] == value:
+                    return
+                page = self._private(index)
+            page[key & self._mask] = value
+            return
+
+        start, stop = self._range(key)
+        data = memoryview(value).cast('B')
+        if len(data) != stop - start:
+            raise ValueError("Присваивание срезу другой длины не поддерживается")
+        position = 0
+        while start < stop:
+            index = start >> self._shift
+            offset = start & self._mask
+            length = min(stop - start, self.page_size - offset)
+            chunk = data[position:position + length]
+            if offset == 0 and length == self._page_length(index):
+                # Целая страница заменяется общей
+                self._intern(index, chunk)
+            elif self._pages[index][offset:offset + length] != chunk:
+                self._private(index)[offset:offset + length] = chunk
+            start += length
+            position += length
+
+    def share(self) -> int:
+        """
+        Перенос собственных страниц в общее хранилище
+
+        Returns:
+            Количество страниц, ставших общими
+        """
+        shared = 0
+        for index, page in enumerate(self._pages):
+            if type(page) is not bytes:
+                self._intern(index, page)
+                shared += 1
+        return shared
+
+    def fork(self) -> 'PagedMemory':
+        """Копия памяти, разделяющая с исходной все страницы"""
+        self.share()
+        other = PagedMemory.__new__(PagedMemory)
+        other.size = self.size
+        other.page_size = self.page_size
+        other.store = self.store
+        other._shift = self._shift
+        other._mask = self._mask
+        other._pages = list(self._pages)
+        other._digests = list(self._digests)
+        for digest in other._digests:
+            self.store.retain(digest)
+        weakref.finalize(other, self.store._release_all, other._digests)
+        return other
+
+    def stats(self) -> Dict[str, int]:
+        """Статистика экземпляра: страниц всего, общих и собственных"""
+        private = sum(1 for page in self._pages if type(page) is not bytes)
+        return {'pages': len(self._pages), 'shared': len(self._pages) - private, 'private': private}
+
+
+def main():
+    from interpreter import UVMInterpreter
+
+    parser = argparse.ArgumentParser(description='Пакетный запуск машин УВМ с общими страницами памяти')
+    parser.add_argument('program_file', help='Путь к программе или АРХИВ.uvmb#ИМЯ')
+    parser.add_argument('--vms', type=int, default=100, help='Количество машин (по умолчанию: 100)')
+    parser.add_argument('--memory-size', type=int, default=1024 * 1024,
+                        help='Размер памяти каждой машины в байтах (по умолчанию: 1MB)')
+    parser.add_argument('--vary', type=lambda x: int(x, 0), metavar='ADDR',
+                        help='Записать номер машины в слово по адресу ADDR (различные входные данные)')
+    args = parser.parse_args()
+
+    store = PageStore()
+    template = UVMInterpreter(memory_size=args.memory_size, verbose=False, page_store=store)
+    template.load_program(args.program_file)
+
+    machines = []
+    for number in range(args.vms):
+        interpreter = UVMInterpreter(memory_size=args.memory_size, verbose=False, page_store=store)
+        interpreter.memory = template.memory.fork()
+        interpreter.program_size = template.program_size
+        if args.vary is not None:
+            interpreter.memory[args.vary:args.vary + 4] = number.to_bytes(4, 'little')
+        interpreter.run()
+        if interpreter.error:
+            print(f"Машина {number}: {interpreter.error}")
+        # Одинаковые результаты разных машин хранятся один раз
+        interpreter.memory.share()
+        machines.append(interpreter)
+
+    stats = store.stats()
+    private = sum(interpreter.memory.stats()['private'] for interpreter in machines)
+    total = args.vms * args.memory_size
+    print(f"Машин: {args.vms}, память каждой: {args.memory_size} байт")
+    print(f"Различных общих страниц: {stats['distinct']} ({stats['stored_bytes']} байт), "
+          f"собственных страниц: {private}")
+    print(f"Занято: {stats['stored_bytes'] + private * PAGE_SIZE} байт из {total} "
+          f"(сэкономлено {stats['saved_bytes']} байт)")
+
+
+if __name__ == "__main__":
+    main()
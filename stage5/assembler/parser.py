@@ -5,6 +5,7 @@
 
 from dataclasses import dataclass
 from typing import List, Dict, Any, Optional
+from isa import ISA, VALID_OPCODES
 
 @dataclass
 class Instruction:
@@ -17,18 +18,14 @@ class Instruction:
 
     def __post_init__(self):
         """Автоматически определяем размер команды по коду операции"""
-        if self.opcode == 72:  # Загрузка константы
-            self.size = 6
-        elif self.opcode in [113, 8]:  # Чтение/запись
-            self.size = 3
-        elif self.opcode == 91:  # Унарный минус
-            self.size = 4
-        else:
+        spec = ISA.get(self.opcode)
+        if spec is None:
             raise ValueError(f"Неизвестный код операции: {self.opcode}")
+        self.size = spec.size
 
         # Проверка обязательности полей
-        if self.opcode == 91 and self.field_d is None:
-            raise ValueError("Для команды унарного минуса обязательно поле D")
+        if 'field_d' in spec.field_names and self.field_d is None:
+            raise ValueError(f"Для команды \"{spec.title}\" обязательно поле D")
 
 
 def parse_instruction(instr_dict: Dict[str, Any]) -> Instruction:
@@ -42,9 +39,9 @@ def parse_instruction(instr_dict: Dict[str, Any]) -> Instruction:
         raise ValueError("Отсутствует код операции в команде")
 
     # Валидация кода операции
-    valid_opcodes = [72, 113, 8, 91]
-    if opcode not in valid_opcodes:
-        raise ValueError(f"Недопустимый код операции: {opcode}. Допустимые: {valid_opcodes}")
+    if opcode not in ISA:
+        raise ValueError(f"Недопустимый код операции: {opcode}. Допустимые: {VALID_OPCODES}")
+    spec = ISA[opcode]
 
     # Извлечение полей в зависимости от типа команды
     field_b = clean_dict.get('field_b', 0)
@@ -57,11 +54,11 @@ def parse_instruction(instr_dict: Dict[str, Any]) -> Instruction:
     if not isinstance(field_c, int):
         raise ValueError(f"Поле C должно быть целым числом, получено: {type(field_c)}")
 
-    # Для 4-байтных команд извлекаем поле D
-    if opcode == 91:  # Унарный минус
+    # Для команд с полем D (унарный минус) извлекаем его
+    if 'field_d' in spec.field_names:
         field_d = clean_dict.get('field_d')
         if field_d is None:
-            raise ValueError("Для команды унарного минуса обязательно поле D")
+            raise ValueError(f"Для команды \"{spec.title}\" обязательно поле D")
 
         if not isinstance(field_d, int):
             raise ValueError(f"Поле D должно быть целым числом, получено: {type(field_d)}")
@@ -75,6 +72,80 @@ def parse_instruction(instr_dict: Dict[str, Any]) -> Instruction:
 
         return Instruction(opcode=opcode, field_b=field_b, field_c=field_c)
 
+@dataclass
+class DataBlock:
+    """Блок начальных данных: 32-битные слова по адресу"""
+    address: Optional[int]       # None - адрес назначает компоновщик
+    words: List[int]
+    name: Optional[str] = None   # Символ для ссылок из поля C команды 72
+
+    def to_bytes(self) -> bytes:
+        return b''.join(word.to_bytes(4, 'little') for word in self.words)
+
+
+def parse_data(program_json: Dict[str, Any]) -> List[DataBlock]:
+    """
+    Парсинг блока начальных данных программы (необязательный)
+
+    Формат JSON:
+    {
+        "data": [
+            {"address": 4096, "words": [100, 200, -300]},
+            {"name": "table", "words": [1, 2, 3]},
+            ...
+        ]
+    }
+    Отрицательные слова записываются в дополнительном коде. Блок с именем
+    может не иметь адреса - тогда его размещает компоновщик (linker.py).
+    """
+    blocks_list = program_json.get('data', [])
+    if not isinstance(blocks_list, list):
+        raise ValueError("Поле 'data' должно быть списком")
+
+    blocks = []
+    for i, block_dict in enumerate(blocks_list):
+        if not isinstance(block_dict, dict):
+            raise ValueError(f"Ошибка в блоке данных {i}: ожидается объект")
+        address = block_dict.get('address')
+        words = block_dict.get('words')
+        name = block_dict.get('name')
+        if name is not None and (not isinstance(name, str) or not name.isidentifier()):
+            raise ValueError(f"Ошибка в блоке данных {i}: некорректное имя {name}")
+        if address is None and name is None:
+            raise ValueError(f"Ошибка в блоке данных {i}: нужен адрес или имя")
+        if address is not None and (not isinstance(address, int) or not 0 <= address <= 0xFFFFFFFF):
+            raise ValueError(f"Ошибка в блоке данных {i}: некорректный адрес {address}")
+        if not isinstance(words, list):
+            raise ValueError(f"Ошибка в блоке данных {i}: поле 'words' должно быть списком")
+        for word in words:
+            if not isinstance(word, int) or not -0x80000000 <= word <= 0xFFFFFFFF:
+                raise ValueError(f"Ошибка в блоке данных {i}: некорректное слово {word}")
+        blocks.append(DataBlock(address, [word & 0xFFFFFFFF for word in words], name))
+
+    # Блоки с адресами не должны перекрываться
+    ordered = sorted((block for block in blocks if block.address is not None),
+                     key=lambda block: block.address)
+    for prev, block in zip(ordered, ordered[1:]):
+        if prev.address + 4 * len(prev.words) > block.address:
+            raise ValueError(f"Блоки данных перекрываются: 0x{prev.address:08X} и 0x{block.address:08X}")
+
+    return blocks
+
+
+def needs_linking(program_json: dict) -> bool:
+    """Есть ли в программе ссылки на символы или данные без адреса (сборка - linker.py)"""
+    instructions = program_json.get('instructions')
+    if isinstance(instructions, list) and any(
+            isinstance(instr, dict) and isinstance(instr.get('field_c'), str)
+            for instr in instructions):
+        return True
+    data = program_json.get('data')
+    if isinstance(data, list) and any(
+            isinstance(block, dict) and block.get('address') is None for block in data):
+        return True
+    return 'symbols' in program_json
+
+
 def parse_program(program_json: Dict[str, Any]) -> List[Instruction]:
     """
     Парсинг всей программы из JSON
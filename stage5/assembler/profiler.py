@@ -0,0 +1,124 @@
+"""
+Профилировщик программ УВМ
+
+Собирает счетчики по кодам операций, по адресам команд (PC) и по адресам
+обращений к памяти, сгруппированным в блоки (строка кэша или страница).
+В режиме выборки учитывается только каждая N-я команда.
+"""
+
+import json
+from typing import Dict, List, Optional
+
+from isa import ISA
+
+# Размеры блоков для группировки адресов памяти
+CACHE_LINE_SIZE = 64
+PAGE_SIZE = 4096
+
+
+class Profiler:
+    """Профиль выполнения программы УВМ"""
+
+    def __init__(self, sample_every: int = 1, bucket_size: int = CACHE_LINE_SIZE):
+        """
+        Args:
+            sample_every: учитывать каждую N-ю команду (1 - все команды)
+            bucket_size: размер блока адресов памяти в байтах (степень двойки)
+        """
+        if sample_every < 1:
+            raise ValueError(f"Период выборки должен быть положительным: {sample_every}")
+        if bucket_size < 1 or bucket_size & (bucket_size - 1):
+            raise ValueError(f"Размер блока должен быть степенью двойки: {bucket_size}")
+
+        self.sample_every = sample_every
+        self.bucket_size = bucket_size
+        self.bucket_shift = bucket_size.bit_length() - 1
+
+        self.opcode_counts = [0] * 128
+        self.pc_counts: Dict[int, int] = {}
+        self.read_counts: Dict[int, int] = {}
+        self.write_counts: Dict[int, int] = {}
+        self.samples = 0
+
+        self._countdown = sample_every
+        self._sampled = False
+
+    def on_instruction(self, pc: int, opcode: int, field_b: int, field_c: int,
+                       field_d: Optional[int]) -> None:
+        """Учет одной команды (см. UVMInterpreter.add_hook)"""
+        self._countdown -= 1
+        if self._countdown:
+            self._sampled = False
+            return
+        self._countdown = self.sample_every
+        self._sampled = True
+        self.samples += 1
+
+        self.opcode_counts[opcode] += 1
+        pc_counts = self.pc_counts
+        pc_counts[pc] = pc_counts.get(pc, 0) + 1
+
+    def on_read(self, pc: int, address: int, value: int) -> None:
+        """Учет чтения памяти командой, попавшей в выборку"""
+        if self._sampled:
+            bucket = address >> self.bucket_shift
+            self.read_counts[bucket] = self.read_counts.get(bucket, 0) + 1
+
+    def on_write(self, pc: int, address: int, value: int) -> None:
+        """Учет записи в память командой, попавшей в выборку"""
+        if self._sampled:
+            bucket = address >> self.bucket_shift
+            self.write_counts[bucket] = self.write_counts.get(bucket, 0) + 1
+
+    def to_dict(self) -> dict:
+        """Профиль в виде словаря для JSON"""
+        shift = self.bucket_shift
+
+        def buckets(counts: Dict[int, int]) -> List[dict]:
+            return [{'address': f"0x{bucket << shift:08X}", 'count': count}
+                    for bucket, count in sorted(counts.items())]
+
+        return {
+            'sample_every': self.sample_every,
+            'samples': self.samples,
+            'bucket_size': self.bucket_size,
+            'opcodes': {ISA[op].mnemonic: self.opcode_counts[op]
+                        for op in ISA if self.opcode_counts[op]},
+            'pcs': [{'pc': f"0x{pc:08X}", 'count': count}
+                    for pc, count in sorted(self.pc_counts.items())],
+            'reads': buckets(self.read_counts),
+            'writes': buckets(self.write_counts),
+        }
+
+    def save_json(self, path: str) -> None:
+        """Сохранение профиля в JSON-файл"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+    def report(self, top: int = 10) -> str:
+        """Текстовый отчет с N самых частых элементов каждой категории"""
+        lines = []
+        sampling = f" (выборка: каждая {self.sample_every}-я команда)" if self.sample_every > 1 else ""
+        lines.append(f"Профиль выполнения: учтено команд {self.samples}{sampling}")
+
+        lines.append("\nКоды операций:")
+        for op in sorted(ISA, key=lambda op: -self.opcode_counts[op]):
+            if self.opcode_counts[op]:
+                share = 100.0 * self.opcode_counts[op] / self.samples
+                lines.append(f"  {ISA[op].mnemonic:<6} {ISA[op].title:<20} "
+                             f"{self.opcode_counts[op]:>10} {share:6.1f}%")
+
+        def top_lines(title: str, counts: Dict[int, int], shift: int) -> None:
+            lines.append(f"\n{title}:")
+            ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:top]
+            if not ranked:
+                lines.append("  нет данных")
+            for key, count in ranked:
+                lines.append(f"  0x{key << shift:08X} {count:>10}")
+
+        top_lines(f"Самые частые команды (PC), топ-{top}", self.pc_counts, 0)
+        top_lines(f"Чтение памяти по блокам {self.bucket_size} байт, топ-{top}",
+                  self.read_counts, self.bucket_shift)
+        top_lines(f"Запись в память по блокам {self.bucket_size} байт, топ-{top}",
+                  self.write_counts, self.bucket_shift)
+        return '\n'.join(lines)
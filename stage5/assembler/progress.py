@@ -0,0 +1,120 @@
+"""
+Ход выполнения длинных программ УВМ
+
+Наблюдатель подключается к интерпретатору (UVMInterpreter.monitor), и
+run() выполняет программу участками по chunk команд, вызывая tick()
+между участками. Строка состояния (PC, количество команд, скорость,
+оценка оставшегося времени) выводится каждые N команд и по сигналу
+SIGUSR1: обработчик сигнала только ставит флаг, вывод делается в tick().
+
+Код УВМ линейный, поэтому общее количество команд известно заранее по
+образу программы, а оставшееся время оценивается по текущей скорости.
+"""
+
+import sys
+import time
+import signal
+from typing import Optional, TextIO
+
+from isa import DISPATCH
+
+# Команд в участке выполнения между проверками
+DEFAULT_CHUNK = 1 << 16
+
+
+def count_instructions(code: bytes) -> int:
+    """Количество команд в образе программы (до первой нераспознанной)"""
+    count = 0
+    pc = 0
+    while pc < len(code):
+        entry = DISPATCH[code[pc]]
+        if entry is None or pc + entry[0].size > len(code):
+            break
+        pc += entry[0].size
+        count += 1
+    return count
+
+
+def _format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+
+class Progress:
+    """Вывод хода выполнения между участками run()"""
+
+    def __init__(self, every: Optional[int] = None, chunk: int = DEFAULT_CHUNK,
+                 stream: TextIO = sys.stderr):
+        """
+        Args:
+            every: выводить строку каждые N команд (None - только по сигналу)
+            chunk: команд в участке выполнения между проверками
+            stream: поток для вывода
+        """
+        if every is not None and every < 1:
+            raise ValueError(f"Период вывода должен быть положительным: {every}")
+        self.every = every
+        self.chunk = min(chunk, every) if every else chunk
+        self.stream = stream
+        self.requested = False
+        self.total = None
+
+        self._next_report = every
+        self._start_time = time.perf_counter()
+        self._last_time = self._start_time
+        self._last_count = 0
+        self._previous_handler = None
+
+    def attach(self, interpreter) -> None:
+        """Подключение к интерпретатору после загрузки программы"""
+        self.total = count_instructions(bytes(interpreter.memory[:interpreter.program_size]))
+        self._start_time = self._last_time = time.perf_counter()
+        self._last_count = interpreter.instructions_executed
+        if self.every:
+            self._next_report = interpreter.instructions_executed + self.every
+        interpreter.monitor = self
+
+    def install_signal(self) -> bool:
+        """Установка обработчика SIGUSR1; False, если сигнал не поддерживается"""
+        if not hasattr(signal, 'SIGUSR1'):
+            return False
+        self._previous_handler = signal.signal(signal.SIGUSR1, self._on_signal)
+        return True
+
+    def uninstall_signal(self) -> None:
+        if self._previous_handler is not None:
+            signal.signal(signal.SIGUSR1, self._previous_handler)
+            self._previous_handler = None
+
+    def _on_signal(self, signum, frame) -> None:
+        self.requested = True
+
+    def tick(self, interpreter) -> None:
+        """Проверка между участками выполнения"""
+        executed = interpreter.instructions_executed
+        if self.requested or (self._next_report is not None and executed >= self._next_report):
+            self.requested = False
+            if self.every:
+                while self._next_report <= executed:
+                    self._next_report += self.every
+            self.stream.write(self.status(interpreter) + '\n')
+            self.stream.flush()
+
+    def status(self, interpreter) -> str:
+        """Строка состояния; скорость - с момента предыдущей строки"""
+        now = time.perf_counter()
+        executed = interpreter.instructions_executed
+        elapsed = now - self._last_time
+        rate = (executed - self._last_count) / elapsed if elapsed > 0 else 0.0
+        self._last_time = now
+        self._last_count = executed
+
+        line = (f"[ход] PC=0x{interpreter.pc:08X} выполнено команд: {executed:,} "
+                f"скорость: {rate:,.0f} ком/с время: {_format_duration(now - self._start_time)}")
+        if self.total:
+            remaining = max(0, self.total - executed)
+            eta = _format_duration(remaining / rate) if rate > 0 else '?'
+            line += f" ({100.0 * min(executed, self.total) / self.total:.1f}% из {self.total:,}, осталось ~{eta})"
+        return line
@@ -5,11 +5,18 @@
 """
 
 import os
+import shutil
+import argparse
 import subprocess
 import tempfile
 import json
 from pathlib import Path
 
+from assembler import build_image
+from bundle import write_bundle
+from job_client import JobClient, run_program
+from timeline import Timeline, merge, phase
+
 
 def run_alu_tests():
     """Запуск тестов этапа 4"""
@@ -31,8 +38,145 @@ def run_alu_tests():
     return result.returncode == 0
 
 
+class TraceFiles:
+    """
+    Временные шкалы запусков (--trace-out): каждый запуск ассемблера и
+    интерпретатора пишет свой файл, и у каждого процесса своя дорожка; в
+    конце файлы объединяются timeline.merge
+    """
+
+    def __init__(self, output=None):
+        self.output = output
+        self.paths = []
+        self._directory = None
+        # Работа самого скрипта (сборка архива) - отдельная дорожка
+        self.timeline = Timeline(process_name='run_examples') if output else None
+
+    def args(self, tool, name):
+        """Аргументы --trace-out для очередного запуска tool"""
+        if self.output is None:
+            return []
+        if self._directory is None:
+            self._directory = tempfile.mkdtemp(prefix='uvm-trace-')
+        path = os.path.join(self._directory, f"{len(self.paths):03d}-{tool}-{name}.json")
+        self.paths.append(path)
+        return ['--trace-out', path]
+
+    def save(self):
+        """Объединение шкал всех запусков в файл output"""
+        if self.output is None:
+            return
+        paths = [path for path in self.paths if os.path.exists(path)]
+        if any(event['ph'] != 'M' for event in self.timeline.events):
+            own = self.args('run_examples', 'main')[1]
+            self.timeline.save(own)
+            paths.append(own)
+        merge(paths, self.output)
+        if self._directory is not None:
+            shutil.rmtree(self._directory, ignore_errors=True)
+        print(f"\nВременная шкала запусков ({len(paths)} процессов) сохранена в {self.output}")
+
+
+def assemble_example(json_path, binary_path, trace=None) -> bool:
+    """Ассемблирование примера в подпроцессе; True - двоичный файл создан"""
+    print(f"\nАссемблирование {json_path.name}...")
+    trace_args = trace.args('assembler', json_path.stem) if trace is not None else []
+    result = subprocess.run(
+        ['python', 'assembler.py', str(json_path), str(binary_path)] + trace_args,
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        print(f"✗ Ошибка ассемблирования: {result.stdout}{result.stderr}")
+        return False
+    print(f"✓ Создан {binary_path}")
+    return True
+
+
+def build_examples_bundle(bundle_path, json_paths, timeline=None):
+    """
+    Ассемблирование программ в одном процессе и запись одним архивом
+
+    Returns:
+        Имена программ, попавших в архив
+    """
+    images = []
+    for json_path in json_paths:
+        if json_path.exists():
+            try:
+                with open(json_path, 'r', encoding='utf-8') as f, \
+                        phase(timeline, 'build_image', program=json_path.stem):
+                    images.append((json_path.stem, build_image(json.load(f))))
+            except (json.JSONDecodeError, ValueError) as e:
+                print(f"✗ Ошибка ассемблирования {json_path.name}: {e}")
+    with phase(timeline, 'write_bundle'):
+        write_bundle(str(bundle_path), images)
+    print(f"\n✓ Создан архив {bundle_path} (программ: {len(images)})")
+    return {name for name, _ in images}
+
+
+def print_coverage(coverage_path, json_path):
+    """Краткий отчет о покрытии программы по всем запускам"""
+    from coverage_map import Coverage, report
+
+    try:
+        with open(json_path, 'r', encoding='utf-8') as f:
+            result = report(Coverage.load(coverage_path), json.load(f))
+    except (OSError, ValueError) as e:
+        print(f"  ✗ Покрытие {coverage_path}: {e}")
+        return
+    print(f"  Покрытие ({coverage_path}): выполнено команд {result['executed']} "
+          f"из {result['instructions']}")
+
+
+def run_on_server(address, json_paths):
+    """Выполнение программ на сервере заданий: одно соединение, без подпроцессов"""
+    try:
+        client = JobClient(address)
+    except (OSError, ValueError) as e:
+        print(f"✗ Нет соединения с сервером {address}: {e}")
+        return
+    with client:
+        for json_path in json_paths:
+            if not json_path.exists():
+                continue
+            print(f"\nВыполнение {json_path.name} на сервере...")
+            try:
+                with open(json_path, 'r', encoding='utf-8') as f:
+                    response = run_program(client, json.load(f), 0x1000, 0x1050)
+            except (json.JSONDecodeError, ValueError) as e:
+                print(f"  ✗ Ошибка: {e}")
+                continue
+            print(f"  ✓ Выполнено команд: {response['executed']}, PC=0x{response['pc']:08X}")
+            if response['fault']:
+                print(f"  ✗ Ошибка выполнения: {response['fault']}")
+            words = response['dump'][0]['words']
+            for i, word in enumerate(words[:5]):
+                print(f"    0x{0x1000 + 4 * i:08X}: 0x{word:08X}")
+
+
 def main():
     """Запуск всех примеров"""
+    parser = argparse.ArgumentParser(description='Запуск всех примеров и тестов УВМ')
+    parser.add_argument('--metrics-out', metavar='FILE',
+                        help='Накапливать метрики запусков интерпретатора в файле OpenMetrics')
+    parser.add_argument('--bundle', action='store_true',
+                        help='Собрать демонстрационные программы в архив bin/examples.uvmb '
+                             'и запускать их из архива')
+    parser.add_argument('--server', metavar='ADDRESS',
+                        help='Выполнять демонстрационные программы на сервере заданий '
+                             '(job_server.py) вместо запуска ассемблера и интерпретатора')
+    parser.add_argument('--trace-out', metavar='FILE',
+                        help='Сохранить общую временную шкалу всех запусков (Chrome trace-event JSON, '
+                             'по дорожке на процесс)')
+    parser.add_argument('--coverage', metavar='DIR',
+                        help='Накапливать покрытие демонстрационных программ в файлах DIR/ИМЯ.cov '
+                             '(карты повторных запусков объединяются; не вместе с --server)')
+    args = parser.parse_args()
+    metrics_args = ['--metrics-out', args.metrics_out] if args.metrics_out else []
+    trace = TraceFiles(args.trace_out)
+    if args.coverage:
+        os.makedirs(args.coverage, exist_ok=True)
+
     examples_dir = Path('examples')
 
     if not examples_dir.exists():
@@ -62,19 +206,7 @@ def main():
     for test_file in spec_tests:
         json_path = examples_dir / test_file
         if json_path.exists():
-            # Ассемблируем
-            binary_path = bin_dir / f"{test_file.replace('.json', '.bin')}"
-
-            print(f"\nАссемблирование {test_file}...")
-            result = subprocess.run(
-                ['python', 'assembler.py', str(json_path), str(binary_path)],
-                capture_output=True, text=True
-            )
-
-            if result.returncode == 0:
-                print(f"✓ Создан {binary_path}")
-            else:
-                print(f"✗ Ошибка: {result.stderr}")
+            assemble_example(json_path, bin_dir / f"{test_file.replace('.json', '.bin')}", trace)
 
     # 3. Запускаем демонстрационные программы этапа 4
     print("\n" + "=" * 80)
@@ -83,40 +215,58 @@ def main():
 
     alu_tests = ['unary_minus_test.json', 'alu_test.json', 'alu_demo.json']
 
+    bundle_path = None
+    if args.bundle:
+        # Все программы ассемблируются в одном процессе и записываются одним файлом
+        bundle_path = bin_dir / 'examples.uvmb'
+        bundled = build_examples_bundle(bundle_path, [examples_dir / test_file for test_file in alu_tests],
+                                        trace.timeline)
+
+    if args.server:
+        run_on_server(args.server, [examples_dir / test_file for test_file in alu_tests])
+        alu_tests = []
+
     for test_file in alu_tests:
         json_path = examples_dir / test_file
         if json_path.exists():
             binary_path = bin_dir / f"{test_file.replace('.json', '.bin')}"
             dump_path = bin_dir / f"{test_file.replace('.json', '.csv')}"
 
-            print(f"\nАссемблирование {test_file}...")
+            if bundle_path is not None:
+                # Программа, не попавшая в архив, не запускается
+                if json_path.stem not in bundled:
+                    print(f"\n✗ {test_file} пропущен: нет в архиве")
+                    continue
+                binary_path = f"{bundle_path}#{json_path.stem}"
+            elif not assemble_example(json_path, binary_path, trace):
+                continue
+
+            # Карта покрытия - своя у каждой программы (хеш программы в файле)
+            coverage_path = os.path.join(args.coverage, f"{json_path.stem}.cov") if args.coverage else None
+            coverage_args = ['--coverage', coverage_path] if coverage_path else []
+
+            # Запускаем интерпретатор
+            print(f"  Выполнение...")
             result = subprocess.run(
-                ['python', 'assembler.py', str(json_path), str(binary_path)],
+                ['python', 'interpreter.py', str(binary_path), str(dump_path),
+                 '--start', '0x1000', '--end', '0x1050'] + metrics_args + coverage_args
+                + trace.args('interpreter', json_path.stem),
                 capture_output=True, text=True
             )
 
             if result.returncode == 0:
-                print(f"✓ Создан {binary_path}")
-
-                # Запускаем интерпретатор
-                print(f"  Выполнение...")
-                result = subprocess.run(
-                    ['python', 'interpreter.py', str(binary_path), str(dump_path),
-                     '--start', '0x1000', '--end', '0x1050'],
-                    capture_output=True, text=True
-                )
-
-                if result.returncode == 0:
-                    print(f"  ✓ Создан дамп {dump_path}")
-                    # Показываем краткий вывод
-                    lines = result.stdout.split('\n')
-                    for line in lines[:5]:
-                        if line:
-                            print(f"    {line}")
-                else:
-                    print(f"  ✗ Ошибка выполнения: {result.stderr}")
+                print(f"  ✓ Создан дамп {dump_path}")
+                # Показываем краткий вывод
+                lines = result.stdout.split('\n')
+                for line in lines[:5]:
+                    if line:
+                        print(f"    {line}")
+                if coverage_path:
+                    print_coverage(coverage_path, json_path)
             else:
-                print(f"✗ Ошибка ассемблирования: {result.stderr}")
+                print(f"  ✗ Ошибка выполнения: {result.stderr}")
+
+    trace.save()
 
     print("\n" + "=" * 80)
     print("ВСЕ ТЕСТЫ ВЫПОЛНЕНЫ")
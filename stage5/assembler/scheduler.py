@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Кооперативный планировщик нескольких машин УВМ в одном процессе
+
+Планировщик владеет набором UVMInterpreter и по очереди выполняет каждую
+машину квантами по quantum команд (UVMInterpreter.run(steps)): квоты и
+очередность проверяются между квантами, а не на каждой команде.
+
+Порядок выполнения:
+- 'round_robin' - машины по кругу;
+- 'priority' - всегда машина с наибольшим приоритетом, машины с равным
+  приоритетом - по кругу.
+
+Квоты машины: количество команд (instruction_quota) и занимаемая память
+(memory_quota, байт; для PagedMemory учитываются только собственные
+страницы). Машина, превысившая квоту, снимается с выполнения с ошибкой в
+результате; состояние интерпретатора при этом не изменяется.
+
+Между квантами планировщик отдает управление циклу asyncio, поэтому
+другие сопрограммы продолжают работать, а вызывающий код ожидает
+завершения машины через await:
+
+    scheduler = Scheduler(quantum=10000)
+    task = scheduler.submit(interpreter, instruction_quota=10**6)
+    result = await task
+"""
+
+import heapq
+import asyncio
+import argparse
+from collections import deque
+from itertools import count
+from typing import Dict, List, Optional
+
+from interpreter import UVMInterpreter, STEPS_DONE
+from paged_memory import PagedMemory
+from uvm_api import RunResult
+
+# Команд в кванте по умолчанию
+DEFAULT_QUANTUM = 10000
+
+POLICIES = ('round_robin', 'priority')
+
+
+def memory_usage(interpreter) -> int:
+    """Память, занимаемая машиной: для PagedMemory - собственные страницы"""
+    memory = interpreter.memory
+    if isinstance(memory, PagedMemory):
+        return memory.stats()['private'] * memory.page_size
+    return len(memory)
+
+
+class VMTask:
+    """Машина под управлением планировщика"""
+
+    def __init__(self, interpreter, name: str, priority: int,
+                 instruction_quota: Optional[int], memory_quota: Optional[int]):
+        self.interpreter = interpreter
+        self.name = name
+        self.priority = priority
+        self.instruction_quota = instruction_quota
+        self.memory_quota = memory_quota
+        self.slices = 0
+        self.future = asyncio.get_running_loop().create_future()
+
+    @property
+    def done(self) -> bool:
+        return self.future.done()
+
+    def __await__(self):
+        return self.future.__await__()
+
+    def __repr__(self) -> str:
+        return f"VMTask({self.name}, выполнено команд: {self.interpreter.instructions_executed})"
+
+
+class Scheduler:
+    """Планировщик машин УВМ с квантованием времени"""
+
+    def __init__(self, quantum: int = DEFAULT_QUANTUM, policy: str = 'round_robin'):
+        """
+        Args:
+            quantum: команд в кванте
+            policy: 'round_robin' или 'priority'
+        """
+        if quantum < 1:
+            raise ValueError(f"Квант должен быть положительным: {quantum}")
+        if policy not in POLICIES:
+            raise ValueError(f"Неизвестный порядок выполнения: {policy} (допустимые: {', '.join(POLICIES)})")
+        self.quantum = quantum
+        self.policy = policy
+        self.slices = 0
+        self.tasks: List[VMTask] = []
+
+        self._queue = deque()
+        self._heap = []
+        self._order = count()
+        self._runner = None
+
+    def submit(self, interpreter, priority: int = 0, instruction_quota: Optional[int] = None,
+               memory_quota: Optional[int] = None, name: Optional[str] = None) -> VMTask:
+        """
+        Добавление машины с загруженной программой (вызывается из цикла asyncio)
+
+        Квота команд заменяет ограничение max_instructions интерпретатора,
+        если оно меньше квоты.
+
+        Память без страниц (bytearray, mmap) занята целиком, поэтому квота
+        памяти меньше ее размера отклоняется сразу.
+
+        Returns:
+            Задача; await задачи возвращает RunResult
+
+        Raises:
+            ValueError: квота памяти меньше размера памяти без страниц
+        """
+        memory = interpreter.memory
+        if memory_quota is not None and not isinstance(memory, PagedMemory) and len(memory) > memory_quota:
+            raise ValueError(f"Квота памяти ({memory_quota} байт) меньше размера памяти "
+                             f"машины ({len(memory)} байт)")
+        if instruction_quota is not None:
+            interpreter.max_instructions = max(interpreter.max_instructions, instruction_quota)
+        task = VMTask(interpreter, name or f"vm{len(self.tasks)}", priority, instruction_quota, memory_quota)
+        self.tasks.append(task)
+        self._push(task)
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.ensure_future(self.run())
+        return task
+
+    def _push(self, task: VMTask) -> None:
+        if self.policy == 'priority':
+            heapq.heappush(self._heap, (-task.priority, next(self._order), task))
+        else:
+            self._queue.append(task)
+
+    def _pop(self) -> Optional[VMTask]:
+        if self.policy == 'priority':
+            return heapq.heappop(self._heap)[2] if self._heap else None
+        return self._queue.popleft() if self._queue else None
+
+    def _finish(self, task: VMTask, error: Optional[str] = None) -> None:
+        interpreter = task.interpreter
+        task.future.set_result(RunResult(interpreter.instructions_executed, interpreter.halted,
+                                         error or interpreter.error, interpreter.stop_reason))
+
+    def _run_slice(self, task: VMTask) -> bool:
+        """Один квант машины; True - машина продолжает выполнение"""
+        interpreter = task.interpreter
+        steps = self.quantum
+        if task.instruction_quota is not None:
+            remaining = task.instruction_quota - interpreter.instructions_executed
+            if remaining <= 0:
+                self._finish(task, f"превышена квота команд ({task.instruction_quota})")
+                return False
+            steps = min(steps, remaining)
+
+        try:
+            interpreter.run(steps)
+        except Exception as e:
+            task.future.set_exception(e)
+            return False
+        task.slices += 1
+        self.slices += 1
+
+        if task.memory_quota is not None and memory_usage(interpreter) > task.memory_quota:
+            self._finish(task, f"превышена квота памяти ({task.memory_quota} байт)")
+            return False
+        # Остановка запрошена обработчиком (точка наблюдения), в том числе
+        # на последней команде кванта; конец кванта - не остановка
+        stopped = interpreter.stop_reason not in (None, STEPS_DONE)
+        if interpreter.halted or stopped:
+            self._finish(task)
+            return False
+        return True
+
+    async def run(self) -> None:
+        """Выполнение машин, пока есть незавершенные; между квантами - await"""
+        while True:
+            task = self._pop()
+            if task is None:
+                return
+            if task.future.cancelled():
+                continue
+            if self._run_slice(task):
+                self._push(task)
+            await asyncio.sleep(0)
+
+    def stats(self) -> Dict[str, int]:
+        """Квантов всего, машин всего и завершенных"""
+        return {'slices': self.slices, 'tasks': len(self.tasks),
+                'finished': sum(1 for task in self.tasks if task.done)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Совместное выполнение программ УВМ')
+    parser.add_argument('programs', nargs='+', help='Программы: двоичные файлы или АРХИВ.uvmb#ИМЯ')
+    parser.add_argument('--quantum', type=int, default=DEFAULT_QUANTUM,
+                        help=f'Команд в кванте (по умолчанию: {DEFAULT_QUANTUM})')
+    parser.add_argument('--policy', choices=POLICIES, default='round_robin',
+                        help='Порядок выполнения (по умолчанию: round_robin)')
+    parser.add_argument('--memory-size', type=int, default=1024 * 1024,
+                        help='Размер памяти каждой машины в байтах (по умолчанию: 1MB)')
+    parser.add_argument('--instruction-quota', type=int, help='Квота команд каждой машины')
+    args = parser.parse_args()
+
+    async def run_all():
+        scheduler = Scheduler(args.quantum, args.policy)
+        tasks = []
+        for path in args.programs:
+            interpreter = UVMInterpreter(memory_size=args.memory_size, verbose=False)
+            interpreter.load_program(path)
+            tasks.append(scheduler.submit(interpreter, instruction_quota=args.instruction_quota, name=path))
+        for task in tasks:
+            result = await task
+            status = f"ошибка: {result.error}" if result.error else "завершена"
+            print(f"{task.name}: выполнено команд {result.executed}, квантов {task.slices}, {status}")
+        print(f"Всего квантов: {scheduler.slices}")
+
+    asyncio.run(run_all())
+
+
+if __name__ == "__main__":
+    main()
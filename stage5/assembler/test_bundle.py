@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Тесты архива программ УВМ
+"""
+
+import os
+import tempfile
+import unittest
+
+from interpreter import UVMInterpreter
+from bundle import Bundle, write_bundle, split_bundle_path, read_program, build_from_directory
+from encoder import encode_program
+from parser import parse_program
+
+
+def program(value: int) -> bytes:
+    return encode_program(parse_program({"instructions": [
+        {"opcode": 72, "field_b": 1, "field_c": value}]}))
+
+
+class TestBundle(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'programs.uvmb')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_roundtrip(self):
+        images = [(f"prog{i}", program(i)) for i in range(100)]
+        self.assertEqual(write_bundle(self.path, images), 100)
+        with Bundle(self.path) as bundle:
+            self.assertEqual(len(bundle), 100)
+            self.assertEqual(list(bundle), [name for name, _ in images])
+            for name, image in images:
+                with bundle.get(name) as view:
+                    self.assertEqual(bytes(view), image)
+            self.assertNotIn('missing', bundle)
+            with self.assertRaises(KeyError):
+                bundle.get('missing')
+
+    def test_empty_bundle(self):
+        write_bundle(self.path, [])
+        with Bundle(self.path) as bundle:
+            self.assertEqual(len(bundle), 0)
+            self.assertIsNone(bundle.find('any'))
+
+    def test_invalid_names(self):
+        for images in ([('a#b', b'')], [('', b'')], [('a', b''), ('a', b'')]):
+            with self.subTest(images=images):
+                with self.assertRaises(ValueError):
+                    write_bundle(self.path, images)
+
+    def test_corrupted_image(self):
+        write_bundle(self.path, [('prog', program(5))])
+        with open(self.path, 'r+b') as f:
+            f.seek(-8, os.SEEK_END)
+            f.write(b'\xFF')
+        with Bundle(self.path) as bundle, self.assertRaises(ValueError):
+            bundle.get('prog')
+
+    def test_split_bundle_path(self):
+        self.assertEqual(split_bundle_path('bin/all.uvmb#prog'), ('bin/all.uvmb', 'prog'))
+        self.assertIsNone(split_bundle_path('bin/prog.bin'))
+        self.assertIsNone(split_bundle_path('bin/dir#1/prog.bin'))
+
+    def test_interpreter_loads_from_bundle(self):
+        write_bundle(self.path, [('first', program(11)), ('second', program(22))])
+        self.assertEqual(read_program(f"{self.path}#second"), program(22))
+
+        interpreter = UVMInterpreter(memory_size=0x1000, verbose=False)
+        interpreter.load_program(f"{self.path}#second")
+        interpreter.run()
+        self.assertEqual(interpreter.registers[1], 22)
+
+    def test_build_from_directory(self):
+        source = os.path.join(self.tmp.name, 'sources')
+        os.mkdir(source)
+        with open(os.path.join(source, 'load.json'), 'w', encoding='utf-8') as f:
+            f.write('{"instructions": [{"opcode": 72, "field_b": 1, "field_c": 7}]}')
+        self.assertEqual(build_from_directory(source), [('load', program(7))])
+
+
+if __name__ == '__main__':
+    unittest.main()
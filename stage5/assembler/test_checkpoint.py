@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Тесты сохранения и восстановления состояния УВМ
+"""
+
+import os
+import tempfile
+import unittest
+
+from parser import parse_program
+from encoder import encode_program
+from interpreter import UVMInterpreter
+from checkpoint import PAGE_SIZE
+
+
+PROGRAM = {"instructions": [
+    {"opcode": 72, "field_b": 10, "field_c": 0x3000},
+    {"opcode": 72, "field_b": 1, "field_c": 5},
+    {"opcode": 8, "field_b": 1, "field_c": 10},
+    {"opcode": 113, "field_b": 2, "field_c": 10},
+    {"opcode": 91, "field_b": 8, "field_c": 10, "field_d": 2},
+    {"opcode": 72, "field_b": 3, "field_c": 7},
+]}
+
+
+def make_interpreter(memory_size=0x10000):
+    interpreter = UVMInterpreter(memory_size=memory_size, verbose=False)
+    binary = encode_program(parse_program(PROGRAM))
+    interpreter.memory[:len(binary)] = binary
+    interpreter.program_size = len(binary)
+    return interpreter
+
+
+class TestCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'state.uvms')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_resume_matches_uninterrupted_run(self):
+        reference = make_interpreter()
+        reference.run()
+
+        first = make_interpreter()
+        first.run(3)
+        first.save_checkpoint(self.path)
+
+        second = make_interpreter()
+        second.memory[0x8000] = 0xAA  # мусор должен быть обнулен
+        second.load_checkpoint(self.path)
+        self.assertEqual(second.pc, first.pc)
+        self.assertEqual(second.instructions_executed, 3)
+        second.run()
+
+        self.assertEqual(second.registers, reference.registers)
+        self.assertEqual(second.memory, reference.memory)
+        self.assertEqual(second.instructions_executed, reference.instructions_executed)
+        self.assertTrue(second.halted)
+
+    def test_only_nonzero_pages(self):
+        interpreter = make_interpreter()
+        interpreter.run()
+        interpreter.save_checkpoint(self.path)
+        # Две ненулевые страницы (код и 0x3000) сжимаются почти до нуля
+        self.assertLess(os.path.getsize(self.path), 2 * PAGE_SIZE // 4)
+
+    def test_other_memory_size(self):
+        make_interpreter().save_checkpoint(self.path)
+        with self.assertRaises(ValueError):
+            make_interpreter(memory_size=0x20000).load_checkpoint(self.path)
+
+    def test_not_a_checkpoint(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'\x00' * 1024)
+        with self.assertRaises(ValueError):
+            make_interpreter().load_checkpoint(self.path)
+
+    def test_corrupted_page_leaves_state_unchanged(self):
+        interpreter = make_interpreter()
+        interpreter.run()
+        interpreter.save_checkpoint(self.path)
+        with open(self.path, 'r+b') as f:
+            f.seek(-1, os.SEEK_END)
+            last = f.read(1)
+            f.seek(-1, os.SEEK_END)
+            f.write(bytes([last[0] ^ 0xFF]))
+
+        target = make_interpreter()
+        memory = bytes(target.memory)
+        with self.assertRaises(ValueError):
+            target.load_checkpoint(self.path)
+        self.assertEqual(bytes(target.memory), memory)
+        self.assertEqual((target.pc, target.instructions_executed), (0, 0))
+
+    def test_save_replaces_file_atomically(self):
+        make_interpreter().save_checkpoint(self.path)
+        make_interpreter().save_checkpoint(self.path)
+        self.assertEqual(os.listdir(self.tmp.name), ['state.uvms'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Тесты покрытия выполнения
+"""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from parser import parse_program
+from encoder import encode_program
+from interpreter import UVMInterpreter
+from assembler import build_image
+from coverage_map import Coverage, report
+
+
+PROGRAM = {"instructions": [
+    {"opcode": 72, "field_b": 10, "field_c": 0x100},          # #0 PC 0
+    {"opcode": 72, "field_b": 1, "field_c": 5},               # #1 PC 6
+    {"opcode": 8, "field_b": 1, "field_c": 10},               # #2 PC 12
+    {"opcode": 113, "field_b": 2, "field_c": 10},             # #3 PC 15
+    {"opcode": 91, "field_b": 8, "field_c": 10, "field_d": 2},  # #4 PC 18
+]}
+
+
+class TestCoverage(unittest.TestCase):
+
+    def setUp(self):
+        self.interpreter = UVMInterpreter(memory_size=4096, verbose=False)
+        binary = encode_program(parse_program(PROGRAM))
+        self.interpreter.memory[:len(binary)] = binary
+        self.interpreter.program_size = len(binary)
+        self.coverage = Coverage.for_interpreter(self.interpreter)
+        self.interpreter.add_hook(self.coverage)
+
+    def test_dedicated_loop(self):
+        """Единственный обработчик-покрытие не использует общий цикл"""
+        with patch.object(UVMInterpreter, '_run_instrumented') as instrumented:
+            self.interpreter.run()
+        instrumented.assert_not_called()
+        self.assertEqual([pc for pc, flag in enumerate(self.coverage.code) if flag],
+                         [0, 6, 12, 15, 18])
+        self.assertEqual([i for i, flag in enumerate(self.coverage.data) if flag],
+                         [0x100 // 4, 0x108 // 4])
+
+    def test_same_as_hook_methods(self):
+        """Цикл покрытия и методы-обработчики дают одинаковые карты"""
+        self.interpreter.run()
+
+        other = UVMInterpreter(memory_size=4096, verbose=False)
+        other.memory[:] = encode_program(parse_program(PROGRAM)).ljust(4096, b'\x00')
+        other.program_size = self.interpreter.program_size
+        coverage = Coverage.for_interpreter(other)
+        other.add_hook(coverage)
+        other.add_hook(object())  # второй обработчик - общий цикл
+        other.run()
+        self.assertEqual(coverage.code, self.coverage.code)
+        self.assertEqual(coverage.data, self.coverage.data)
+
+    def test_report_and_merge(self):
+        self.interpreter.run(2)
+        result = report(self.coverage, PROGRAM)
+        self.assertEqual(result['executed'], 2)
+        self.assertEqual(result['not_executed'], [[2, 4]])
+
+        second = Coverage.for_interpreter(self.interpreter)
+        second.code[15] = 1
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'run.cov')
+            self.coverage.save_merged(path)
+            second.save_merged(path)
+            merged = Coverage.load(path)
+        result = report(merged, PROGRAM)
+        self.assertEqual(result['executed'], 3)
+        self.assertEqual(result['not_executed'], [[2, 2], [4, 4]])
+
+    def test_merge_other_program(self):
+        other = Coverage(len(self.coverage.code), 4096, b'\x01' * 8)
+        with self.assertRaises(ValueError):
+            self.coverage.merge(other)
+
+    def test_report_other_program(self):
+        """Отчет по JSON другой программы отклоняется"""
+        self.interpreter.run()
+        changed = {"instructions": PROGRAM["instructions"][:-1]}
+        with self.assertRaises(ValueError):
+            report(self.coverage, changed)
+
+    def test_report_program_with_data(self):
+        """Программа с блоками данных - объектный файл; хешируется только код"""
+        program = dict(PROGRAM, data=[{"address": 0x200, "words": [1, 2]}])
+        interpreter = UVMInterpreter(memory_size=4096, verbose=False)
+        interpreter.load_image(build_image(program))
+        coverage = Coverage.for_interpreter(interpreter)
+        interpreter.add_hook(coverage)
+        interpreter.run()
+        self.assertEqual(report(coverage, program)['executed'], 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Тесты отладчика УВМ
+"""
+
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest.mock import patch
+
+from parser import parse_program
+from encoder import encode_program
+from interpreter import UVMInterpreter
+from debugger import Debugger, DebuggerShell
+
+
+PROGRAM = [
+    {"opcode": 72, "field_b": 10, "field_c": 0x100},          # #0 PC 0
+    {"opcode": 72, "field_b": 1, "field_c": 5},               # #1 PC 6
+    {"opcode": 8, "field_b": 1, "field_c": 10},               # #2 PC 12
+    {"opcode": 113, "field_b": 2, "field_c": 10},             # #3 PC 15
+    {"opcode": 91, "field_b": 0, "field_c": 10, "field_d": 2},  # #4 PC 18
+    {"opcode": 72, "field_b": 3, "field_c": 7},               # #5 PC 22
+]
+
+
+class TestDebugger(unittest.TestCase):
+
+    def setUp(self):
+        self.interpreter = UVMInterpreter(memory_size=4096, verbose=False)
+        binary = encode_program(parse_program({"instructions": PROGRAM}))
+        self.interpreter.memory[:len(binary)] = binary
+        self.interpreter.program_size = len(binary)
+        self.debugger = Debugger(self.interpreter)
+
+    def test_offsets(self):
+        self.assertEqual(self.debugger.offsets, [0, 6, 12, 15, 18, 22])
+        self.assertEqual(self.debugger.index_to_pc(3), 15)
+        self.assertIsNone(self.debugger.pc_to_index(7))
+
+    def test_step(self):
+        self.debugger.step(2)
+        self.assertEqual(self.interpreter.pc, 12)
+        self.assertEqual(self.interpreter.registers[1], 5)
+        self.debugger.step()
+        self.assertEqual(self.interpreter.pc, 15)
+
+    def test_breakpoints_use_fast_loop(self):
+        """Выполнение до точки останова идет без инструментирования"""
+        self.debugger.add_breakpoint(self.debugger.index_to_pc(2))
+        self.debugger.add_breakpoint(18)
+        with patch.object(UVMInterpreter, '_run_instrumented') as instrumented:
+            self.debugger.cont()
+            self.assertEqual(self.interpreter.pc, 12)
+            self.debugger.cont()
+            self.assertEqual(self.interpreter.pc, 18)
+        instrumented.assert_not_called()
+
+        self.debugger.cont()
+        self.assertTrue(self.interpreter.halted)
+        self.assertEqual(self.interpreter.instructions_executed, 6)
+
+    def test_invalid_breakpoint(self):
+        with self.assertRaises(ValueError):
+            self.debugger.add_breakpoint(7)
+
+    def test_run_until_pc(self):
+        self.debugger.run_until_pc(15)
+        self.assertEqual(self.interpreter.pc, 15)
+        with self.assertRaises(ValueError):
+            self.debugger.run_until_pc(6)
+
+    def test_run_until_change(self):
+        """Остановка после команды, изменившей слово памяти"""
+        self.debugger.run_until_change(0x100)
+        self.assertEqual(self.interpreter.pc, 15)
+        self.assertEqual(self.debugger.read_word(0x100), 5)
+
+        self.debugger.run_until_change(0x100)
+        self.assertEqual(self.interpreter.pc, 22)
+        self.assertEqual(self.debugger.read_word(0x100), (-5) & 0xFFFFFFFF)
+        self.assertEqual(self.interpreter.hooks, [])
+
+    def test_shell_reports_bad_arguments(self):
+        """Ошибка в аргументах команды не завершает сеанс"""
+        script = StringIO("x\nreg 200\nreg -1\nstep\n")
+        output = StringIO()
+        with redirect_stdout(output):
+            DebuggerShell(self.debugger, stdin=script).cmdloop()
+        self.assertEqual(output.getvalue().count("Ошибка:"), 3)
+        self.assertEqual(self.interpreter.pc, 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
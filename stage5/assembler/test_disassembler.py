@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Тесты дизассемблера УВМ
+"""
+
+import io
+import json
+import unittest
+from pathlib import Path
+
+from parser import parse_program
+from encoder import encode_program
+from disassembler import iter_decode, write_json, write_listing
+
+
+def load_example(name):
+    with open(Path(__file__).parent / 'examples' / name, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class TestDisassembler(unittest.TestCase):
+
+    def roundtrip(self, program_json, chunk_size):
+        instructions = parse_program(program_json)
+        binary = encode_program(instructions)
+        out = io.StringIO()
+        count = write_json(io.BytesIO(binary), out, 'roundtrip', chunk_size)
+        self.assertEqual(count, len(instructions))
+        return instructions, parse_program(json.loads(out.getvalue()))
+
+    def test_json_roundtrip_examples(self):
+        """JSON-вывод дизассемблера снова разбирается в те же команды"""
+        for name in ['simple_vector_unary.json', 'indexed_calculation.json']:
+            with self.subTest(example=name):
+                original, restored = self.roundtrip(load_example(name), 1 << 20)
+                self.assertEqual(original, restored)
+
+    def test_chunk_boundaries(self):
+        """Команды, разрезанные границей блока, декодируются правильно"""
+        program = load_example('vector_unary_minus.json')
+        for chunk_size in (1, 2, 5, 7):
+            with self.subTest(chunk_size=chunk_size):
+                original, restored = self.roundtrip(program, chunk_size)
+                self.assertEqual(original, restored)
+
+    def test_listing(self):
+        """Листинг содержит смещение, байты и мнемонику"""
+        binary = bytes([0xC8, 0x03, 0x6E, 0x00, 0x00, 0x00, 0x5B, 0x28, 0x55, 0x03])
+        out = io.StringIO()
+        self.assertEqual(write_listing(io.BytesIO(binary), out), 2)
+        lines = out.getvalue().splitlines()
+        self.assertTrue(lines[0].startswith('0x00000000: C8 03 6E 00 00 00'))
+        self.assertIn('load  B=7, C=440', lines[0])
+        self.assertIn('neg   B=16, C=41, D=53', lines[1])
+        self.assertTrue(lines[1].startswith('0x00000006:'))
+
+    def test_unknown_opcode(self):
+        """Неизвестный код операции - ошибка с указанием смещения"""
+        with self.assertRaisesRegex(ValueError, '0x00000003'):
+            list(iter_decode(io.BytesIO(bytes([0x71, 0x73, 0x13, 0x00]))))
+
+    def test_truncated_instruction(self):
+        """Обрезанная последняя команда - ошибка"""
+        with self.assertRaises(ValueError):
+            list(iter_decode(io.BytesIO(bytes([0xC8, 0x03, 0x6E]))))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Тесты бортового самописца
+"""
+
+import io
+import unittest
+
+from parser import parse_program
+from encoder import encode_program
+from interpreter import UVMInterpreter
+from flight_recorder import FlightRecorder
+
+
+PROGRAM = {"instructions": [
+    {"opcode": 72, "field_b": 10, "field_c": 0x100},
+    {"opcode": 72, "field_b": 1, "field_c": 5},
+    {"opcode": 8, "field_b": 1, "field_c": 10},
+    {"opcode": 91, "field_b": 8, "field_c": 10, "field_d": 1},
+    {"opcode": 72, "field_b": 10, "field_c": 0xFFFF000},
+    {"opcode": 113, "field_b": 2, "field_c": 10},
+    {"opcode": 72, "field_b": 3, "field_c": 1},
+]}
+
+
+class TestFlightRecorder(unittest.TestCase):
+
+    def setUp(self):
+        self.interpreter = UVMInterpreter(memory_size=4096, verbose=False)
+        binary = encode_program(parse_program(PROGRAM))
+        self.interpreter.memory[:len(binary)] = binary
+        self.interpreter.program_size = len(binary)
+        self.stream = io.StringIO()
+        self.recorder = FlightRecorder(self.interpreter, size=3, stream=self.stream)
+        self.interpreter.add_hook(self.recorder)
+
+    def test_ring_buffer(self):
+        self.interpreter.run(4)
+        self.assertEqual(self.recorder.count, 4)
+        self.assertEqual(self.recorder.records(), [
+            (6, 72, 1, 5, None, None),
+            (12, 8, 1, 10, None, 0x100),
+            (15, 91, 8, 10, 1, 0x108),
+        ])
+
+    def test_dump_on_fault(self):
+        """При ошибке выводятся последние команды, последняя - ошибочная"""
+        self.interpreter.run()
+        self.assertIsNotNone(self.interpreter.error)
+        self.assertEqual(self.recorder.count, 6)
+        lines = self.stream.getvalue().splitlines()
+        self.assertIn("3 из 6", lines[0])
+        self.assertEqual(len(lines), 4)
+        self.assertIn("read", lines[-1])
+        self.assertIn("адрес=0x0FFFF000", lines[-1])
+
+    def test_no_dump_without_fault(self):
+        self.interpreter.run(2)
+        self.assertEqual(self.stream.getvalue(), "")
+
+
+if __name__ == '__main__':
+    unittest.main()
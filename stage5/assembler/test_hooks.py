@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Тесты обработчиков инструментирования интерпретатора УВМ
+"""
+
+import unittest
+from unittest.mock import patch
+
+from parser import parse_program
+from encoder import encode_program
+from interpreter import UVMInterpreter
+
+
+PROGRAM = [
+    {"opcode": 72, "field_b": 10, "field_c": 0x100},
+    {"opcode": 72, "field_b": 1, "field_c": 5},
+    {"opcode": 8, "field_b": 1, "field_c": 10},
+    {"opcode": 113, "field_b": 2, "field_c": 10},
+    {"opcode": 91, "field_b": 0, "field_c": 10, "field_d": 2},
+]
+
+
+class RecordingHook:
+    """Запоминает все вызовы и значение в памяти в момент записи"""
+
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+        self.events = []
+
+    def on_instruction(self, pc, opcode, field_b, field_c, field_d):
+        self.events.append(('instruction', pc, opcode))
+
+    def on_read(self, pc, address, value):
+        self.events.append(('read', pc, address, value))
+
+    def on_write(self, pc, address, value):
+        old = int.from_bytes(self.interpreter.memory[address:address + 4], 'little')
+        self.events.append(('write', pc, address, value, old))
+
+
+class WriteOnlyHook:
+    def __init__(self):
+        self.writes = 0
+
+    def on_write(self, pc, address, value):
+        self.writes += 1
+
+
+class TestHooks(unittest.TestCase):
+
+    def setUp(self):
+        self.interpreter = UVMInterpreter(memory_size=4096)
+        binary = encode_program(parse_program({"instructions": PROGRAM}))
+        self.interpreter.memory[:len(binary)] = binary
+
+    def test_no_hooks_uses_fast_loop(self):
+        """Без обработчиков инструментированный цикл не используется"""
+        with patch.object(UVMInterpreter, '_run_instrumented') as instrumented:
+            self.interpreter.run()
+        instrumented.assert_not_called()
+        self.assertEqual(self.interpreter.instructions_executed, 5)
+
+    def test_removed_hook_restores_fast_loop(self):
+        hook = WriteOnlyHook()
+        self.interpreter.add_hook(hook)
+        self.interpreter.remove_hook(hook)
+        with patch.object(UVMInterpreter, '_run_instrumented') as instrumented:
+            self.interpreter.run()
+        instrumented.assert_not_called()
+
+    def test_events(self):
+        """Обработчики получают команды и обращения к памяти до выполнения"""
+        hook = RecordingHook(self.interpreter)
+        self.interpreter.add_hook(hook)
+        self.interpreter.run()
+
+        self.assertEqual(hook.events, [
+            ('instruction', 0, 72),
+            ('instruction', 6, 72),
+            ('instruction', 12, 8),
+            ('write', 12, 0x100, 5, 0),
+            ('instruction', 15, 113),
+            ('read', 15, 0x100, 5),
+            ('instruction', 18, 91),
+            ('write', 18, 0x100, (-5) & 0xFFFFFFFF, 5),
+        ])
+
+    def test_partial_hook(self):
+        """Обработчик может реализовать только часть методов"""
+        hook = WriteOnlyHook()
+        self.interpreter.add_hook(hook)
+        self.interpreter.run()
+        self.assertEqual(hook.writes, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Тесты инкрементального ассемблирования
+"""
+
+import os
+import unittest
+import tempfile
+
+from parser import parse_program
+from encoder import encode_program
+from incremental import assemble_incremental
+
+
+def make_program(values):
+    """Программа: загрузка констант и запись каждой в память"""
+    instructions = [{"opcode": 72, "field_b": 10, "field_c": 0x1000}]
+    for value in values:
+        instructions.append({"opcode": 72, "field_b": 1, "field_c": value})
+        instructions.append({"opcode": 8, "field_b": 1, "field_c": 10})
+    return parse_program({"instructions": instructions})
+
+
+class TestIncrementalAssembly(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.tmpdir.name, 'output.bin')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def assertBinaryMatches(self, instructions):
+        """Результат совпадает с полной сборкой"""
+        with open(self.output, 'rb') as f:
+            self.assertEqual(f.read(), bytes(encode_program(instructions)))
+
+    def test_first_build_is_full(self):
+        """Без индекса выполняется полная сборка"""
+        instructions = make_program([1, 2, 3])
+        result = assemble_incremental(instructions, self.output)
+
+        self.assertEqual(result.mode, 'full')
+        self.assertEqual(result.reencoded, len(instructions))
+        self.assertTrue(os.path.exists(self.output + '.idx'))
+        self.assertBinaryMatches(instructions)
+
+    def test_unchanged(self):
+        """Повторная сборка без изменений ничего не пишет"""
+        assemble_incremental(make_program([1, 2, 3]), self.output)
+        result = assemble_incremental(make_program([1, 2, 3]), self.output)
+
+        self.assertEqual(result.mode, 'unchanged')
+        self.assertEqual(result.bytes_written, 0)
+
+    def test_patch_in_place(self):
+        """Изменение константы переписывает только одну команду"""
+        assemble_incremental(make_program([1, 2, 3]), self.output)
+        instructions = make_program([1, 20, 3])
+        result = assemble_incremental(instructions, self.output)
+
+        self.assertEqual(result.mode, 'patch')
+        self.assertEqual(result.reencoded, 1)
+        self.assertEqual(result.bytes_written, 6)
+        self.assertBinaryMatches(instructions)
+
+    def test_tail_rewrite_on_insert(self):
+        """Вставка команд переписывает файл с места изменения"""
+        assemble_incremental(make_program([1, 2, 3]), self.output)
+        instructions = make_program([1, 5, 2, 3])
+        result = assemble_incremental(instructions, self.output)
+
+        self.assertEqual(result.mode, 'tail')
+        self.assertEqual(result.reencoded, 2)
+        self.assertBinaryMatches(instructions)
+
+    def test_tail_rewrite_on_delete(self):
+        """Удаление команд укорачивает файл"""
+        assemble_incremental(make_program([1, 2, 3]), self.output)
+        instructions = make_program([1, 3])
+        result = assemble_incremental(instructions, self.output)
+
+        self.assertEqual(result.mode, 'tail')
+        self.assertEqual(result.size, os.path.getsize(self.output))
+        self.assertBinaryMatches(instructions)
+
+    def test_stale_index_triggers_full_build(self):
+        """Если двоичный файл изменен вне инкрементальной сборки, индекс игнорируется"""
+        assemble_incremental(make_program([1, 2, 3]), self.output)
+        with open(self.output, 'ab') as f:
+            f.write(b'\x00')
+
+        instructions = make_program([1, 2, 4])
+        result = assemble_incremental(instructions, self.output)
+
+        self.assertEqual(result.mode, 'full')
+        self.assertBinaryMatches(instructions)
+
+
+if __name__ == '__main__':
+    unittest.main()
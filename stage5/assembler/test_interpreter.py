@@ -32,10 +32,7 @@ class TestUVMInterpreterALU(unittest.TestCase):
 
         # Создаем программу: унарный минус значения из R5, результат по адресу R10+0
         program = bytearray([
-            0x5B,  # opcode 91
-            0x00,  # field_b = 0 (смещение)
-            0x0A,  # field_c = 10 (базовый адрес)
-            0x05  # field_d = 5 (исходное значение)
+            0x5B, 0x40, 0x51, 0x00  # opcode 91, B = 0 (смещение), C = 10 (базовый адрес), D = 5 (исходное значение)
         ])
 
         # Загружаем программу в память
@@ -66,10 +63,7 @@ class TestUVMInterpreterALU(unittest.TestCase):
 
         # Создаем программу: унарный минус значения из R3, результат по адресу R8+0
         program = bytearray([
-            0x5B,  # opcode 91
-            0x00,  # field_b = 0
-            0x08,  # field_c = 8
-            0x03  # field_d = 3
+            0x5B, 0x00, 0x31, 0x00  # opcode 91, B = 0, C = 8, D = 3
         ])
 
         self.interpreter.memory[:len(program)] = program
@@ -92,10 +86,7 @@ class TestUVMInterpreterALU(unittest.TestCase):
 
         # Создаем программу с смещением 8
         program = bytearray([
-            0x5B,  # opcode 91
-            0x08,  # field_b = 8 (смещение)
-            0x0F,  # field_c = 15
-            0x07  # field_d = 7
+            0x5B, 0xE4, 0x71, 0x00  # opcode 91, B = 8 (смещение), C = 15, D = 7
         ])
 
         self.interpreter.memory[:len(program)] = program
@@ -116,7 +107,7 @@ class TestUVMInterpreterALU(unittest.TestCase):
         self.interpreter.registers[2] = 0x400
 
         program = bytearray([
-            0x5B, 0x00, 0x02, 0x01
+            0x5B, 0x40, 0x10, 0x00
         ])
 
         self.interpreter.memory[:len(program)] = program
@@ -143,7 +134,7 @@ class TestUVMInterpreterALU(unittest.TestCase):
                 interpreter.registers[2] = 0x500
 
                 program = bytearray([
-                    0x5B, 0x00, 0x02, 0x01
+                    0x5B, 0x40, 0x10, 0x00
                 ])
 
                 interpreter.memory[:len(program)] = program
@@ -162,14 +153,14 @@ class TestUVMInterpreterALU(unittest.TestCase):
 
         # Загрузка значений в регистры
         # R1 = 100, R2 = адрес 0x600
-        program.extend([0x48, 0x01, 0x00, 0x00, 0x00, 0x64])  # R1 = 100
-        program.extend([0x48, 0x02, 0x00, 0x00, 0x06, 0x00])  # R2 = 0x600
+        program.extend([0xC8, 0x00, 0x19, 0x00, 0x00, 0x00])  # R1 = 100
+        program.extend([0x48, 0x01, 0x80, 0x01, 0x00, 0x00])  # R2 = 0x600
 
         # Унарный минус R1 -> mem[R2]
-        program.extend([0x5B, 0x00, 0x02, 0x01])  # -R1 -> [R2]
+        program.extend([0x5B, 0x40, 0x10, 0x00])  # -R1 -> [R2]
 
         # Чтение результата в R3
-        program.extend([0x71, 0x03, 0x02])  # R3 = mem[R2]
+        program.extend([0xF1, 0x81, 0x00])  # R3 = mem[R2]
 
         # Загружаем программу
         self.interpreter.memory[:len(program)] = program
@@ -201,24 +192,24 @@ class TestUVMInterpreterALU(unittest.TestCase):
         program = bytearray()
 
         # Инициализация
-        program.extend([0x48, 0x0A, 0x00, 0x00, 0x08, 0x00])  # R10 = 0x800 (база)
-        program.extend([0x48, 0x01, 0x00, 0x00, 0x00, 0x64])  # R1 = 100
+        program.extend([0x48, 0x05, 0x00, 0x02, 0x00, 0x00])  # R10 = 0x800 (база)
+        program.extend([0xC8, 0x00, 0x19, 0x00, 0x00, 0x00])  # R1 = 100
 
         # Запись исходного значения
-        program.extend([0x08, 0x01, 0x0A])  # mem[R10] = R1
+        program.extend([0x88, 0x80, 0x02])  # mem[R10] = R1
 
         # Унарный минус
-        program.extend([0x5B, 0x04, 0x0A, 0x01])  # -R1 -> mem[R10+4]
+        program.extend([0x5B, 0x42, 0x11, 0x00])  # -R1 -> mem[R10+4]
 
         # Чтение исходного и результата
-        program.extend([0x71, 0x02, 0x0A])  # R2 = mem[R10] (исходное)
-        program.extend([0x72, 0x0B, 0x04])  # R11 = 4
-        program.extend([0x71, 0x03, 0x0B])  # R3 = mem[R10+4] (результат)
+        program.extend([0x71, 0x81, 0x02])  # R2 = mem[R10] (исходное)
+        program.extend([0xC8, 0x05, 0x01, 0x02, 0x00, 0x00])  # R11 = 0x804 (R10 + 4)
+        program.extend([0xF1, 0xC1, 0x02])  # R3 = mem[R10+4] (результат)
 
         # Второй унарный минус (двойное отрицание)
-        program.extend([0x5B, 0x08, 0x0A, 0x03])  # -R3 -> mem[R10+8]
-        program.extend([0x72, 0x0C, 0x08])  # R12 = 8
-        program.extend([0x71, 0x04, 0x0C])  # R4 = mem[R10+8] (двойное отрицание)
+        program.extend([0x5B, 0x44, 0x31, 0x00])  # -R3 -> mem[R10+8]
+        program.extend([0x48, 0x06, 0x02, 0x02, 0x00, 0x00])  # R12 = 0x808 (R10 + 8)
+        program.extend([0x71, 0x02, 0x03])  # R4 = mem[R10+8] (двойное отрицание)
 
         self.interpreter.memory[:len(program)] = program
 
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Тесты таблицы системы команд и сгенерированных кодировщиков/декодировщиков
+"""
+
+import unittest
+
+from isa import ISA, ENCODERS, DECODERS, DISPATCH, OPCODE_MASK
+from parser import parse_instruction
+from encoder import encode_instruction
+from interpreter import UVMInterpreter
+
+
+# Тестовые последовательности из спецификации УВМ
+SPEC_VECTORS = [
+    ({"opcode": 72, "field_b": 7, "field_c": 440}, [0xC8, 0x03, 0x6E, 0x00, 0x00, 0x00]),
+    ({"opcode": 113, "field_b": 102, "field_c": 77}, [0x71, 0x73, 0x13]),
+    ({"opcode": 8, "field_b": 19, "field_c": 49}, [0x88, 0x49, 0x0C]),
+    ({"opcode": 91, "field_b": 16, "field_c": 41, "field_d": 53}, [0x5B, 0x28, 0x55, 0x03]),
+]
+
+
+class TestISA(unittest.TestCase):
+
+    def test_spec_vectors(self):
+        """Кодировщик выдает байты из спецификации"""
+        for fields, expected in SPEC_VECTORS:
+            with self.subTest(opcode=fields['opcode']):
+                encoded = encode_instruction(parse_instruction(fields))
+                self.assertEqual(list(encoded), expected)
+
+    def test_decoder_matches_encoder(self):
+        """Декодирование обращает кодирование на границах диапазонов"""
+        for opcode, spec in ISA.items():
+            low = [0] * len(spec.fields)
+            high = [field.mask for field in spec.fields]
+            for values in (low, high):
+                with self.subTest(opcode=opcode, values=values):
+                    encoded = ENCODERS[opcode](*values)
+                    self.assertEqual(len(encoded), spec.size)
+                    self.assertEqual(encoded[0] & OPCODE_MASK, opcode)
+                    decoded = DECODERS[opcode](encoded, 0)
+                    self.assertEqual(list(decoded[:len(values)]), values)
+
+    def test_range_check(self):
+        """Значение, не помещающееся в поле, отклоняется"""
+        with self.assertRaises(ValueError):
+            ENCODERS[91](64, 0, 0)
+        with self.assertRaises(ValueError):
+            ENCODERS[113](0, 128)
+
+    def test_dispatch_table(self):
+        """Таблица первого байта покрывает оба значения старшего бита"""
+        for opcode in ISA:
+            self.assertIs(DISPATCH[opcode][0], ISA[opcode])
+            self.assertIs(DISPATCH[opcode | 0x80][0], ISA[opcode])
+        self.assertIsNone(DISPATCH[0])
+
+    def test_interpreter_decodes_spec_vectors(self):
+        """Интерпретатор декодирует то же, что закодировал ассемблер"""
+        for fields, expected in SPEC_VECTORS:
+            with self.subTest(opcode=fields['opcode']):
+                interpreter = UVMInterpreter(memory_size=64)
+                interpreter.memory[:len(expected)] = bytes(expected)
+                opcode, field_b, field_c, field_d = interpreter.decode_instruction()
+                self.assertEqual(opcode, fields['opcode'])
+                self.assertEqual(field_b, fields['field_b'])
+                self.assertEqual(field_c, fields['field_c'])
+                self.assertEqual(field_d, fields.get('field_d'))
+
+
+if __name__ == '__main__':
+    unittest.main()
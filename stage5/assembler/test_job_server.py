@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Тесты сервера и клиента заданий УВМ
+"""
+
+import os
+import base64
+import asyncio
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+from unittest.mock import patch
+
+from job_server import JobServer, execute_job
+from job_client import JobClient, parse_address, run_program
+
+
+# Отрицание слова по адресу 0x100 в 0x104
+NEGATE = {"instructions": [
+    {"opcode": 72, "field_b": 10, "field_c": 0x100},
+    {"opcode": 113, "field_b": 1, "field_c": 10},
+    {"opcode": 91, "field_b": 4, "field_c": 10, "field_d": 1},
+]}
+
+
+class TestExecuteJob(unittest.TestCase):
+
+    def test_source_with_init_memory(self):
+        response = execute_job({"id": 7, "source": NEGATE, "memory_size": 0x1000,
+                                "init_memory": [{"address": 0x100, "words": [9]}],
+                                "dump": [[0x100, 0x104]], "registers": True})
+        self.assertTrue(response['ok'])
+        self.assertEqual(response['id'], 7)
+        self.assertEqual(response['dump'], [{'address': 0x100, 'words': [9, (-9) & 0xFFFFFFFF]}])
+        self.assertEqual(response['registers'][1], 9)
+        self.assertIsNone(response['fault'])
+
+    def test_binary_job(self):
+        from uvm_api import UVM
+        binary = base64.b64encode(UVM.assemble(NEGATE)).decode('ascii')
+        data = base64.b64encode((3).to_bytes(4, 'little')).decode('ascii')
+        response = execute_job({"binary": binary, "memory_size": 0x1000,
+                                "init_memory": [{"address": 0x100, "data": data}],
+                                "dump": [[0x104, 0x104]]})
+        self.assertEqual(response['dump'][0]['words'], [(-3) & 0xFFFFFFFF])
+
+    def test_rejected_jobs(self):
+        for job in ({"source": NEGATE, "memory_size": 1 << 40},
+                    {"source": NEGATE, "max_instructions": 0},
+                    {"memory_size": 0x1000},
+                    {"source": 5},
+                    {"source": NEGATE, "memory_size": 0x1000, "dump": [[0x2000, 0x2004]]},
+                    {"source": NEGATE, "memory_size": 0x1000, "dump": [[0x104, 0x100]]},
+                    {"source": NEGATE, "memory_size": 0x1000, "dump": [[0x101, 0x105]]},
+                    {"source": NEGATE, "memory_size": 0x1000, "dump": [[0xFFC, 0x1000]]},
+                    {"source": NEGATE, "memory_size": True},
+                    {"source": NEGATE, "max_instructions": True},
+                    {"source": NEGATE, "init_memory": [{"words": [1]}]}):
+            with self.subTest(job=job):
+                response = execute_job(job)
+                self.assertFalse(response['ok'])
+                self.assertTrue(response['error'])
+
+    def test_bad_dump_rejected_before_run(self):
+        """Ошибка в диапазоне дампа - без выполнения и без полей результата"""
+        with patch('uvm_api.UVM.run') as run:
+            response = execute_job({"source": NEGATE, "memory_size": 0x1000, "dump": [[0x2000, 0x2004]]})
+        run.assert_not_called()
+        self.assertEqual(set(response), {'id', 'ok', 'error'})
+
+    def test_guest_fault_is_reported(self):
+        response = execute_job({"source": NEGATE, "memory_size": 0x1000, "max_instructions": 1})
+        self.assertTrue(response['ok'])
+        self.assertIsNotNone(response['fault'])
+
+
+class TestJobServer(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.tmp.name, 'uvm.sock')
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.server = JobServer(self.executor, queue_size=1, stream=StringIO())
+
+        ready = threading.Event()
+        self.loop = asyncio.new_event_loop()
+
+        def serve():
+            asyncio.set_event_loop(self.loop)
+            self.task = self.loop.create_task(
+                self.server.serve(unix=self.socket_path, ready=lambda address: ready.set()))
+            try:
+                self.loop.run_until_complete(self.task)
+            except asyncio.CancelledError:
+                pass
+
+        self.thread = threading.Thread(target=serve, daemon=True)
+        self.thread.start()
+        self.assertTrue(ready.wait(5))
+
+    def tearDown(self):
+        self.loop.call_soon_threadsafe(self.task.cancel)
+        self.thread.join(5)
+        self.loop.close()
+        self.executor.shutdown()
+        self.tmp.cleanup()
+
+    def test_submit(self):
+        with JobClient(f"unix:{self.socket_path}", timeout=5) as client:
+            response = run_program(client, NEGATE, 0x100, 0x104, memory_size=0x1000,
+                                   init_memory=[{"address": 0x100, "words": [1]}])
+            self.assertEqual(response['dump'][0]['words'], [1, 0xFFFFFFFF])
+            with self.assertRaises(ValueError):
+                run_program(client, NEGATE, 0x100, 0x104, memory_size=-1)
+
+    def test_pipelined_jobs_and_errors(self):
+        jobs = [{"id": i, "source": NEGATE, "memory_size": 0x1000,
+                 "init_memory": [{"address": 0x100, "words": [i]}], "dump": [[0x104, 0x104]]}
+                for i in range(20)]
+        with JobClient(f"unix:{self.socket_path}", timeout=5) as client:
+            responses = list(client.map(jobs, window=5))
+            self.assertEqual(sorted(r['id'] for r in responses), list(range(20)))
+            for response in responses:
+                self.assertEqual(response['dump'][0]['words'], [-response['id'] & 0xFFFFFFFF])
+
+            client._file.write(b'not json\n')
+            client._file.flush()
+            self.assertFalse(client._receive()['ok'])
+        self.assertEqual(self.server.completed, 20)
+
+    def test_idle_connection_does_not_block_others(self):
+        """Соединение без заданий не занимает единственное место в очереди"""
+        with JobClient(f"unix:{self.socket_path}", timeout=5), \
+                JobClient(f"unix:{self.socket_path}", timeout=3) as client:
+            response = run_program(client, NEGATE, 0x104, 0x104, memory_size=0x1000,
+                                   init_memory=[{"address": 0x100, "words": [2]}])
+        self.assertEqual(response['dump'][0]['words'], [(-2) & 0xFFFFFFFF])
+
+    def test_parse_address(self):
+        self.assertEqual(parse_address('unix:/tmp/uvm.sock')[1], '/tmp/uvm.sock')
+        self.assertEqual(parse_address('localhost:7420')[1], ('localhost', 7420))
+        with self.assertRaises(ValueError):
+            parse_address('localhost')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Тесты журнала отмены (обратный ход отладчика)
+"""
+
+import unittest
+
+from parser import parse_program
+from encoder import encode_program
+from interpreter import UVMInterpreter
+from journal import UndoJournal
+from debugger import Debugger
+
+
+PROGRAM = [
+    {"opcode": 72, "field_b": 10, "field_c": 0x100},          # #0 PC 0
+    {"opcode": 72, "field_b": 1, "field_c": 5},               # #1 PC 6
+    {"opcode": 8, "field_b": 1, "field_c": 10},               # #2 PC 12
+    {"opcode": 113, "field_b": 2, "field_c": 10},             # #3 PC 15
+    {"opcode": 91, "field_b": 0, "field_c": 10, "field_d": 2},  # #4 PC 18
+    {"opcode": 72, "field_b": 1, "field_c": 7},               # #5 PC 22
+]
+
+
+def snapshot(interpreter):
+    return (interpreter.pc, interpreter.instructions_executed,
+            list(interpreter.registers), bytes(interpreter.memory))
+
+
+class TestUndoJournal(unittest.TestCase):
+
+    def setUp(self):
+        self.interpreter = UVMInterpreter(memory_size=4096, verbose=False)
+        binary = encode_program(parse_program({"instructions": PROGRAM}))
+        self.interpreter.memory[:len(binary)] = binary
+        self.interpreter.program_size = len(binary)
+        self.journal = UndoJournal(self.interpreter, checkpoint_every=2)
+        self.interpreter.add_hook(self.journal)
+
+    def states(self):
+        """Состояние перед каждой командой и после последней"""
+        states = [snapshot(self.interpreter)]
+        while not self.interpreter.halted:
+            self.interpreter.run(1)
+            states.append(snapshot(self.interpreter))
+        return states[:len(PROGRAM) + 1]
+
+    def test_reverse_step_restores_every_state(self):
+        states = self.states()
+        self.assertEqual(self.journal.time, len(PROGRAM))
+        for expected in reversed(states[:-1]):
+            self.assertEqual(self.journal.reverse_step(), 1)
+            self.assertEqual(snapshot(self.interpreter), expected)
+        self.assertFalse(self.interpreter.halted)
+        self.assertEqual(self.journal.reverse_step(), 0)
+
+    def test_reverse_continue_finds_last_writer(self):
+        self.interpreter.run()
+        self.assertEqual(self.journal.reverse_continue(0x100), 18)
+        self.assertEqual(int.from_bytes(self.interpreter.memory[0x100:0x104], 'little'), 5)
+        self.assertEqual(self.journal.reverse_continue(0x100), 12)
+        self.assertEqual(self.interpreter.registers[1], 5)
+        self.assertIsNone(self.journal.reverse_continue(0x100))
+        self.assertEqual(self.interpreter.pc, 0)
+
+    def test_goto(self):
+        states = self.states()
+        for target in (3, 0, 5, 1, 6, 4):
+            self.journal.goto(target)
+            self.assertEqual(snapshot(self.interpreter), states[target])
+            self.assertEqual(self.journal.time, target)
+
+    def test_checkpoints(self):
+        self.interpreter.run()
+        self.assertEqual([cp.time for cp in self.journal.checkpoints], [0, 2, 4])
+        self.journal.goto(1)
+        self.assertEqual([cp.time for cp in self.journal.checkpoints], [0])
+
+    def test_checkpoints_keep_only_written_pages(self):
+        """Снимки хранят только страницы с записями; goto восстанавливает всю память"""
+        program = [
+            {"opcode": 72, "field_b": 10, "field_c": 0x100},
+            {"opcode": 72, "field_b": 1, "field_c": 5},
+            {"opcode": 8, "field_b": 1, "field_c": 10},
+            {"opcode": 72, "field_b": 10, "field_c": 0x1100},
+            {"opcode": 8, "field_b": 1, "field_c": 10},
+            {"opcode": 72, "field_b": 10, "field_c": 0x2FFE},  # слово на границе страниц
+            {"opcode": 8, "field_b": 1, "field_c": 10},
+            {"opcode": 72, "field_b": 1, "field_c": 9},
+            {"opcode": 8, "field_b": 1, "field_c": 10},
+            {"opcode": 72, "field_b": 10, "field_c": 0x100},
+            {"opcode": 8, "field_b": 1, "field_c": 10},
+        ]
+        interpreter = UVMInterpreter(memory_size=0x10000, verbose=False)
+        binary = encode_program(parse_program({"instructions": program}))
+        interpreter.memory[:len(binary)] = binary
+        interpreter.program_size = len(binary)
+        self.interpreter = interpreter
+        self.journal = UndoJournal(interpreter, checkpoint_every=2)
+        interpreter.add_hook(self.journal)
+
+        states = [snapshot(interpreter)]
+        while not interpreter.halted:
+            interpreter.run(1)
+            states.append(snapshot(interpreter))
+        states = states[:len(program) + 1]
+        stored = sum(len(data) for cp in self.journal.checkpoints for data in cp.pages.values())
+        self.assertLess(stored, len(interpreter.memory))
+
+        for target in (10, 2, 7, 0, 11, 5, 9, 1, 8):
+            self.journal.goto(target)
+            self.assertEqual(snapshot(interpreter), states[target], f"goto {target}")
+            # Номера снимков с копиями страниц - только у оставшихся снимков
+            expected = {}
+            for index, checkpoint in enumerate(self.journal.checkpoints):
+                for page in checkpoint.pages:
+                    expected.setdefault(page, []).append(index)
+            self.assertEqual(self.journal.page_copies, expected, f"goto {target}")
+
+
+class TestDebuggerReverse(unittest.TestCase):
+
+    def setUp(self):
+        interpreter = UVMInterpreter(memory_size=4096, verbose=False)
+        binary = encode_program(parse_program({"instructions": PROGRAM}))
+        interpreter.memory[:len(binary)] = binary
+        interpreter.program_size = len(binary)
+        self.debugger = Debugger(interpreter)
+
+    def test_requires_journal(self):
+        with self.assertRaises(ValueError):
+            self.debugger.reverse_step()
+
+    def test_reverse_after_continue(self):
+        self.debugger.enable_journal()
+        self.debugger.cont()
+        self.debugger.reverse_continue(0x100)
+        self.assertEqual(self.debugger.interpreter.pc, 18)
+        self.debugger.reverse_step(2)
+        self.assertEqual(self.debugger.interpreter.pc, 12)
+        self.debugger.disable_journal()
+        self.assertEqual(self.debugger.interpreter.hooks, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
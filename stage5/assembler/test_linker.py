@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Тесты компоновщика объектов УВМ
+"""
+
+import os
+import sys
+import json
+import tempfile
+import unittest
+import subprocess
+
+from interpreter import UVMInterpreter
+from parser import needs_linking
+from linker import parse_reference, compile_module, link, ObjectCache, DEFAULT_DATA_BASE
+
+
+SETUP = {
+    "symbols": {"COUNT": 3},
+    "data": [
+        {"name": "vec", "words": [10, 20, 30]},
+        {"name": "fixed", "address": 0x8000, "words": [1]},
+    ],
+    "instructions": [
+        {"opcode": 72, "field_b": 10, "field_c": "vec"},
+        {"opcode": 72, "field_b": 11, "field_c": "vec+4"},
+    ],
+}
+
+KERNEL = {
+    "instructions": [
+        {"opcode": 113, "field_b": 1, "field_c": 11},
+        {"opcode": 91, "field_b": 0, "field_c": 11, "field_d": 1},
+        {"opcode": 72, "field_b": 5, "field_c": "COUNT"},
+        {"opcode": 72, "field_b": 6, "field_c": "fixed-4"},
+    ],
+}
+
+
+def run(image):
+    interpreter = UVMInterpreter(memory_size=0x10000, verbose=False)
+    interpreter.load_image(image)
+    interpreter.run()
+    return interpreter
+
+
+class TestLinker(unittest.TestCase):
+
+    def test_parse_reference(self):
+        self.assertEqual(parse_reference("vec"), ("vec", 0))
+        self.assertEqual(parse_reference("vec + 0x10"), ("vec", 16))
+        self.assertEqual(parse_reference("vec-4"), ("vec", -4))
+        with self.assertRaises(ValueError):
+            parse_reference("1vec")
+
+    def test_needs_linking(self):
+        self.assertTrue(needs_linking(SETUP))
+        self.assertTrue(needs_linking(KERNEL))
+        self.assertFalse(needs_linking({"instructions": [{"opcode": 72, "field_b": 1, "field_c": 2}]}))
+
+    def test_link_modules(self):
+        symbols = {}
+        image = link([compile_module(SETUP), compile_module(KERNEL)], symbol_map=symbols)
+        self.assertEqual(symbols, {"vec": DEFAULT_DATA_BASE, "fixed": 0x8000, "COUNT": 3})
+
+        interpreter = run(image)
+        self.assertEqual(interpreter.registers[10], DEFAULT_DATA_BASE)
+        self.assertEqual(interpreter.registers[5], 3)
+        self.assertEqual(interpreter.registers[6], 0x8000 - 4)
+        word = int.from_bytes(interpreter.memory[DEFAULT_DATA_BASE + 4:DEFAULT_DATA_BASE + 8], 'little')
+        self.assertEqual(word, (-20) & 0xFFFFFFFF)
+        self.assertEqual(interpreter.memory[0x8000], 1)
+
+    def test_unplaced_data_skips_fixed_blocks(self):
+        module = {"data": [{"address": DEFAULT_DATA_BASE, "words": [7]},
+                           {"name": "table", "words": [1, 2]}],
+                  "instructions": [{"opcode": 72, "field_b": 1, "field_c": "table"}]}
+        symbols = {}
+        link([compile_module(module)], symbol_map=symbols)
+        self.assertEqual(symbols["table"], DEFAULT_DATA_BASE + 4)
+
+    def test_errors(self):
+        with self.assertRaisesRegex(ValueError, "COUNT"):
+            link([compile_module(KERNEL)])
+        with self.assertRaisesRegex(ValueError, "Повторное"):
+            link([compile_module(SETUP), compile_module(dict(KERNEL, symbols={"vec": 1}))])
+        with self.assertRaisesRegex(ValueError, "перекрываются"):
+            link([compile_module(SETUP), compile_module(SETUP)])
+        with self.assertRaises(ValueError):
+            compile_module({"instructions": [{"opcode": 113, "field_b": 1, "field_c": "vec"}]})
+
+    def test_assembler_reports_link_error(self):
+        """assembler.py сообщает об ошибке компоновки без трассировки стека"""
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, 'kernel.json')
+            with open(source, 'w', encoding='utf-8') as f:
+                json.dump(KERNEL, f)
+            result = subprocess.run([sys.executable, 'assembler.py', source, os.path.join(tmp, 'out.bin')],
+                                    capture_output=True, text=True,
+                                    cwd=os.path.dirname(os.path.abspath(__file__)))
+        self.assertEqual(result.returncode, 1)
+        self.assertIn("Ошибка компоновки", result.stdout)
+        self.assertNotIn("Traceback", result.stderr)
+
+    def test_link_output_replaced_atomically(self):
+        """linker.py заменяет результат целиком и не оставляет временных файлов"""
+        with tempfile.TemporaryDirectory() as tmp:
+            sources = []
+            for name, program in (('setup', SETUP), ('kernel', KERNEL)):
+                sources.append(os.path.join(tmp, f'{name}.json'))
+                with open(sources[-1], 'w', encoding='utf-8') as f:
+                    json.dump(program, f)
+            output = os.path.join(tmp, 'out.bin')
+            with open(output, 'wb') as f:
+                f.write(b'old')
+            result = subprocess.run([sys.executable, 'linker.py'] + sources + ['-o', output],
+                                    capture_output=True, text=True,
+                                    cwd=os.path.dirname(os.path.abspath(__file__)))
+            self.assertEqual(result.returncode, 0, result.stdout)
+            with open(output, 'rb') as f:
+                self.assertEqual(f.read(), link([compile_module(SETUP), compile_module(KERNEL)]))
+            self.assertEqual(sorted(os.listdir(tmp)), ['kernel.json', 'out.bin', 'setup.json'])
+
+    def test_unlinked_object_not_loadable(self):
+        interpreter = UVMInterpreter(memory_size=0x10000, verbose=False)
+        with self.assertRaises(ValueError):
+            interpreter.load_image(compile_module(KERNEL))
+
+    def test_cache(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ObjectCache(tmp)
+            source = json.dumps(SETUP).encode('utf-8')
+            first = cache.assemble(source)
+            second = cache.assemble(source)
+            cache.assemble(json.dumps(KERNEL).encode('utf-8'))
+        self.assertEqual(first, second)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
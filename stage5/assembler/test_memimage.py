@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Тесты загрузки начального содержимого памяти
+"""
+
+import os
+import struct
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from interpreter import UVMInterpreter
+from memimage import parse_init_spec, map_memory_file
+from parser import parse_program
+from encoder import encode_program
+from journal import UndoJournal
+
+
+def npy_bytes(descr: str, words, fmt: str) -> bytes:
+    header = f"{{'descr': '{descr}', 'fortran_order': False, 'shape': ({len(words)},), }}"
+    header += ' ' * (63 - len(header) % 64) + '\n'
+    return (b'\x93NUMPY\x01\x00' + struct.pack('<H', len(header)) + header.encode('latin-1')
+            + struct.pack(fmt + 'I' * len(words), *words))
+
+
+class TestMemoryImage(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.interpreter = UVMInterpreter(memory_size=0x2000, verbose=False)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name: str, data: bytes) -> str:
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def word(self, address: int) -> int:
+        return int.from_bytes(self.interpreter.memory[address:address + 4], 'little')
+
+    def test_raw(self):
+        path = self.write('input.bin', b'\x01\x02\x03\x04\x05')
+        self.assertEqual(self.interpreter.load_memory_image(0x100, path), 5)
+        self.assertEqual(bytes(self.interpreter.memory[0x100:0x105]), b'\x01\x02\x03\x04\x05')
+
+    def test_npy(self):
+        words = [1, 0xDEADBEEF, 7]
+        for descr, fmt in (('<u4', '<'), ('>u4', '>')):
+            with self.subTest(descr=descr):
+                path = self.write('input.npy', npy_bytes(descr, words, fmt))
+                self.assertEqual(self.interpreter.load_memory_image(0x200, path), 12)
+                self.assertEqual([self.word(0x200 + 4 * i) for i in range(3)], words)
+
+    def test_npy_unsupported_type(self):
+        header = b"{'descr': '<f8', 'fortran_order': False, 'shape': (1,), }\n"
+        path = self.write('input.npy', b'\x93NUMPY\x01\x00' + struct.pack('<H', len(header))
+                          + header + bytes(8))
+        with self.assertRaises(ValueError):
+            self.interpreter.load_memory_image(0, path)
+
+    def test_npy_truncated_header(self):
+        for data in (b'\x93NUMPY\x01\x00\x10', b'\x93NUMPY\x02\x00' + struct.pack('<I', 64) + b"{'descr'"):
+            with self.subTest(data=data):
+                path = self.write('input.npy', data)
+                with self.assertRaises(ValueError):
+                    self.interpreter.load_memory_image(0, path)
+
+    def test_csv_from_dump(self):
+        """CSV-дамп одного запуска - начальные данные другого"""
+        self.interpreter.memory[0x300:0x308] = b'\x10\x20\x30\x40\xAA\xBB\xCC\xDD'
+        path = os.path.join(self.tmp.name, 'dump.csv')
+        with redirect_stdout(StringIO()):
+            self.interpreter.dump_memory(0x300, 0x307, path)
+
+        other = UVMInterpreter(memory_size=0x2000, verbose=False)
+        self.assertEqual(other.load_memory_image(0x1000, path), 8)
+        self.assertEqual(bytes(other.memory[0x1000:0x1008]), b'\x10\x20\x30\x40\xAA\xBB\xCC\xDD')
+
+    def test_out_of_memory(self):
+        path = self.write('input.bin', bytes(16))
+        with self.assertRaises(ValueError):
+            self.interpreter.load_memory_image(0x2000 - 8, path)
+
+    def test_parse_init_spec(self):
+        self.assertEqual(parse_init_spec('0x1000:data/in.npy'), (0x1000, 'data/in.npy'))
+        with self.assertRaises(ValueError):
+            parse_init_spec('in.bin')
+        with self.assertRaises(ValueError):
+            parse_init_spec('zz:in.bin')
+
+
+
+class TestMemoryFile(unittest.TestCase):
+    """Память машины - отображение файла"""
+
+    PROGRAM = [
+        {"opcode": 72, "field_b": 10, "field_c": 0x100},
+        {"opcode": 72, "field_b": 1, "field_c": 5},
+        {"opcode": 8, "field_b": 1, "field_c": 10},
+        {"opcode": 91, "field_b": 4, "field_c": 10, "field_d": 1},
+    ]
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.memory_path = os.path.join(self.tmp.name, 'memory.img')
+        self.program_path = os.path.join(self.tmp.name, 'program.bin')
+        with open(self.program_path, 'wb') as f:
+            f.write(encode_program(parse_program({"instructions": self.PROGRAM})))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def interpreter(self) -> UVMInterpreter:
+        interpreter = UVMInterpreter(memory_size=0x1000, verbose=False, memory_file=self.memory_path)
+        self.addCleanup(interpreter.close)
+        return interpreter
+
+    def test_result_persists_in_file(self):
+        interpreter = self.interpreter()
+        interpreter.load_program(self.program_path)
+        interpreter.run()
+        interpreter.close()
+
+        with open(self.memory_path, 'rb') as f:
+            data = f.read()
+        self.assertEqual(len(data), 0x1000)
+        self.assertEqual(int.from_bytes(data[0x100:0x104], 'little'), 5)
+        self.assertEqual(int.from_bytes(data[0x104:0x108], 'little'), (-5) & 0xFFFFFFFF)
+
+        # Содержимое файла - начальное состояние памяти следующего запуска
+        self.assertEqual(self.interpreter().memory[0x100], 5)
+
+    def test_existing_file_is_extended(self):
+        with open(self.memory_path, 'wb') as f:
+            f.write(b'\xAA' * 16)
+        with map_memory_file(self.memory_path, 64) as memory:
+            self.assertEqual(len(memory), 64)
+            self.assertEqual(memory[:17], b'\xAA' * 16 + b'\x00')
+
+    def test_checkpoint_and_journal(self):
+        interpreter = self.interpreter()
+        interpreter.load_program(self.program_path)
+        journal = UndoJournal(interpreter, checkpoint_every=2)
+        interpreter.add_hook(journal)
+        interpreter.run()
+        path = os.path.join(self.tmp.name, 'state.uvms')
+        with redirect_stdout(StringIO()):
+            interpreter.save_checkpoint(path)
+
+        journal.goto(2)
+        self.assertEqual(interpreter.memory[0x100], 0)
+        interpreter.load_checkpoint(path)
+        self.assertEqual(interpreter.memory[0x100], 5)
+        self.assertEqual(interpreter.memory[0x104], 0xFB)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Тесты трассы обращений к памяти и ее анализатора
+"""
+
+import os
+import unittest
+import tempfile
+
+from parser import parse_program
+from encoder import encode_program
+from interpreter import UVMInterpreter
+from memtrace import MemoryTracer, read_trace, READ, WRITE
+from trace_analyzer import analyze
+
+
+class TestMemoryTrace(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'trace.bin')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def read_all(self):
+        records = []
+        for pcs, kinds, addrs, values in read_trace(self.path):
+            records.extend(zip(pcs, kinds, addrs, values))
+        return records
+
+    def test_interpreter_trace(self):
+        """Интерпретатор записывает чтения и записи с адресами и значениями"""
+        program = parse_program({"instructions": [
+            {"opcode": 72, "field_b": 10, "field_c": 0x1000},
+            {"opcode": 72, "field_b": 1, "field_c": 42},
+            {"opcode": 8, "field_b": 1, "field_c": 10},
+            {"opcode": 113, "field_b": 2, "field_c": 10},
+            {"opcode": 91, "field_b": 4, "field_c": 10, "field_d": 2},
+        ]})
+        interpreter = UVMInterpreter(memory_size=8192)
+        binary = encode_program(program)
+        interpreter.memory[:len(binary)] = binary
+
+        with MemoryTracer(self.path, buffer_size=2) as tracer:
+            interpreter.add_hook(tracer)
+            interpreter.run()
+
+        self.assertEqual(self.read_all(), [
+            (12, WRITE, 0x1000, 42),
+            (15, READ, 0x1000, 42),
+            (18, WRITE, 0x1004, (-42) & 0xFFFFFFFF),
+        ])
+
+    def test_analyzer(self):
+        """Расстояния повторного использования, шаги и рабочее множество"""
+        with MemoryTracer(self.path) as tracer:
+            # Слова: A B C A B A
+            for addr in (0x100, 0x104, 0x108, 0x100, 0x104, 0x100):
+                tracer.log(0, READ, addr, 0)
+
+        result = analyze(self.path, window=3)
+        self.assertEqual(result['accesses'], 6)
+        self.assertEqual(result['distinct_words'], 3)
+        self.assertEqual(result['reuse_distance']['cold'], 3)
+        # A: 2 различных слова (B, C), B: 2 (C, A), A: 1 (B)
+        self.assertEqual(result['reuse_distance']['histogram'], {'1': 1, '2-3': 2})
+        self.assertEqual(result['strides'][0], {'stride': 4, 'count': 3})
+        self.assertEqual(result['working_set']['words'], [3, 2])
+
+    def test_bad_file(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'nope')
+        with self.assertRaises(ValueError):
+            list(read_trace(self.path))
+
+
+if __name__ == '__main__':
+    unittest.main()
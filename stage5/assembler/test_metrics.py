@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Тесты метрик OpenMetrics
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+
+from parser import parse_program
+from encoder import encode_program
+from interpreter import UVMInterpreter
+from metrics import Metrics, parse
+
+
+PROGRAM = {"instructions": [
+    {"opcode": 72, "field_b": 10, "field_c": 0x100},
+    {"opcode": 72, "field_b": 1, "field_c": 5},
+    {"opcode": 8, "field_b": 1, "field_c": 10},
+    {"opcode": 113, "field_b": 2, "field_c": 10},
+    {"opcode": 91, "field_b": 8, "field_c": 10, "field_d": 2},
+]}
+
+
+def make_interpreter():
+    interpreter = UVMInterpreter(memory_size=4096, verbose=False)
+    binary = encode_program(parse_program(PROGRAM))
+    interpreter.memory[:len(binary)] = binary
+    interpreter.program_size = len(binary)
+    return interpreter
+
+
+def save_increments(path: str, count: int) -> None:
+    for _ in range(count):
+        metrics = Metrics()
+        metrics.inc('uvm_instructions')
+        metrics.save(path)
+
+
+class TestMetrics(unittest.TestCase):
+
+    def test_run_counters(self):
+        metrics = Metrics()
+        interpreter = make_interpreter()
+        with metrics.run(interpreter, program='p.bin'):
+            interpreter.run()
+        self.assertEqual(metrics.get('uvm_instructions'), 5)
+        self.assertEqual(metrics.get('uvm_opcode_instructions', opcode='load'), 2)
+        self.assertEqual(metrics.get('uvm_memory_read_bytes'), 4)
+        self.assertEqual(metrics.get('uvm_memory_written_bytes'), 8)
+        self.assertEqual(metrics.get('uvm_jobs', program='p.bin', result='success'), 1)
+
+    def test_partial_run_and_failure(self):
+        """Учитываются только выполненные команды; ошибка - неуспешный запуск"""
+        metrics = Metrics()
+        interpreter = make_interpreter()
+        interpreter.run(1)
+        interpreter.registers[10] = 0xFFFFFF00
+        with metrics.run(interpreter):
+            interpreter.run()
+        self.assertEqual(metrics.get('uvm_instructions'), 1)
+        self.assertEqual(metrics.get('uvm_opcode_instructions', opcode='load'), 1)
+        self.assertEqual(metrics.get('uvm_memory_written_bytes'), 0)
+        self.assertEqual(metrics.get('uvm_jobs', result='failure'), 1)
+
+    def test_render_and_accumulate(self):
+        metrics = Metrics()
+        metrics.inc('uvm_instructions', 10)
+        metrics.set('uvm_run_seconds', 0.5)
+        metrics.inc('uvm_jobs', result='success')
+        text = metrics.render()
+        self.assertIn('# TYPE uvm_instructions counter', text)
+        self.assertIn('uvm_instructions_total 10\n', text)
+        self.assertIn('uvm_run_seconds 0.5\n', text)
+        self.assertTrue(text.endswith('# EOF\n'))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'uvm.prom')
+            metrics.save(path)
+            second = Metrics()
+            second.inc('uvm_instructions', 5)
+            second.set('uvm_run_seconds', 0.25)
+            second.save(path)
+            with open(path, 'r', encoding='utf-8') as f:
+                values = parse(f.read())
+        self.assertEqual(values[('uvm_instructions', ())], 15)
+        self.assertEqual(values[('uvm_run_seconds', ())], 0.25)
+        self.assertEqual(values[('uvm_jobs', (('result', 'success'),))], 1)
+
+    def test_label_escapes_round_trip(self):
+        values = ['a\\nb', 'say "hi"', 'two\nlines', '\\', 'end\\']
+        metrics = Metrics()
+        for value in values:
+            metrics.inc('uvm_jobs', result=value)
+        parsed = parse(metrics.render())
+        self.assertEqual(sorted(dict(labels)['result'] for _, labels in parsed), sorted(values))
+
+    def test_concurrent_saves_keep_counters(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'uvm.prom')
+            with ProcessPoolExecutor(max_workers=4) as executor:
+                list(executor.map(save_increments, [path] * 4, [25] * 4))
+            with open(path, 'r', encoding='utf-8') as f:
+                values = parse(f.read())
+        self.assertEqual(values[('uvm_instructions', ())], 100)
+
+    def test_rejected_dump_not_counted(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            program = os.path.join(tmp, 'p.bin')
+            with open(program, 'wb') as f:
+                f.write(encode_program(parse_program(PROGRAM)))
+            path = os.path.join(tmp, 'uvm.prom')
+            subprocess.run([sys.executable, 'interpreter.py', program, os.path.join(tmp, 'dump.csv'),
+                            '--memory-size', '4096', '--start', '0x2000', '--end', '0x1000',
+                            '--metrics-out', path],
+                           capture_output=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+            with open(path, 'r', encoding='utf-8') as f:
+                values = parse(f.read())
+        self.assertEqual(values[('uvm_instructions', ())], 5)
+        self.assertNotIn(('uvm_dump_bytes', ()), values)
+
+
+if __name__ == '__main__':
+    unittest.main()
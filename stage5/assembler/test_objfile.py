@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Тесты объектного файла с секциями и блока данных JSON
+"""
+
+import unittest
+
+from parser import parse_program, parse_data
+from encoder import encode_program
+from interpreter import UVMInterpreter
+from objfile import (Section, SECTION_CODE, SECTION_DATA, build_object, read_object,
+                     is_object)
+
+
+PROGRAM = {
+    "data": [
+        {"address": 0x1000, "words": [100, -1]},
+        {"address": 0x2000, "words": [7]},
+    ],
+    "instructions": [
+        {"opcode": 72, "field_b": 10, "field_c": 0x1000},
+        {"opcode": 113, "field_b": 1, "field_c": 10},
+        {"opcode": 91, "field_b": 8, "field_c": 10, "field_d": 1},
+    ],
+}
+
+
+def build(program):
+    code = encode_program(parse_program(program))
+    sections = [Section(SECTION_CODE, 0, code)]
+    sections += [Section(SECTION_DATA, block.address, block.to_bytes())
+                 for block in parse_data(program)]
+    return code, build_object(sections)
+
+
+class TestParseData(unittest.TestCase):
+
+    def test_blocks(self):
+        blocks = parse_data(PROGRAM)
+        self.assertEqual(blocks[0].address, 0x1000)
+        self.assertEqual(blocks[0].words, [100, 0xFFFFFFFF])
+        self.assertEqual(blocks[0].to_bytes(), b'\x64\x00\x00\x00\xFF\xFF\xFF\xFF')
+        self.assertEqual(parse_data({"instructions": []}), [])
+
+    def test_invalid(self):
+        for data in ([{"address": -4, "words": []}],
+                     [{"address": 0, "words": [1 << 32]}],
+                     [{"address": 0, "words": "1"}],
+                     [{"address": 0, "words": [1, 2]}, {"address": 4, "words": [3]}]):
+            with self.subTest(data=data), self.assertRaises(ValueError):
+                parse_data({"data": data})
+
+
+class TestObjectFile(unittest.TestCase):
+
+    def test_roundtrip(self):
+        code, image = build(PROGRAM)
+        self.assertTrue(is_object(image))
+        self.assertFalse(is_object(code))
+        sections = read_object(image)
+        self.assertEqual([(s.kind, s.address) for s in sections],
+                         [(SECTION_CODE, 0), (SECTION_DATA, 0x1000), (SECTION_DATA, 0x2000)])
+        self.assertEqual(bytes(sections[0].data), code)
+
+    def test_checksum(self):
+        _, image = build(PROGRAM)
+        corrupted = bytearray(image)
+        corrupted[-1] ^= 0xFF
+        with self.assertRaises(ValueError):
+            read_object(corrupted)
+        with self.assertRaises(ValueError):
+            read_object(image[:-1])
+
+    def test_interpreter_loads_sections(self):
+        code, image = build(PROGRAM)
+        interpreter = UVMInterpreter(memory_size=0x4000, verbose=False)
+        interpreter.load_image(image)
+        self.assertEqual(interpreter.program_size, len(code))
+        self.assertEqual(bytes(interpreter.memory[:len(code)]), code)
+        self.assertEqual(interpreter.memory[0x2000], 7)
+
+        interpreter.run()
+        self.assertEqual(interpreter.instructions_executed, 3)
+        self.assertEqual(int.from_bytes(interpreter.memory[0x1008:0x100C], 'little'),
+                         (-100) & 0xFFFFFFFF)
+
+    def test_unknown_sections_skipped(self):
+        code, _ = build(PROGRAM)
+        image = build_object([Section(SECTION_CODE, 0, code), Section(99, 0x3000, b'\x01')])
+        interpreter = UVMInterpreter(memory_size=0x4000, verbose=False)
+        interpreter.load_image(image)
+        self.assertEqual(interpreter.memory[0x3000], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Тесты страничной памяти с общими страницами
+"""
+
+import os
+import tempfile
+import unittest
+
+from interpreter import UVMInterpreter
+from paged_memory import PagedMemory, PageStore
+from parser import parse_program
+from encoder import encode_program
+
+
+PROGRAM = [
+    {"opcode": 72, "field_b": 10, "field_c": 0x1000},
+    {"opcode": 113, "field_b": 1, "field_c": 10},
+    {"opcode": 91, "field_b": 4, "field_c": 10, "field_d": 1},
+]
+
+
+class TestPagedMemory(unittest.TestCase):
+
+    def test_bytearray_semantics(self):
+        memory = PagedMemory(0x3000, page_size=0x1000)
+        reference = bytearray(0x3000)
+        for key, value in ((slice(0xFFE, 0x1002), b'\x01\x02\x03\x04'),
+                           (slice(0x2000, 0x3000), b'\xAB' * 0x1000),
+                           (5, 0x7F), (-1, 0x11)):
+            memory[key] = value
+            reference[key] = value
+        self.assertEqual(bytes(memory), bytes(reference))
+        self.assertEqual(memory[0xFFC:0x1004], reference[0xFFC:0x1004])
+        self.assertEqual(memory[5], 0x7F)
+        self.assertEqual(memory[-1], 0x11)
+        self.assertEqual(len(memory), 0x3000)
+        with self.assertRaises(ValueError):
+            memory[0:4] = b'\x00'
+        with self.assertRaises(IndexError):
+            memory[0x3000]
+
+    def test_copy_on_write(self):
+        store = PageStore()
+        first = PagedMemory(0x4000, store)
+        self.assertEqual(store.stats()['distinct'], 1)
+        second = first.fork()
+        self.assertEqual(store.stats()['references'], 8)
+
+        second[0x10] = 1
+        self.assertEqual(first[0x10], 0)
+        self.assertEqual(second.stats(), {'pages': 4, 'shared': 3, 'private': 1})
+        self.assertEqual(store.stats()['references'], 7)
+
+        # Запись того же значения не копирует страницу
+        first[0x20] = 0
+        self.assertEqual(first.stats()['private'], 0)
+
+    def test_fork_and_write_do_not_rehash(self):
+        """Хеш страницы вычисляется только при помещении в хранилище"""
+        store = PageStore()
+        memory = PagedMemory(0x4000, store)
+        hashed = []
+        digest = store._digest
+        store._digest = lambda data: hashed.append(len(data)) or digest(data)
+
+        other = memory.fork()
+        other[0x10] = 1
+        del other
+        self.assertEqual(hashed, [])
+        self.assertEqual(store.stats()['references'], 4)
+
+    def test_share_identical_pages(self):
+        store = PageStore()
+        memories = [PagedMemory(0x2000, store) for _ in range(3)]
+        for memory in memories:
+            memory[0x100] = 42
+            memory.share()
+        stats = store.stats()
+        self.assertEqual(stats['distinct'], 2)
+        self.assertEqual(stats['references'], 6)
+        self.assertEqual(stats['saved_bytes'], 4 * 0x1000)
+
+        del memories[0]
+        self.assertEqual(store.stats()['references'], 4)
+
+    def test_many_interpreters(self):
+        store = PageStore()
+        binary = encode_program(parse_program({"instructions": PROGRAM}))
+        template = UVMInterpreter(memory_size=0x4000, verbose=False, page_store=store)
+        template.load_image(binary)
+
+        machines = []
+        for number in range(10):
+            interpreter = UVMInterpreter(memory_size=0x4000, verbose=False, page_store=store)
+            interpreter.memory = template.memory.fork()
+            interpreter.program_size = template.program_size
+            interpreter.memory[0x1000:0x1004] = (number % 2 + 1).to_bytes(4, 'little')
+            interpreter.run()
+            interpreter.memory.share()
+            machines.append(interpreter)
+
+        self.assertEqual(machines[3].memory[0x1004], 0xFE)
+        self.assertEqual(machines[4].memory[0x1004], 0xFF)
+        # Нулевая страница, страница кода и два варианта страницы данных
+        self.assertEqual(store.stats()['distinct'], 4)
+
+    def test_checkpoint_roundtrip(self):
+        interpreter = UVMInterpreter(memory_size=0x4000, verbose=False, page_store=PageStore())
+        interpreter.memory[0x2000:0x2004] = b'\x01\x02\x03\x04'
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'state.uvms')
+            interpreter.save_checkpoint(path)
+            interpreter.memory[0x2000:0x2004] = bytes(4)
+            interpreter.memory[0x3000] = 9
+            interpreter.load_checkpoint(path)
+        self.assertEqual(interpreter.memory[0x2000:0x2004], b'\x01\x02\x03\x04')
+        self.assertEqual(interpreter.memory[0x3000], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Тесты профилировщика УВМ
+"""
+
+import unittest
+
+from parser import parse_program
+from encoder import encode_program
+from interpreter import UVMInterpreter
+from profiler import Profiler, PAGE_SIZE
+
+
+def make_interpreter(instructions, profiler):
+    interpreter = UVMInterpreter(memory_size=16384)
+    binary = encode_program(parse_program({"instructions": instructions}))
+    interpreter.memory[:len(binary)] = binary
+    interpreter.add_hook(profiler)
+    return interpreter
+
+
+PROGRAM = [
+    {"opcode": 72, "field_b": 10, "field_c": 0x1000},
+    {"opcode": 72, "field_b": 11, "field_c": 0x2040},
+    {"opcode": 72, "field_b": 1, "field_c": 7},
+    {"opcode": 8, "field_b": 1, "field_c": 10},
+    {"opcode": 113, "field_b": 2, "field_c": 10},
+    {"opcode": 91, "field_b": 4, "field_c": 11, "field_d": 2},
+]
+
+
+class TestProfiler(unittest.TestCase):
+
+    def test_counts(self):
+        """Счетчики по кодам операций, PC и блокам памяти"""
+        profiler = Profiler()
+        make_interpreter(PROGRAM, profiler).run()
+
+        self.assertEqual(profiler.samples, 6)
+        self.assertEqual(profiler.opcode_counts[72], 3)
+        self.assertEqual(profiler.opcode_counts[91], 1)
+        self.assertEqual(sorted(profiler.pc_counts), [0, 6, 12, 18, 21, 24])
+        self.assertEqual(profiler.read_counts, {0x1000 // 64: 1})
+        self.assertEqual(profiler.write_counts, {0x1000 // 64: 1, 0x2044 // 64: 1})
+
+    def test_page_buckets(self):
+        """Группировка обращений по страницам"""
+        profiler = Profiler(bucket_size=PAGE_SIZE)
+        make_interpreter(PROGRAM, profiler).run()
+        self.assertEqual(profiler.write_counts, {1: 1, 2: 1})
+
+    def test_sampling(self):
+        """В режиме выборки учитывается каждая N-я команда"""
+        profiler = Profiler(sample_every=2)
+        make_interpreter(PROGRAM, profiler).run()
+        self.assertEqual(profiler.samples, 3)
+        self.assertEqual(sorted(profiler.pc_counts), [6, 18, 24])
+
+    def test_report_and_json(self):
+        """Отчет и JSON содержат собранные данные"""
+        profiler = Profiler()
+        make_interpreter(PROGRAM, profiler).run()
+        data = profiler.to_dict()
+        self.assertEqual(data['opcodes'], {'load': 3, 'read': 1, 'write': 1, 'neg': 1})
+        self.assertIn('Загрузка константы', profiler.report(top=3))
+
+    def test_invalid_bucket_size(self):
+        with self.assertRaises(ValueError):
+            Profiler(bucket_size=100)
+
+
+if __name__ == '__main__':
+    unittest.main()
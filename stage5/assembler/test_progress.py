@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Тесты вывода хода выполнения
+"""
+
+import io
+import os
+import signal
+import unittest
+
+from parser import parse_program
+from encoder import encode_program
+from interpreter import UVMInterpreter
+from progress import Progress, count_instructions
+
+
+PROGRAM = {"instructions": [{"opcode": 72, "field_b": i, "field_c": i} for i in range(10)]}
+
+
+class TestProgress(unittest.TestCase):
+
+    def setUp(self):
+        self.interpreter = UVMInterpreter(memory_size=4096, verbose=False)
+        binary = encode_program(parse_program(PROGRAM))
+        self.interpreter.memory[:len(binary)] = binary
+        self.interpreter.program_size = len(binary)
+        self.stream = io.StringIO()
+
+    def test_count_instructions(self):
+        self.assertEqual(count_instructions(bytes(self.interpreter.memory[:60])), 10)
+        self.assertEqual(count_instructions(bytes(self.interpreter.memory[:59])), 9)
+
+    def test_periodic_lines(self):
+        progress = Progress(every=4, stream=self.stream)
+        progress.attach(self.interpreter)
+        self.interpreter.run()
+        self.assertTrue(self.interpreter.halted)
+        self.assertEqual(self.interpreter.instructions_executed, 10)
+        lines = self.stream.getvalue().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertIn("выполнено команд: 4 ", lines[0])
+        self.assertIn("из 10", lines[0])
+
+    def test_steps_with_monitor(self):
+        """Участки выполнения не меняют смысл run(steps)"""
+        Progress(every=3, stream=self.stream).attach(self.interpreter)
+        self.interpreter.run(5)
+        self.assertEqual(self.interpreter.instructions_executed, 5)
+        self.assertFalse(self.interpreter.halted)
+
+    @unittest.skipUnless(hasattr(signal, 'SIGUSR1'), "нет SIGUSR1")
+    def test_signal(self):
+        progress = Progress(stream=self.stream)
+        progress.attach(self.interpreter)
+        self.assertTrue(progress.install_signal())
+        try:
+            os.kill(os.getpid(), signal.SIGUSR1)
+            self.interpreter.run(2)
+            progress.tick(self.interpreter)
+        finally:
+            progress.uninstall_signal()
+        self.assertIn("PC=0x0000000C", self.stream.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
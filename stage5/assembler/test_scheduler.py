@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Тесты планировщика нескольких машин УВМ
+"""
+
+import asyncio
+import unittest
+
+from interpreter import UVMInterpreter
+from paged_memory import PageStore
+from parser import parse_program
+from encoder import encode_program
+from scheduler import Scheduler
+
+
+def machine(count: int, page_store=None) -> UVMInterpreter:
+    """Машина с программой из count команд загрузки константы"""
+    interpreter = UVMInterpreter(memory_size=0x2000, verbose=False, page_store=page_store)
+    interpreter.load_image(encode_program(parse_program({"instructions": [
+        {"opcode": 72, "field_b": 1, "field_c": i} for i in range(count)]})))
+    return interpreter
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+class TestScheduler(unittest.TestCase):
+
+    def test_round_robin_interleaves(self):
+        order = []
+
+        class Recorder:
+            def __init__(self, name):
+                self.name = name
+
+            def on_instruction(self, pc, opcode, b, c, d):
+                order.append(self.name)
+
+        async def scenario():
+            scheduler = Scheduler(quantum=2)
+            machines = [machine(4), machine(4)]
+            for name, interpreter in zip('ab', machines):
+                interpreter.add_hook(Recorder(name))
+            results = [await task for task in [scheduler.submit(m) for m in machines]]
+            return scheduler, results
+
+        scheduler, results = run(scenario())
+        self.assertEqual(order, list('aabbaabb'))
+        self.assertTrue(all(result.halted and result.error is None for result in results))
+        self.assertEqual(scheduler.stats()['finished'], 2)
+
+    def test_priority_runs_higher_first(self):
+        finished = []
+
+        async def scenario():
+            scheduler = Scheduler(quantum=3, policy='priority')
+            low = scheduler.submit(machine(9), priority=0, name='low')
+            high = scheduler.submit(machine(9), priority=5, name='high')
+            for task in (low, high):
+                task.future.add_done_callback(lambda _, name=task.name: finished.append(name))
+            await low
+            await high
+            return high
+
+        high = run(scenario())
+        self.assertEqual(finished, ['high', 'low'])
+        self.assertEqual(high.slices, 4)
+
+    def test_instruction_quota(self):
+        async def scenario():
+            scheduler = Scheduler(quantum=4)
+            return await scheduler.submit(machine(20), instruction_quota=10)
+
+        result = run(scenario())
+        self.assertEqual(result.executed, 10)
+        self.assertIn('квота команд', result.error)
+
+    def test_memory_quota(self):
+        async def scenario():
+            scheduler = Scheduler(quantum=100)
+            return await scheduler.submit(machine(3, PageStore()), memory_quota=0)
+
+        result = run(scenario())
+        self.assertIn('квота памяти', result.error)
+
+    def test_memory_quota_below_flat_memory(self):
+        async def scenario():
+            scheduler = Scheduler()
+            with self.assertRaises(ValueError):
+                scheduler.submit(machine(3), memory_quota=0x1000)
+            return await scheduler.submit(machine(3), memory_quota=0x2000)
+
+        result = run(scenario())
+        self.assertIsNone(result.error)
+
+    def test_stop_on_last_instruction_of_quantum(self):
+        """Остановка обработчиком на последней команде кванта не теряется"""
+        class Watchpoint:
+            def __init__(self, interpreter):
+                self.interpreter = interpreter
+
+            def on_instruction(self, pc, opcode, b, c, d):
+                if pc == 6:
+                    self.interpreter.request_stop("точка наблюдения")
+
+        async def scenario():
+            scheduler = Scheduler(quantum=2)
+            interpreter = machine(4)
+            interpreter.add_hook(Watchpoint(interpreter))
+            return await scheduler.submit(interpreter)
+
+        result = run(scenario())
+        self.assertEqual(result.executed, 2)
+        self.assertFalse(result.halted)
+        self.assertEqual(result.stop_reason, "точка наблюдения")
+
+    def test_other_coroutines_progress(self):
+        ticks = []
+
+        async def ticker():
+            for i in range(3):
+                ticks.append(i)
+                await asyncio.sleep(0)
+
+        async def scenario():
+            scheduler = Scheduler(quantum=1)
+            task = scheduler.submit(machine(10))
+            await asyncio.gather(task, ticker())
+            return scheduler.slices
+
+        slices = run(scenario())
+        self.assertEqual(ticks, [0, 1, 2])
+        self.assertGreaterEqual(slices, 10)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            Scheduler(quantum=0)
+        with self.assertRaises(ValueError):
+            Scheduler(policy='random')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Тесты временной шкалы в формате Chrome trace-event
+"""
+
+import os
+import json
+import unittest
+import tempfile
+import threading
+
+from parser import parse_program
+from encoder import encode_program
+from interpreter import UVMInterpreter
+from timeline import Timeline, BlockSpans, merge, phase
+
+
+class TestTimeline(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_spans_saved(self):
+        """Интервалы сохраняются как события 'X' с длительностью"""
+        timeline = Timeline(process_name='test')
+        with timeline.span('parse_program'):
+            pass
+        with phase(None, 'ignored'):
+            pass
+
+        path = os.path.join(self.tmpdir.name, 'trace.json')
+        timeline.save(path)
+        with open(path, encoding='utf-8') as f:
+            events = json.load(f)['traceEvents']
+
+        spans = [e for e in events if e['ph'] == 'X']
+        self.assertEqual([e['name'] for e in spans], ['parse_program'])
+        self.assertGreaterEqual(spans[0]['dur'], 0)
+        self.assertEqual(spans[0]['pid'], os.getpid())
+
+    def test_track_per_thread(self):
+        """Интервалы разных потоков попадают на разные дорожки"""
+        timeline = Timeline()
+
+        def worker(n):
+            timeline.name_track(f'worker {n}')
+            with timeline.span('run'):
+                pass
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        tids = {e['tid'] for e in timeline.events if e['ph'] == 'X'}
+        self.assertEqual(len(tids), 3)
+
+    def test_block_spans_and_merge(self):
+        """Интервалы блоков гостевых команд и объединение файлов"""
+        program = parse_program({"instructions": [
+            {"opcode": 72, "field_b": 1, "field_c": n} for n in range(5)
+        ]})
+        interpreter = UVMInterpreter(memory_size=1024)
+        binary = encode_program(program)
+        interpreter.memory[:len(binary)] = binary
+
+        timeline = Timeline()
+        blocks = BlockSpans(timeline, block_size=2)
+        interpreter.add_hook(blocks)
+        interpreter.run()
+        blocks.flush()
+
+        guest = [e for e in timeline.events if e.get('cat') == 'guest']
+        self.assertEqual([e['args']['instructions'] for e in guest], [2, 2, 1])
+
+        first = os.path.join(self.tmpdir.name, 'a.json')
+        second = os.path.join(self.tmpdir.name, 'b.json')
+        merged = os.path.join(self.tmpdir.name, 'merged.json')
+        timeline.save(first)
+        timeline.save(second)
+        merge([first, second], merged)
+        with open(merged, encoding='utf-8') as f:
+            self.assertEqual(len(json.load(f)['traceEvents']), 2 * len(timeline.events))
+
+
+if __name__ == '__main__':
+    unittest.main()
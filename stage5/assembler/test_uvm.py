@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Тесты единой командной строки uvm
+"""
+
+import os
+import sys
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stdout, redirect_stderr
+from io import StringIO
+
+import uvm
+
+
+PROGRAM = {"instructions": [
+    {"opcode": 72, "field_b": 10, "field_c": 0x100},
+    {"opcode": 72, "field_b": 1, "field_c": 5},
+    {"opcode": 8, "field_b": 1, "field_c": 10},
+    {"opcode": 91, "field_b": 4, "field_c": 10, "field_d": 1},
+]}
+
+
+class TestUvmCli(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source = self.path('program.json')
+        with open(self.source, 'w', encoding='utf-8') as f:
+            json.dump(PROGRAM, f)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.tmp.name, name)
+
+    def uvm(self, *argv):
+        out, err = StringIO(), StringIO()
+        with redirect_stdout(out), redirect_stderr(err):
+            code = uvm.main(list(argv))
+        return code, out.getvalue(), err.getvalue()
+
+    def test_exec_dump_words(self):
+        code, out, _ = self.uvm('dump', self.source, '--start', '0x100', '--end', '0x104')
+        self.assertEqual(code, 0)
+        self.assertIn('Выполнено команд: 4', out)
+        self.assertIn('0x00000100: 0x00000005           5', out)
+        self.assertIn('0x00000104: 0xFFFFFFFB          -5', out)
+
+    def test_assemble_then_run(self):
+        binary = self.path('program.bin')
+        self.assertEqual(self.uvm('assemble', self.source, '-o', binary)[0], 0)
+        dump = self.path('dump.csv')
+        code, out, _ = self.uvm('run', binary, '--dump', dump, '--start', '0x100', '--end', '0x104')
+        self.assertEqual(code, 0)
+        with open(dump, encoding='utf-8') as f:
+            self.assertIn('0x00000100', f.read())
+
+    def test_exec_from_stdin(self):
+        stdin = sys.stdin
+        sys.stdin = StringIO(json.dumps(PROGRAM))
+        try:
+            code, out, _ = self.uvm('exec', '-', '--registers')
+        finally:
+            sys.stdin = stdin
+        self.assertEqual(code, 0)
+        self.assertIn('R10', out)
+
+    def test_disasm(self):
+        code, out, _ = self.uvm('disasm', self.source)
+        self.assertEqual(code, 0)
+        self.assertEqual(len(out.splitlines()), 4)
+
+    def test_errors(self):
+        code, _, err = self.uvm('run', self.path('missing.bin'))
+        self.assertEqual(code, 1)
+        self.assertIn('не найден', err)
+
+        code, _, err = self.uvm('exec', self.source, '--max-instructions', '2')
+        self.assertEqual(code, 1)
+        self.assertIn('превышено', err)
+
+
+if __name__ == '__main__':
+    unittest.main()
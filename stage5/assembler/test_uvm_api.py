@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Тесты программного интерфейса УВМ
+"""
+
+import ctypes
+import unittest
+from array import array
+from unittest.mock import patch
+
+from uvm_api import UVM
+from paged_memory import PageStore
+
+
+# Чтение слова по адресу 0x1000 и запись его отрицания в 0x1004
+NEGATE = {"instructions": [
+    {"opcode": 72, "field_b": 10, "field_c": 0x1000},
+    {"opcode": 113, "field_b": 1, "field_c": 10},
+    {"opcode": 91, "field_b": 4, "field_c": 10, "field_d": 1},
+]}
+
+
+class TestUVM(unittest.TestCase):
+
+    def setUp(self):
+        self.vm = UVM(memory_size=0x2000)
+        self.vm.load_bytes(UVM.assemble(NEGATE))
+
+    def test_run_and_read_words(self):
+        self.assertEqual(self.vm.write_words(0x1000, [7]), 1)
+        result = self.vm.run()
+        self.assertEqual((result.executed, result.halted, result.error), (3, True, None))
+        self.assertEqual(self.vm.read_words(0x1000, 2).tolist(), [7, (-7) & 0xFFFFFFFF])
+        self.assertEqual(self.vm.registers_view()[10], 0x1000)
+
+    def test_views_are_zero_copy(self):
+        words = self.vm.read_words(0x1000, 2)
+        self.vm.write_words(0x1000, array('I', [5, 6]))
+        self.assertEqual(words.tolist(), [5, 6])
+        words[0] = 9
+        self.assertEqual(self.vm.memory[0x1000], 9)
+        words.release()
+
+        registers = self.vm.registers_view()
+        registers[1] = -1
+        self.assertEqual(self.vm.interpreter.registers[1], 0xFFFFFFFF)
+
+    def test_write_words_byte_order(self):
+        for word_type in (ctypes.c_uint32.__ctype_be__, ctypes.c_uint32.__ctype_le__):
+            with self.subTest(format=memoryview((word_type * 1)()).format):
+                self.vm.write_words(0x1000, (word_type * 2)(0x11223344, 5))
+                self.assertEqual(self.vm.read_words(0x1000, 2).tolist(), [0x11223344, 5])
+
+        self.vm.write_words(0x1000, array('i', [-1]))
+        self.assertEqual(self.vm.read_words(0x1000, 1).tolist(), [0xFFFFFFFF])
+        with self.assertRaises(ValueError):
+            self.vm.write_words(0x1000, array('f', [1.5]))
+
+    def test_byteswapped_path(self):
+        """Ветка для машин с другим порядком байтов: слово на 4 байта, не на байт"""
+        with patch('uvm_api._NATIVE_ORDER', False):
+            self.vm.write_words(0x1000, [0x11223344, 5])
+            self.assertEqual(self.vm.read_words(0x1000, 2).tolist(), [0x11223344, 5])
+
+    def test_negative_address(self):
+        with self.assertRaisesRegex(ValueError, r'-0x00000004'):
+            self.vm.read_words(-4, 1)
+
+    def test_assemble_from_text(self):
+        image = UVM.assemble('{"instructions": [{"opcode": 72, "field_b": 3, "field_c": 42}]}')
+        vm = UVM(memory_size=0x100)
+        vm.load_bytes(image)
+        vm.run()
+        self.assertEqual(vm.registers_view()[3], 42)
+        with self.assertRaises(ValueError):
+            UVM.assemble('{"instructions": ')
+
+    def test_errors_are_returned(self):
+        self.vm.registers_view()[10] = 0x1FFE
+        self.vm.interpreter.pc = 6  # Чтение по адресу за концом памяти
+        result = self.vm.run()
+        self.assertTrue(result.halted)
+        self.assertIsNotNone(result.error)
+
+        with self.assertRaises(ValueError):
+            self.vm.read_words(0x1FFC, 2)
+        with self.assertRaises(ValueError):
+            self.vm.write_words(0x1FFC, [1, 2])
+
+    def test_steps_and_reset(self):
+        result = self.vm.run(steps=1)
+        self.assertEqual(result.executed, 1)
+        self.assertFalse(result.halted)
+        self.assertIsNotNone(result.stop_reason)
+
+        self.vm.reset()
+        self.assertEqual(self.vm.pc, 0)
+        self.assertEqual(self.vm.registers_view().tolist(), [0] * 128)
+        self.assertEqual(self.vm.memory[0], 0)
+
+    def test_paged_memory(self):
+        vm = UVM(memory_size=0x2000, page_store=PageStore())
+        vm.load_bytes(UVM.assemble(NEGATE))
+        vm.write_words(0x1000, [3])
+        vm.run()
+        self.assertEqual(vm.read_words(0x1004, 1).tolist(), [(-3) & 0xFFFFFFFF])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Тесты точек наблюдения за памятью
+"""
+
+import unittest
+
+from parser import parse_program
+from encoder import encode_program
+from interpreter import UVMInterpreter
+from watchpoints import Watchpoints, IntervalIndex, parse_watch_spec
+
+
+PROGRAM = [
+    {"opcode": 72, "field_b": 10, "field_c": 0x100},
+    {"opcode": 72, "field_b": 1, "field_c": 5},
+    {"opcode": 8, "field_b": 1, "field_c": 10},    # PC 12: mem[0x100] = 5
+    {"opcode": 8, "field_b": 1, "field_c": 10},    # PC 15: mem[0x100] = 5 (без изменения)
+    {"opcode": 113, "field_b": 2, "field_c": 10},  # PC 18: чтение 0x100
+    {"opcode": 91, "field_b": 8, "field_c": 10, "field_d": 2},  # PC 21: mem[0x108] = -5
+]
+
+
+class TestWatchpoints(unittest.TestCase):
+
+    def setUp(self):
+        self.interpreter = UVMInterpreter(memory_size=4096)
+        binary = encode_program(parse_program({"instructions": PROGRAM}))
+        self.interpreter.memory[:len(binary)] = binary
+        self.logged = []
+        self.watchpoints = Watchpoints(self.interpreter, log=self.logged.append)
+        self.interpreter.add_hook(self.watchpoints)
+
+    def test_interval_index(self):
+        index = IntervalIndex()
+        index.add(10, 20, 'a')
+        index.add(15, 30, 'b')
+        self.assertEqual(index.find(9), ())
+        self.assertEqual(index.find(12), ('a',))
+        self.assertEqual(set(index.find(17)), {'a', 'b'})
+        self.assertEqual(index.find(25), ('b',))
+        self.assertEqual(index.find(30), ())
+        index.remove('a')
+        self.assertEqual(index.find(12), ())
+
+    def test_stop_on_write_and_resume(self):
+        """Остановка после записи и продолжение повторным run()"""
+        self.watchpoints.add(0x100, kind='write')
+        self.interpreter.run()
+        self.assertEqual(self.interpreter.pc, 15)
+        self.assertFalse(self.interpreter.halted)
+        self.assertIn('0x00000100', self.interpreter.stop_reason)
+
+        self.interpreter.run()
+        self.assertEqual(self.interpreter.pc, 18)
+
+        self.interpreter.run()
+        self.assertTrue(self.interpreter.halted)
+        self.assertEqual(self.interpreter.instructions_executed, 6)
+
+    def test_change_only_fires_on_new_value(self):
+        self.watchpoints.add(0x100, kind='change', action='log')
+        self.interpreter.run()
+        self.assertEqual([hit.pc for hit in self.watchpoints.hits], [12])
+        self.assertEqual(len(self.logged), 1)
+        self.assertTrue(self.interpreter.halted)
+
+    def test_read_and_partial_overlap(self):
+        """Слово, частично перекрывающее диапазон, тоже считается обращением"""
+        self.watchpoints.add(0x102, 0x103, kind='read', action='log')
+        self.watchpoints.add(0x10A, 0x10B, kind='write', action='log')
+        self.interpreter.run()
+        self.assertEqual([(hit.pc, hit.access) for hit in self.watchpoints.hits],
+                         [(18, 'read'), (21, 'write')])
+        self.assertEqual(self.watchpoints.hits[1].new_value, (-5) & 0xFFFFFFFF)
+
+    def test_parse_spec(self):
+        self.assertEqual(parse_watch_spec('change:0x1000-0x100F:log'),
+                         ('change', 0x1000, 0x1010, 'log'))
+        self.assertEqual(parse_watch_spec('write:256'), ('write', 256, 260, 'stop'))
+        with self.assertRaises(ValueError):
+            parse_watch_spec('write')
+
+
+if __name__ == '__main__':
+    unittest.main()
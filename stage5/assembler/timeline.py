@@ -0,0 +1,122 @@
+"""
+Временная шкала этапов работы в формате Chrome trace-event
+
+Файл открывается в chrome://tracing или Perfetto. Каждый поток (и каждый
+процесс) отображается отдельной дорожкой, поэтому параллельные запуски
+видны рядом. Файлы разных процессов объединяются функцией merge.
+"""
+
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import List, Optional
+
+
+def _now_us() -> float:
+    # Монотонные часы общие для всех процессов машины
+    return time.perf_counter_ns() / 1000.0
+
+
+class Timeline:
+    """Сбор интервалов (span) для одной временной шкалы"""
+
+    def __init__(self, process_name: Optional[str] = None):
+        self.pid = os.getpid()
+        self.events: List[dict] = []
+        self._lock = threading.Lock()
+        if process_name:
+            self.events.append({'name': 'process_name', 'ph': 'M', 'pid': self.pid,
+                                'tid': 0, 'args': {'name': process_name}})
+
+    def _append(self, event: dict) -> None:
+        with self._lock:
+            self.events.append(event)
+
+    def add_span(self, name: str, start_us: float, end_us: float,
+                 category: str = 'phase', tid: Optional[int] = None, **args) -> None:
+        """Добавление завершенного интервала"""
+        event = {
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': start_us,
+            'dur': end_us - start_us,
+            'pid': self.pid,
+            'tid': threading.get_native_id() if tid is None else tid,
+        }
+        if args:
+            event['args'] = args
+        self._append(event)
+
+    @contextmanager
+    def span(self, name: str, category: str = 'phase', tid: Optional[int] = None, **args):
+        """Интервал на время выполнения блока with"""
+        start = _now_us()
+        try:
+            yield
+        finally:
+            self.add_span(name, start, _now_us(), category, tid, **args)
+
+    def name_track(self, name: str, tid: Optional[int] = None) -> None:
+        """Подпись дорожки (например, номера рабочего процесса)"""
+        self._append({'name': 'thread_name', 'ph': 'M', 'pid': self.pid,
+                      'tid': threading.get_native_id() if tid is None else tid,
+                      'args': {'name': name}})
+
+    def save(self, path: str) -> None:
+        """Сохранение в JSON-файл"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': self.events, 'displayTimeUnit': 'ms'}, f,
+                      ensure_ascii=False)
+
+
+def phase(timeline: Optional[Timeline], name: str, **args):
+    """Интервал этапа или пустой контекст, если шкала не ведется"""
+    if timeline is None:
+        return nullcontext()
+    return timeline.span(name, **args)
+
+
+def merge(paths: List[str], output: str) -> None:
+    """Объединение шкал нескольких процессов в один файл"""
+    events = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            events.extend(json.load(f)['traceEvents'])
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f, ensure_ascii=False)
+
+
+class BlockSpans:
+    """
+    Обработчик инструментирования: интервал на каждые N выполненных команд
+    гостевой программы (см. UVMInterpreter.add_hook)
+    """
+
+    def __init__(self, timeline: Timeline, block_size: int = 1000):
+        self.timeline = timeline
+        self.block_size = block_size
+        self._count = 0
+        self._start_pc = None
+        self._start_us = 0.0
+
+    def on_instruction(self, pc, opcode, field_b, field_c, field_d) -> None:
+        if self._start_pc is None:
+            self._start_pc = pc
+            self._start_us = _now_us()
+        self._count += 1
+        if self._count == self.block_size:
+            self.flush(pc)
+
+    def flush(self, last_pc: Optional[int] = None) -> None:
+        """Завершение текущего блока (вызывается и после окончания run)"""
+        if self._start_pc is None:
+            return
+        self.timeline.add_span(f"guest 0x{self._start_pc:08X}", self._start_us, _now_us(),
+                               category='guest', instructions=self._count,
+                               start_pc=f"0x{self._start_pc:08X}",
+                               last_pc=None if last_pc is None else f"0x{last_pc:08X}")
+        self._count = 0
+        self._start_pc = None
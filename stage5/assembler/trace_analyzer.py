@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Анализ трассы обращений к памяти УВМ (см. memtrace.py)
+
+Вычисляет:
+- гистограмму расстояний повторного использования (количество различных
+  слов памяти между двумя обращениями к одному слову);
+- гистограмму шагов между адресами соседних обращений;
+- размер рабочего множества (различных слов) в окнах по N обращений.
+"""
+
+import sys
+import json
+import argparse
+from collections import Counter
+from typing import Dict, List
+
+from memtrace import read_trace, READ
+
+
+class _Fenwick:
+    """Дерево Фенвика для подсчета отметок на префиксе"""
+
+    def __init__(self):
+        self.size = 1024
+        self.tree = [0] * (self.size + 1)
+
+    def _grow(self, index: int) -> None:
+        size = self.size
+        while size < index:
+            size *= 2
+        # Перестраиваем дерево по значениям точек
+        values = [self.point(i) for i in range(1, self.size + 1)]
+        self.size = size
+        self.tree = [0] * (size + 1)
+        for i, value in enumerate(values, 1):
+            if value:
+                self.add(i, value)
+
+    def point(self, index: int) -> int:
+        return self.prefix(index) - self.prefix(index - 1)
+
+    def add(self, index: int, delta: int) -> None:
+        if index > self.size:
+            self._grow(index)
+        tree = self.tree
+        size = self.size
+        while index <= size:
+            tree[index] += delta
+            index += index & -index
+
+    def prefix(self, index: int) -> int:
+        tree = self.tree
+        total = 0
+        while index > 0:
+            total += tree[index]
+            index -= index & -index
+        return total
+
+
+def _log2_bucket(value: int) -> str:
+    """Название логарифмической корзины гистограммы"""
+    if value == 0:
+        return '0'
+    low = 1 << (value.bit_length() - 1)
+    high = (low << 1) - 1
+    return f"{low}" if low == high else f"{low}-{high}"
+
+
+def analyze(path: str, window: int = 10000, top_strides: int = 10) -> Dict:
+    """
+    Анализ трассы
+
+    Args:
+        path: путь к файлу трассы
+        window: размер окна (в обращениях) для рабочего множества
+        top_strides: количество самых частых шагов в отчете
+    """
+    reads = writes = 0
+    cold = 0
+    reuse = Counter()
+    strides = Counter()
+    working_set: List[int] = []
+
+    fenwick = _Fenwick()
+    last_access: Dict[int, int] = {}
+    time = 0
+    prev_addr = None
+    window_words = set()
+
+    for pcs, kinds, addrs, values in read_trace(path):
+        for kind, addr in zip(kinds, addrs):
+            time += 1
+            if kind == READ:
+                reads += 1
+            else:
+                writes += 1
+
+            # Расстояние повторного использования по 32-битным словам:
+            # в дереве отмечено последнее обращение к каждому слову
+            word = addr >> 2
+            last = last_access.get(word)
+            if last is None:
+                cold += 1
+            else:
+                distance = fenwick.prefix(time - 1) - fenwick.prefix(last)
+                reuse[_log2_bucket(distance)] += 1
+                fenwick.add(last, -1)
+            fenwick.add(time, 1)
+            last_access[word] = time
+
+            if prev_addr is not None:
+                strides[addr - prev_addr] += 1
+            prev_addr = addr
+
+            window_words.add(word)
+            if time % window == 0:
+                working_set.append(len(window_words))
+                window_words = set()
+
+    if window_words:
+        working_set.append(len(window_words))
+
+    def bucket_order(item):
+        name = item[0]
+        return int(name.split('-')[0])
+
+    return {
+        'accesses': time,
+        'reads': reads,
+        'writes': writes,
+        'distinct_words': len(last_access),
+        'reuse_distance': {
+            'cold': cold,
+            'histogram': dict(sorted(reuse.items(), key=bucket_order)),
+        },
+        'strides': [{'stride': stride, 'count': count}
+                    for stride, count in strides.most_common(top_strides)],
+        'working_set': {
+            'window': window,
+            'words': working_set,
+        },
+    }
+
+
+def format_report(result: Dict) -> str:
+    """Текстовый отчет по результатам анализа"""
+    lines = [
+        f"Обращений к памяти: {result['accesses']} "
+        f"(чтений: {result['reads']}, записей: {result['writes']})",
+        f"Различных слов: {result['distinct_words']}",
+        "",
+        "Расстояние повторного использования (слов):",
+        f"  первое обращение: {result['reuse_distance']['cold']}",
+    ]
+    for bucket, count in result['reuse_distance']['histogram'].items():
+        lines.append(f"  {bucket:>12}: {count}")
+
+    lines.append("")
+    lines.append("Самые частые шаги между адресами (байт):")
+    for item in result['strides']:
+        lines.append(f"  {item['stride']:>+12}: {item['count']}")
+
+    sizes = result['working_set']['words']
+    lines.append("")
+    lines.append(f"Рабочее множество (слов в окне {result['working_set']['window']} обращений):")
+    if sizes:
+        lines.append(f"  окон: {len(sizes)}, мин: {min(sizes)}, макс: {max(sizes)}, "
+                     f"среднее: {sum(sizes) / len(sizes):.1f}")
+    else:
+        lines.append("  нет данных")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Анализ трассы обращений к памяти УВМ')
+    parser.add_argument('trace_file', help='Путь к файлу трассы')
+    parser.add_argument('--window', type=int, default=10000,
+                        help='Размер окна для рабочего множества (обращений)')
+    parser.add_argument('--top', type=int, default=10, help='Количество самых частых шагов')
+    parser.add_argument('--json', action='store_true', help='Вывод в формате JSON')
+
+    args = parser.parse_args()
+
+    try:
+        result = analyze(args.trace_file, args.window, args.top)
+    except FileNotFoundError:
+        print(f"Ошибка: файл {args.trace_file} не найден")
+        sys.exit(1)
+    except ValueError as e:
+        print(f"Ошибка чтения трассы: {e}")
+        sys.exit(1)
+
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    else:
+        print(format_report(result))
+
+
+if __name__ == "__main__":
+    main()
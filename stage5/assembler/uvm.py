@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Единая точка входа УВМ
+
+    uvm.py assemble PROG.json -o PROG.bin   ассемблирование
+    uvm.py run PROG.bin [--dump DUMP.csv]    выполнение программы
+    uvm.py exec PROG.json [--dump DUMP.csv]  ассемблирование и выполнение
+    uvm.py disasm PROG.bin|PROG.json         дизассемблирование
+    uvm.py dump PROG --start A --end B       выполнение и вывод слов памяти
+
+exec ассемблирует программу в памяти и сразу выполняет ее в том же
+процессе, без промежуточного файла и второго запуска Python. Модули
+ассемблера, интерпретатора и дизассемблера импортируются только нужной
+подкомандой, поэтому запуск не тратит время на неиспользуемые модули.
+"""
+
+import sys
+import argparse
+
+
+def _number(text: str) -> int:
+    return int(text, 0)
+
+
+def _read_json(path: str) -> bytes:
+    """Образ программы из JSON-файла (или stdin для '-'), ассемблированный в памяти"""
+    import json
+    from assembler import build_image
+
+    try:
+        if path == '-':
+            program_json = json.load(sys.stdin)
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                program_json = json.load(f)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"ошибка разбора JSON: {e}")
+    return build_image(program_json)
+
+
+def _read_image(path: str) -> bytes:
+    """Образ программы: JSON ассемблируется, двоичный файл или АРХИВ#ИМЯ читается"""
+    if path == '-' or path.endswith('.json'):
+        return _read_json(path)
+    from bundle import read_program
+    return read_program(path)
+
+
+def _machine(args):
+    from interpreter import UVMInterpreter
+
+    interpreter = UVMInterpreter(memory_size=args.memory_size, verbose=args.verbose)
+    if args.max_instructions is not None:
+        interpreter.max_instructions = args.max_instructions
+    return interpreter
+
+
+def _execute(args, image) -> int:
+    """Загрузка, выполнение и вывод итогов; код завершения процесса"""
+    interpreter = _machine(args)
+    interpreter.load_image(image)
+    for spec in args.init_mem:
+        from memimage import parse_init_spec
+        address, path = parse_init_spec(spec)
+        interpreter.load_memory_image(address, path)
+    interpreter.run()
+
+    print(f"Выполнено команд: {interpreter.instructions_executed}, PC=0x{interpreter.pc:08X}")
+    if interpreter.error:
+        print(f"Ошибка выполнения: {interpreter.error}", file=sys.stderr)
+    if args.dump:
+        interpreter.dump_memory(args.start, args.end, args.dump)
+    if args.registers:
+        interpreter.dump_registers()
+    if args.words is not None:
+        _print_words(interpreter.memory, args.start, args.end)
+    return 1 if interpreter.error else 0
+
+
+def _print_words(memory, start: int, end: int) -> None:
+    for address in range(start, min(end + 1, len(memory) - 3), 4):
+        value = int.from_bytes(memory[address:address + 4], 'little')
+        signed = value - (1 << 32) if value & 0x80000000 else value
+        print(f"0x{address:08X}: 0x{value:08X} {signed:>11}")
+
+
+def cmd_assemble(args) -> int:
+    image = _read_json(args.source)
+    with open(args.output, 'wb') as f:
+        f.write(image)
+    print(f"Размер двоичного файла: {len(image)} байт, результат сохранен в {args.output}")
+    return 0
+
+
+def cmd_run(args) -> int:
+    return _execute(args, _read_image(args.program))
+
+
+def cmd_exec(args) -> int:
+    return _execute(args, _read_json(args.source))
+
+
+def cmd_dump(args) -> int:
+    args.words = True
+    return _execute(args, _read_image(args.program))
+
+
+def cmd_disasm(args) -> int:
+    import io
+    from pathlib import Path
+    from disassembler import disassemble
+
+    image = _read_image(args.program)
+    disassemble(io.BytesIO(image), sys.stdout, Path(args.program).name, args.format)
+    return 0
+
+
+def _add_machine_options(parser, dump: bool = True) -> None:
+    parser.add_argument('--memory-size', type=int, default=1024 * 1024,
+                        help='Размер памяти в байтах (по умолчанию: 1MB)')
+    parser.add_argument('--max-instructions', type=int, help='Ограничение количества команд')
+    parser.add_argument('--init-mem', action='append', default=[], metavar='ADDR:FILE',
+                        help='Загрузить файл в память до запуска (можно указывать несколько раз)')
+    parser.add_argument('--start', type=_number, default=0x0000,
+                        help='Начальный адрес диапазона памяти (по умолчанию: 0x0000)')
+    parser.add_argument('--end', type=_number, default=0x0100,
+                        help='Конечный адрес диапазона памяти (по умолчанию: 0x0100)')
+    if dump:
+        parser.add_argument('--dump', metavar='FILE', help='Сохранить дамп диапазона памяти в CSV')
+    parser.add_argument('--registers', action='store_true', help='Вывести регистры')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Подробный вывод интерпретатора')
+    parser.set_defaults(words=None, dump=None)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='uvm', description='Учебная виртуальная машина')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    assemble = commands.add_parser('assemble', help='Ассемблировать JSON-программу')
+    assemble.add_argument('source', help='Исходный текст программы (JSON, "-" - stdin)')
+    assemble.add_argument('-o', '--output', required=True, help='Путь к двоичному файлу')
+    assemble.set_defaults(handler=cmd_assemble)
+
+    run = commands.add_parser('run', help='Выполнить программу')
+    run.add_argument('program', help='Двоичный файл, АРХИВ.uvmb#ИМЯ или JSON-программа')
+    _add_machine_options(run)
+    run.set_defaults(handler=cmd_run)
+
+    execute = commands.add_parser('exec', help='Ассемблировать и выполнить в одном процессе')
+    execute.add_argument('source', help='Исходный текст программы (JSON, "-" - stdin)')
+    _add_machine_options(execute)
+    execute.set_defaults(handler=cmd_exec)
+
+    disasm = commands.add_parser('disasm', help='Дизассемблировать программу')
+    disasm.add_argument('program', help='Двоичный файл, АРХИВ.uvmb#ИМЯ или JSON-программа')
+    disasm.add_argument('--format', choices=['listing', 'json'], default='listing',
+                        help='Формат вывода (по умолчанию: listing)')
+    disasm.set_defaults(handler=cmd_disasm)
+
+    dump = commands.add_parser('dump', help='Выполнить программу и вывести слова памяти')
+    dump.add_argument('program', help='Двоичный файл, АРХИВ.uvmb#ИМЯ или JSON-программа')
+    _add_machine_options(dump, dump=False)
+    dump.set_defaults(handler=cmd_dump)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except FileNotFoundError as e:
+        print(f"Ошибка: файл {e.filename} не найден", file=sys.stderr)
+    except KeyError as e:
+        print(f"Ошибка: {e.args[0]}", file=sys.stderr)
+    except (OSError, ValueError) as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
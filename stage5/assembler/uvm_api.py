@@ -0,0 +1,269 @@
+"""
+Программный интерфейс УВМ для встраивания
+
+Позволяет ассемблировать и выполнять программы из Python без временных
+файлов и подпроцессов:
+
+    vm = UVM(memory_size=64 * 1024)
+    vm.load_bytes(UVM.assemble({"instructions": [...]}))
+    vm.write_words(0x1000, [1, 2, 3])
+    result = vm.run()
+    words = vm.read_words(0x1000, 3)   # memoryview слов памяти без копирования
+
+Слова памяти - 32-битные little-endian, как в командах чтения и записи
+УВМ. Представления памяти (read_words, read_array) ссылаются на память
+машины и видят последующие изменения; пока они существуют, память,
+отображенную из файла, нельзя закрыть.
+"""
+
+import sys
+import json
+from array import array
+from typing import TYPE_CHECKING, Iterable, List, NamedTuple, Optional, Union
+
+from interpreter import UVMInterpreter
+
+# Хранилище страниц - только для аннотации; PagedMemory загружает
+# интерпретатор, когда page_store передан
+if TYPE_CHECKING:
+    from paged_memory import PageStore
+
+# Слова в памяти УВМ - little-endian; на такой машине memoryview 'I'
+# совпадает с раскладкой памяти
+_NATIVE_ORDER = sys.byteorder == 'little' and array('I').itemsize == 4
+
+# Коды формата буфера для 32-битных целых (struct, memoryview.format)
+_WORD_CODES = ('I', 'i', 'L', 'l')
+
+
+def _buffer_byteorder(view: memoryview) -> str:
+    """Порядок байтов буфера 32-битных целых: 'little' или 'big'"""
+    fmt = view.format
+    order, code = (fmt[0], fmt[1:]) if fmt[0] in '@=<>!' else ('@', fmt)
+    if code not in _WORD_CODES:
+        raise ValueError(f"Буфер формата {fmt!r} не содержит 32-битных целых")
+    if order in '@=':
+        return sys.byteorder
+    return 'little' if order == '<' else 'big'
+
+
+class RunResult(NamedTuple):
+    """Итог вызова UVM.run"""
+    executed: int                 # Всего выполнено команд
+    halted: bool                  # Программа завершена (или прервана ошибкой)
+    error: Optional[str]          # Описание ошибки (None - ошибок не было)
+    stop_reason: Optional[str]    # Причина остановки до конца программы
+
+
+class RegistersView:
+    """Регистры машины без копирования: изменения видны в обе стороны"""
+
+    def __init__(self, registers: List[int]):
+        self._registers = registers
+
+    def __len__(self) -> int:
+        return len(self._registers)
+
+    def __getitem__(self, index):
+        return self._registers[index]
+
+    def __setitem__(self, index: int, value: int) -> None:
+        self._registers[index] = value & 0xFFFFFFFF
+
+    def __iter__(self):
+        return iter(self._registers)
+
+    def tolist(self) -> List[int]:
+        return list(self._registers)
+
+    def __repr__(self) -> str:
+        nonzero = ', '.join(f"R{i}=0x{value:X}" for i, value in enumerate(self._registers) if value)
+        return f"RegistersView({nonzero})"
+
+
+class UVM:
+    """Виртуальная машина УВМ для использования из Python"""
+
+    def __init__(self, memory_size: int = 1024 * 1024,
+                 max_instructions: Optional[int] = None,
+                 memory_file: Optional[str] = None,
+                 page_store: Optional['PageStore'] = None):
+        """
+        Args:
+            memory_size: размер памяти в байтах
+            max_instructions: ограничение количества команд (None - по
+                умолчанию интерпретатора)
+            memory_file: файл, отображаемый в память (см. interpreter.py)
+            page_store: общее хранилище страниц (см. paged_memory.py)
+        """
+        self.interpreter = UVMInterpreter(memory_size=memory_size, verbose=False,
+                                          memory_file=memory_file, page_store=page_store)
+        if max_instructions is not None:
+            self.interpreter.max_instructions = max_instructions
+
+    @staticmethod
+    def assemble(source: Union[dict, str, bytes]) -> bytes:
+        """
+        Ассемблирование программы в памяти
+
+        Args:
+            source: JSON-программа - словарь или текст
+
+        Returns:
+            Образ программы для load_bytes
+
+        Raises:
+            ValueError: ошибка в тексте программы
+        """
+        from assembler import build_image
+
+        if isinstance(source, (str, bytes, bytearray)):
+            try:
+                source = json.loads(source)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Ошибка разбора JSON: {e}")
+        if not isinstance(source, dict):
+            raise ValueError("Программа должна быть объектом JSON")
+        return build_image(source)
+
+    def load_bytes(self, image) -> None:
+        """Загрузка образа программы (код или объектный файл) из буфера"""
+        self.interpreter.load_image(image)
+
+    @property
+    def memory(self):
+        """Память машины (bytearray, mmap или PagedMemory)"""
+        return self.interpreter.memory
+
+    @property
+    def pc(self) -> int:
+        return self.interpreter.pc
+
+    def _check_range(self, address: int, count: int) -> None:
+        if count < 0 or address < 0 or address + 4 * count > len(self.interpreter.memory):
+            sign = '-' if address < 0 else ''
+            raise ValueError(f"Диапазон слов {sign}0x{abs(address):08X} + {count} вне памяти")
+
+    def read_words(self, address: int, count: int) -> memoryview:
+        """
+        Слова памяти как memoryview формата 'I'
+
+        Для памяти с буфером (bytearray, mmap) представление не копирует
+        данные и допускает запись; для PagedMemory возвращается копия.
+        """
+        self._check_range(address, count)
+        memory = self.interpreter.memory
+        try:
+            view = memoryview(memory)[address:address + 4 * count]
+        except TypeError:
+            view = memoryview(memory[address:address + 4 * count])
+        if _NATIVE_ORDER:
+            return view.cast('I')
+        # array('I', view) из байтового представления дал бы слово на байт
+        words = array('I')
+        words.frombytes(view)
+        words.byteswap()
+        return memoryview(words)
+
+    def read_array(self, address: int, count: int):
+        """Слова памяти как массив NumPy (dtype '<u4') без копирования"""
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("Для read_array требуется NumPy")
+        self._check_range(address, count)
+        memory = self.interpreter.memory
+        try:
+            buffer = memoryview(memory)[address:address + 4 * count]
+        except TypeError:
+            buffer = memory[address:address + 4 * count]
+        return numpy.frombuffer(buffer, dtype='<u4')
+
+    def write_words(self, address: int, words: Union[Iterable[int], memoryview]) -> int:
+        """
+        Запись слов в память
+
+        Args:
+            address: начальный адрес
+            words: целые числа (берутся младшие 32 бита) или буфер
+                32-битных целых (array('I'), memoryview, массив NumPy) с
+                любым порядком байтов
+
+        Returns:
+            Количество записанных слов
+
+        Raises:
+            ValueError: буфер с элементами по 4 байта, но не 32-битных целых
+        """
+        try:
+            view = memoryview(words)
+        except TypeError:
+            view = None
+        if view is not None and view.itemsize == 4:
+            byteorder = _buffer_byteorder(view)
+            try:
+                data = view.cast('B')
+            except (TypeError, ValueError):
+                # Формат с явным порядком байтов ('<I', '>I') не приводится к байтам
+                data = memoryview(view.tobytes())
+            if byteorder != 'little':
+                swapped = array('I')
+                swapped.frombytes(data)
+                swapped.byteswap()
+                data = memoryview(swapped).cast('B')
+        else:
+            packed = array('I', (word & 0xFFFFFFFF for word in words))
+            if not _NATIVE_ORDER:
+                packed.byteswap()
+            data = memoryview(packed).cast('B')
+
+        count = len(data) // 4
+        self._check_range(address, count)
+        self.interpreter.memory[address:address + len(data)] = data
+        return count
+
+    def registers_view(self) -> RegistersView:
+        """Регистры машины без копирования"""
+        return RegistersView(self.interpreter.registers)
+
+    def run(self, steps: Optional[int] = None, max_instructions: Optional[int] = None) -> RunResult:
+        """
+        Выполнение программы
+
+        Args:
+            steps: выполнить не более steps команд (None - до конца)
+            max_instructions: новое ограничение количества команд
+
+        Returns:
+            Итог выполнения; ошибка программы не вызывает исключение, а
+            возвращается в поле error
+        """
+        interpreter = self.interpreter
+        if max_instructions is not None:
+            interpreter.max_instructions = max_instructions
+        interpreter.run(steps)
+        return RunResult(interpreter.instructions_executed, interpreter.halted,
+                         interpreter.error, interpreter.stop_reason)
+
+    def reset(self) -> None:
+        """Сброс машины для повторного использования: память и регистры обнуляются"""
+        interpreter = self.interpreter
+        memory = interpreter.memory
+        memory[:] = bytes(len(memory))
+        interpreter.registers[:] = [0] * len(interpreter.registers)
+        interpreter.pc = 0
+        interpreter.halted = False
+        interpreter.instructions_executed = 0
+        interpreter.program_size = 0
+        interpreter.stop_reason = None
+        interpreter.error = None
+
+    def close(self) -> None:
+        """Закрытие памяти, отображенной из файла"""
+        self.interpreter.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,192 @@
+"""
+Точки наблюдения за памятью УВМ
+
+Точка наблюдения срабатывает на чтение, запись или изменение значения
+в диапазоне адресов и либо останавливает выполнение, либо записывает
+событие в журнал. Диапазоны хранятся в отсортированном индексе
+непересекающихся отрезков, поэтому проверка обращения - один bisect.
+Точки работают через обработчики инструментирования (UVMInterpreter.add_hook)
+и не влияют на скорость цикла, пока не добавлены.
+"""
+
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+# Виды точек наблюдения
+WATCH_READ = 'read'
+WATCH_WRITE = 'write'
+WATCH_CHANGE = 'change'
+WATCH_ACCESS = 'access'
+WATCH_KINDS = (WATCH_READ, WATCH_WRITE, WATCH_CHANGE, WATCH_ACCESS)
+
+# Действия при срабатывании
+ACTION_STOP = 'stop'
+ACTION_LOG = 'log'
+
+# Размер обращения к памяти в байтах
+WORD_SIZE = 4
+
+
+@dataclass(frozen=True)
+class Watchpoint:
+    """Точка наблюдения за диапазоном [start, end)"""
+    id: int
+    start: int
+    end: int
+    kind: str = WATCH_WRITE
+    action: str = ACTION_STOP
+
+    def describe(self) -> str:
+        return f"#{self.id} {self.kind} 0x{self.start:08X}-0x{self.end - 1:08X}"
+
+
+@dataclass
+class WatchHit:
+    """Срабатывание точки наблюдения"""
+    watchpoint: Watchpoint
+    pc: int
+    access: str              # 'read' или 'write'
+    address: int
+    old_value: int
+    new_value: Optional[int]  # None для чтения
+
+    def describe(self) -> str:
+        if self.access == WATCH_READ:
+            detail = f"чтение 0x{self.old_value:08X}"
+        else:
+            detail = f"запись 0x{self.old_value:08X} -> 0x{self.new_value:08X}"
+        return (f"Точка наблюдения {self.watchpoint.describe()}: PC=0x{self.pc:08X}, "
+                f"адрес 0x{self.address:08X}, {detail}")
+
+
+class IntervalIndex:
+    """
+    Отсортированный индекс отрезков
+
+    Диапазоны разбиваются на непересекающиеся отрезки; для каждого отрезка
+    хранится список покрывающих его значений. Поиск по адресу - один bisect.
+    """
+
+    def __init__(self):
+        self._items: List[Tuple[int, int, object]] = []
+        self._bounds: List[int] = []
+        self._segments: List[tuple] = []
+
+    def add(self, start: int, end: int, value) -> None:
+        self._items.append((start, end, value))
+        self._rebuild()
+
+    def remove(self, value) -> None:
+        self._items = [item for item in self._items if item[2] is not value]
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        bounds = sorted({b for start, end, _ in self._items for b in (start, end)})
+        segments = []
+        for i in range(len(bounds) - 1):
+            lo, hi = bounds[i], bounds[i + 1]
+            segments.append(tuple(v for start, end, v in self._items if start <= lo and hi <= end))
+        self._bounds = bounds
+        self._segments = segments
+
+    def find(self, address: int) -> tuple:
+        """Значения, чьи диапазоны содержат адрес"""
+        i = bisect_right(self._bounds, address) - 1
+        if 0 <= i < len(self._segments):
+            return self._segments[i]
+        return ()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class Watchpoints:
+    """Набор точек наблюдения - обработчик инструментирования интерпретатора"""
+
+    def __init__(self, interpreter, log=print):
+        self.interpreter = interpreter
+        self.log = log
+        self.hits: List[WatchHit] = []
+        self._index = IntervalIndex()
+        self._watchpoints: List[Watchpoint] = []
+        self._next_id = 1
+
+    def add(self, start: int, end: Optional[int] = None, kind: str = WATCH_WRITE,
+            action: str = ACTION_STOP) -> Watchpoint:
+        """
+        Добавление точки наблюдения
+
+        Args:
+            start: начальный адрес
+            end: конечный адрес, не включая (по умолчанию одно слово)
+            kind: read, write, change (запись другого значения) или access
+            action: stop - остановить выполнение, log - только записать событие
+        """
+        if kind not in WATCH_KINDS:
+            raise ValueError(f"Неизвестный вид точки наблюдения: {kind}")
+        if action not in (ACTION_STOP, ACTION_LOG):
+            raise ValueError(f"Неизвестное действие точки наблюдения: {action}")
+        if end is None:
+            end = start + WORD_SIZE
+        if end <= start:
+            raise ValueError(f"Пустой диапазон точки наблюдения: 0x{start:X}-0x{end:X}")
+
+        watchpoint = Watchpoint(self._next_id, start, end, kind, action)
+        self._next_id += 1
+        self._watchpoints.append(watchpoint)
+        # Обращение к слову по адресу a затрагивает байты [a, a + 4), поэтому
+        # индекс строится по адресам начала обращения: [start - 3, end)
+        self._index.add(max(0, start - WORD_SIZE + 1), end, watchpoint)
+        return watchpoint
+
+    def remove(self, watchpoint: Watchpoint) -> None:
+        self._watchpoints.remove(watchpoint)
+        self._index.remove(watchpoint)
+
+    @property
+    def watchpoints(self) -> List[Watchpoint]:
+        return list(self._watchpoints)
+
+    def _fire(self, watchpoint: Watchpoint, hit: WatchHit) -> None:
+        self.hits.append(hit)
+        if watchpoint.action == ACTION_STOP:
+            self.interpreter.request_stop(hit.describe())
+        elif self.log is not None:
+            self.log(hit.describe())
+
+    def on_read(self, pc: int, address: int, value: int) -> None:
+        for watchpoint in self._index.find(address):
+            if watchpoint.kind in (WATCH_READ, WATCH_ACCESS):
+                self._fire(watchpoint, WatchHit(watchpoint, pc, WATCH_READ, address, value, None))
+
+    def on_write(self, pc: int, address: int, value: int) -> None:
+        found = self._index.find(address)
+        if not found:
+            return
+        memory = self.interpreter.memory
+        old = int.from_bytes(memory[address:address + WORD_SIZE], 'little')
+        for watchpoint in found:
+            if (watchpoint.kind in (WATCH_WRITE, WATCH_ACCESS)
+                    or (watchpoint.kind == WATCH_CHANGE and old != value)):
+                self._fire(watchpoint, WatchHit(watchpoint, pc, WATCH_WRITE, address, old, value))
+
+
+def parse_watch_spec(spec: str) -> Tuple[str, int, int, str]:
+    """
+    Разбор описания точки из командной строки: ВИД:НАЧАЛО[-КОНЕЦ][:ДЕЙСТВИЕ]
+
+    Конец диапазона включается. Пример: change:0x1000-0x100F:log
+    """
+    parts = spec.split(':')
+    if len(parts) not in (2, 3):
+        raise ValueError(f"Некорректная точка наблюдения: {spec}")
+    kind = parts[0]
+    action = parts[2] if len(parts) == 3 else ACTION_STOP
+    if '-' in parts[1]:
+        start_text, end_text = parts[1].split('-', 1)
+        start, end = int(start_text, 0), int(end_text, 0) + 1
+    else:
+        start = int(parts[1], 0)
+        end = start + WORD_SIZE
+    return kind, start, end, action